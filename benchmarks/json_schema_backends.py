@@ -0,0 +1,60 @@
+"""Compares the jsonschema and codegen JSON Schema backends.
+
+Validates every battery-pass test vector against every profile schema and
+reports documents per second for each backend:
+
+    python benchmarks/json_schema_backends.py [--rounds N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from opendpp.validate.syntax.codegen import compile_schema
+from opendpp.validate.syntax.json_schema import build_validator
+
+PROFILE = Path(__file__).resolve().parents[1] / "profiles" / "battery-pass"
+
+
+def _load(pattern: str) -> list[object]:
+    return [
+        json.loads(path.read_text(encoding="utf-8-sig"))
+        for path in sorted(PROFILE.glob(pattern))
+    ]
+
+
+def _run(validators: list[object], payloads: list[object], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for validator in validators:
+            for payload in payloads:
+                list(validator.iter_errors(payload))  # type: ignore[attr-defined]
+    elapsed = time.perf_counter() - start
+    return rounds * len(validators) * len(payloads) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    schemas = _load("schemas/*.json")
+    payloads = _load("testvectors/*/*.json")
+    backends = {
+        "jsonschema": [build_validator(schema) for schema in schemas],  # type: ignore[arg-type]
+        "codegen": [compile_schema(schema) for schema in schemas],
+    }
+    results = {
+        name: _run(validators, payloads, args.rounds)
+        for name, validators in backends.items()
+    }
+    for name, rate in results.items():
+        print(f"{name:>10}: {rate:10.0f} docs/s")
+    print(f"   speedup: {results['codegen'] / results['jsonschema']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
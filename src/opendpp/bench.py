@@ -0,0 +1,241 @@
+"""Pipeline benchmarks over profile testvectors, behind ``dppctl bench``.
+
+Every case is checked ``rounds`` times with metrics enabled; per stage the
+suite reports p50/p95 latency and peak traced memory, per case throughput
+in documents and megabytes per second and the process peak RSS. Results
+are plain JSON so they can be saved as a baseline and compared later.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from opendpp.core.batch import TARGET_SUFFIXES
+from opendpp.core.codec import decode_json_bytes
+from opendpp.core.engine import run_conformance_check
+from opendpp.core.report import RunMetrics
+from opendpp.core.store import open_artifact_store
+from opendpp.profiles.loader import get_compiled_profile
+
+DEFAULT_SCALES = (10, 100, 1000)
+DEFAULT_THRESHOLD = 0.25
+# Stages faster than this are too noisy to flag as regressions.
+NOISE_FLOOR_MS = 1.0
+
+_ORIGIN_RELS = """<?xml version="1.0" encoding="utf-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Type="http://admin-shell.io/aasx/relationships/aasx-origin"
+    Target="/aasx/aasx-origin" Id="origin"/>
+</Relationships>"""
+_SPEC_RELS = """<?xml version="1.0" encoding="utf-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Type="http://admin-shell.io/aasx/relationships/aas-spec"
+    Target="/aasx/environment.json" Id="spec"/>
+</Relationships>"""
+
+
+@dataclass
+class BenchCase:
+    name: str
+    path: Path
+
+
+def enlarge_payload(data: Any, factor: int) -> Any:
+    """Repeats the items of every outermost array ``factor`` times."""
+    if isinstance(data, list):
+        return data * factor
+    if isinstance(data, dict):
+        return {key: enlarge_payload(value, factor) for key, value in data.items()}
+    return data
+
+
+def write_synthetic_aasx(path: Path, size_mb: int) -> Path:
+    """Writes an AASX with a small environment and a ``size_mb`` supplement."""
+    environment: dict[str, list[Any]] = {
+        "assetAdministrationShells": [],
+        "submodels": [],
+    }
+    block = bytes(range(256)) * 4096
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        package.writestr("_rels/.rels", _ORIGIN_RELS)
+        package.writestr("aasx/aasx-origin", "")
+        package.writestr("aasx/_rels/aasx-origin.rels", _SPEC_RELS)
+        package.writestr("aasx/environment.json", json.dumps(environment))
+        with package.open("aasx/suppl/model.step", "w", force_zip64=True) as member:
+            for _ in range(size_mb):
+                member.write(block)
+    return path
+
+
+def collect_cases(
+    testvectors: Path,
+    workdir: Path,
+    scales: Iterable[int] = DEFAULT_SCALES,
+    aasx_mb: int = 0,
+) -> list[BenchCase]:
+    """Lists the testvectors plus enlarged copies of their JSON payloads."""
+    vectors = sorted(
+        path
+        for path in testvectors.rglob("*")
+        if path.is_file() and path.suffix.lower() in TARGET_SUFFIXES
+    )
+    cases = [BenchCase(str(p.relative_to(testvectors)), p) for p in vectors]
+    for path in vectors:
+        name = str(path.relative_to(testvectors))
+        if path.suffix.lower() != ".json":
+            continue
+        try:
+            data = json.loads(decode_json_bytes(path.read_bytes()))
+        except ValueError:
+            continue
+        for factor in scales:
+            enlarged = enlarge_payload(data, factor)
+            if enlarged == data:
+                continue
+            target = workdir / f"{name.replace('/', '_')}-x{factor}.json"
+            target.write_text(json.dumps(enlarged), encoding="utf-8")
+            cases.append(BenchCase(f"{name}@x{factor}", target))
+    if aasx_mb:
+        target = write_synthetic_aasx(workdir / f"synthetic-{aasx_mb}mb.aasx", aasx_mb)
+        cases.append(BenchCase(target.name, target))
+    return cases
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percentile) - 1]
+
+
+def _max_rss_mb() -> Optional[float]:
+    """Peak resident set size, or ``None`` where ``resource`` is missing."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def bench_case(
+    case: BenchCase, profile_ref: str, rounds: int, artifacts_dir: str
+) -> dict[str, Any]:
+    """Checks one case ``rounds`` times and summarises the stage metrics."""
+    size = case.path.stat().st_size
+    durations: dict[str, list[float]] = {}
+    totals: list[float] = []
+    for _ in range(rounds):
+        report = run_conformance_check(
+            str(case.path), profile_ref, artifacts_dir, collect_metrics=True
+        )
+        metrics = report.metrics or RunMetrics()
+        totals.append(metrics.total_ms)
+        for stage in metrics.stages:
+            durations.setdefault(stage.name, []).append(stage.duration_ms)
+
+    # One extra traced round, so tracing overhead stays out of the timings.
+    traced = run_conformance_check(
+        str(case.path), profile_ref, artifacts_dir, trace_memory=True
+    )
+    peaks = {
+        s.name: s.peak_memory_bytes or 0
+        for s in (traced.metrics or RunMetrics()).stages
+    }
+
+    elapsed = sum(totals) / 1000
+    return {
+        "size_bytes": size,
+        "rounds": rounds,
+        "docs_per_s": rounds / elapsed if elapsed else None,
+        "mb_per_s": rounds * size / 2**20 / elapsed if elapsed else None,
+        "p50_ms": _percentile(totals, 50),
+        "p95_ms": _percentile(totals, 95),
+        "max_rss_mb": _max_rss_mb(),
+        "stages": {
+            name: {
+                "p50_ms": _percentile(values, 50),
+                "p95_ms": _percentile(values, 95),
+                "peak_traced_mb": peaks.get(name, 0) / 2**20,
+            }
+            for name, values in durations.items()
+        },
+    }
+
+
+def run_benchmark(
+    profile_ref: str = "battery-pass",
+    testvectors: Optional[Path] = None,
+    rounds: int = 5,
+    scales: Iterable[int] = DEFAULT_SCALES,
+    aasx_mb: int = 0,
+    on_case: Optional[Callable[[str, dict[str, Any]], None]] = None,
+) -> dict[str, Any]:
+    """Benchmarks every case and returns the JSON-serialisable results.
+
+    ``testvectors`` defaults to the ``testvectors`` directory of the
+    profile. Profiles are compiled before timing starts.
+    """
+    if rounds < 1:
+        raise ValueError("rounds must be at least 1")
+    profile = get_compiled_profile(profile_ref).warm()
+    testvectors = testvectors or profile.base_dir / "testvectors"
+    results: dict[str, Any] = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "profile": profile.id,
+        "profile_version": profile.version,
+        "cases": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="dppctl-bench-") as workdir:
+        cases = collect_cases(testvectors, Path(workdir), scales, aasx_mb)
+        artifacts_dir = str(Path(workdir) / "artifacts")
+        try:
+            for case in cases:
+                result = bench_case(case, profile_ref, rounds, artifacts_dir)
+                results["cases"][case.name] = result
+                if on_case is not None:
+                    on_case(case.name, result)
+        finally:
+            # Queued writes must land before the directory is removed.
+            open_artifact_store(artifacts_dir).close()
+    return results
+
+
+def compare_to_baseline(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "p50_ms",
+) -> list[str]:
+    """Lists stages whose ``metric`` grew by more than ``threshold``.
+
+    Cases or stages missing from either side are ignored, as are stages
+    below ``NOISE_FLOOR_MS`` in the current run.
+    """
+    regressions: list[str] = []
+    for name, case in results.get("cases", {}).items():
+        base_case = baseline.get("cases", {}).get(name)
+        if base_case is None:
+            continue
+        for stage, values in case["stages"].items():
+            base = base_case["stages"].get(stage)
+            if base is None or values[metric] < NOISE_FLOOR_MS:
+                continue
+            if values[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name} {stage}: {metric} {values[metric]:.1f} ms "
+                    f"vs baseline {base[metric]:.1f} ms"
+                )
+    return regressions
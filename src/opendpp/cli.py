@@ -1,13 +1,23 @@
+import cProfile
 import json
 import logging
 from pathlib import Path
+from typing import Any
 
 import click
 
+from opendpp.bench import (
+    DEFAULT_SCALES,
+    DEFAULT_THRESHOLD,
+    compare_to_baseline,
+    run_benchmark,
+)
+from opendpp.core.batch import BatchItem, collect_targets, run_batch
 from opendpp.core.engine import run_conformance_check
-from opendpp.reporting.html import render_report_html
-from opendpp.trust.issue import issue_vc_jwt, load_jwk
-from opendpp.core.report import ConformanceReport
+from opendpp.core.findings import FindingAggregator, FindingSink, NdjsonFindingSink
+from opendpp.core.report import ConformanceReport, RunMetrics
+from opendpp.core.result_cache import default_result_cache
+from opendpp.core.store import COMPRESSIONS, open_artifact_store
 
 
 @click.group()
@@ -16,6 +26,29 @@ def cli() -> None:
     logging.basicConfig(level=logging.INFO)
 
 
+def _echo_timings(metrics: RunMetrics, slowest: int = 10) -> None:
+    click.echo(f"{'Stage':<22}{'ms':>10}{'peak MiB':>10}")
+    for stage in metrics.stages:
+        peak = (
+            f"{stage.peak_memory_bytes / 2**20:.1f}"
+            if stage.peak_memory_bytes is not None
+            else "-"
+        )
+        name = f"{stage.name} (cached)" if stage.cached else stage.name
+        click.echo(f"{name:<22}{stage.duration_ms:>10.1f}{peak:>10}")
+    click.echo(f"{'total':<22}{metrics.total_ms:>10.1f}")
+
+    validators = sorted(metrics.validators, key=lambda v: -v.duration_ms)[:slowest]
+    if validators:
+        click.echo("Slowest validators:")
+        for entry in validators:
+            artifact = entry.artifact_uri or "*"
+            click.echo(
+                f"  {entry.duration_ms:>8.1f} ms  {entry.stage}  "
+                f"{entry.validator}  {artifact}"
+            )
+
+
 @cli.command()
 @click.argument("target")
 @click.option("--profile", default="espr-core", help="Conformance profile to use.")
@@ -28,25 +61,140 @@ def cli() -> None:
     default="report_artifacts",
     help="Directory to store fetched artifacts.",
 )
+@click.option(
+    "--schema-backend",
+    type=click.Choice(["jsonschema", "codegen"]),
+    default=None,
+    help="JSON Schema backend (default: as configured by the profile).",
+)
+@click.option(
+    "--offline/--online",
+    default=None,
+    help="Never fetch JSON-LD contexts; fail on contexts not bundled or cached.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Ignore cached results and HTTP responses.",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    help="Record stage and validator timings and print a summary table.",
+)
+@click.option(
+    "--trace-memory",
+    is_flag=True,
+    help="Record peak memory per stage with tracemalloc (slows the run down).",
+)
+@click.option(
+    "--profile-out",
+    default=None,
+    help="Write a cProfile dump of the run to this path.",
+)
+@click.option(
+    "--findings-ndjson",
+    default=None,
+    help="Stream every finding to this newline-delimited JSON file.",
+)
+@click.option(
+    "--max-findings-per-rule",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Keep at most this many findings per rule in the report.",
+)
+@click.option(
+    "--aggregate-findings",
+    is_flag=True,
+    help="Group findings by rule and location pattern in the report.",
+)
+@click.option(
+    "--stage-workers",
+    default=1,
+    show_default=True,
+    help="Run independent validation stages concurrently on this many workers.",
+)
+@click.option(
+    "--stage-executor",
+    type=click.Choice(["thread", "process"]),
+    default="thread",
+    show_default=True,
+    help="Pool used with --stage-workers above 1.",
+)
+@click.option(
+    "--artifact-compression",
+    type=click.Choice(COMPRESSIONS),
+    default=None,
+    help="Compress stored artifacts (zstd needs the zstandard package).",
+)
 def check(
-    target: str, profile: str, output: str, html_output: str, artifacts_dir: str
+    target: str,
+    profile: str,
+    output: str,
+    html_output: str,
+    artifacts_dir: str,
+    schema_backend: str | None,
+    offline: bool | None,
+    no_cache: bool,
+    timings: bool,
+    trace_memory: bool,
+    profile_out: str | None,
+    findings_ndjson: str | None,
+    max_findings_per_rule: int | None,
+    aggregate_findings: bool,
+    stage_workers: int,
+    stage_executor: str,
+    artifact_compression: str | None,
 ) -> None:
     """Runs a conformance check against a target (URL, DID, File)."""
     click.echo(f"Running conformance check against: {target} using profile: {profile}")
 
+    sinks: list[FindingSink] = []
     try:
-        report = run_conformance_check(
-            target=target, profile_ref=profile, report_artifacts_dir=artifacts_dir
-        )
+        if findings_ndjson:
+            sinks.append(NdjsonFindingSink(findings_ndjson))
+        if aggregate_findings:
+            sinks.append(FindingAggregator())
+        profiler = cProfile.Profile() if profile_out else None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            report = run_conformance_check(
+                target=target,
+                profile_ref=profile,
+                schema_backend=schema_backend,
+                offline=offline,
+                result_cache=None if no_cache else default_result_cache(),
+                http_cache=not no_cache,
+                collect_metrics=timings,
+                trace_memory=trace_memory,
+                findings_sinks=sinks,
+                max_findings_per_rule=max_findings_per_rule,
+                stage_workers=stage_workers,
+                stage_executor=stage_executor,
+                artifact_store=open_artifact_store(artifacts_dir, artifact_compression),
+            )
+        finally:
+            if profiler is not None and profile_out:
+                profiler.disable()
+                profiler.dump_stats(profile_out)
+                click.echo(f"Profile written to: {profile_out}")
 
         Path(output).write_text(report.model_dump_json(indent=2), encoding="utf-8")
         click.echo(f"Report generated: {output}")
+        if findings_ndjson:
+            click.echo(f"Findings streamed to: {findings_ndjson}")
 
         if html_output:
+            from opendpp.reporting.html import render_report_html
+
             html = render_report_html(report)
             Path(html_output).write_text(html, encoding="utf-8")
             click.echo(f"HTML report generated: {html_output}")
 
+        if report.metrics is not None:
+            _echo_timings(report.metrics)
+
         if report.passed:
             click.echo(click.style("CONFORMANCE PASSED", fg="green"))
         else:
@@ -55,6 +203,251 @@ def check(
     except Exception as e:
         click.echo(click.style(f"Error: {str(e)}", fg="red"))
         raise click.Abort()
+    finally:
+        for sink in sinks:
+            if isinstance(sink, NdjsonFindingSink):
+                sink.close()
+
+
+@cli.command("check-batch")
+@click.argument("source")
+@click.option("--profile", default="espr-core", help="Conformance profile to use.")
+@click.option(
+    "--jobs", default=1, show_default=True, help="Number of worker processes."
+)
+@click.option(
+    "--output-dir",
+    default="batch_reports",
+    help="Directory for per-target JSON reports.",
+)
+@click.option(
+    "--summary-output",
+    default="batch_summary.json",
+    help="Output path for the aggregated summary.",
+)
+@click.option(
+    "--artifacts-dir",
+    default="report_artifacts",
+    help="Directory to store fetched artifacts.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Ignore cached results and HTTP responses.",
+)
+@click.option(
+    "--artifact-compression",
+    type=click.Choice(COMPRESSIONS),
+    default=None,
+    help="Compress stored artifacts (zstd needs the zstandard package).",
+)
+def check_batch(
+    source: str,
+    profile: str,
+    jobs: int,
+    output_dir: str,
+    summary_output: str,
+    artifacts_dir: str,
+    no_cache: bool,
+    artifact_compression: str | None,
+) -> None:
+    """Checks every target in a directory, glob or newline-delimited manifest."""
+    try:
+        targets = collect_targets(source)
+        click.echo(f"Checking {len(targets)} targets with {jobs} job(s)")
+
+        reports_dir = Path(output_dir)
+        reports_dir.mkdir(parents=True, exist_ok=True)
+
+        def _write_report(item: BatchItem) -> str | None:
+            if item.report is None:
+                click.echo(click.style(f"ERROR {item.target}: {item.error}", fg="red"))
+                return None
+            path = reports_dir / f"{item.index:06d}.json"
+            path.write_text(item.report.model_dump_json(indent=2), encoding="utf-8")
+            return str(path)
+
+        summary = run_batch(
+            targets,
+            profile_ref=profile,
+            jobs=jobs,
+            report_artifacts_dir=artifacts_dir,
+            on_item=_write_report,
+            use_cache=not no_cache,
+            artifact_compression=artifact_compression,
+        )
+        Path(summary_output).write_text(
+            summary.model_dump_json(indent=2), encoding="utf-8"
+        )
+
+        click.echo(
+            f"Passed: {summary.passed}  Failed: {summary.failed}  "
+            f"Errored: {summary.errored}  Total: {summary.total}"
+        )
+        for rule_id, count in summary.rule_failures.items():
+            click.echo(f"  {rule_id}: {count}")
+        click.echo(f"Summary written to: {summary_output}")
+    except Exception as e:
+        click.echo(click.style(f"Error: {str(e)}", fg="red"))
+        raise click.Abort()
+
+
+@cli.command()
+@click.option(
+    "--profile",
+    "profiles",
+    multiple=True,
+    default=["espr-core"],
+    show_default=True,
+    help="Profile to keep warm; repeat for several. The first is the default.",
+)
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8080, show_default=True)
+@click.option("--workers", default=4, show_default=True, help="Concurrent checks.")
+@click.option(
+    "--queue",
+    "queue_size",
+    default=16,
+    show_default=True,
+    help="Checks allowed to wait for a worker before answering 429.",
+)
+@click.option(
+    "--artifacts-dir",
+    default="report_artifacts",
+    help="Directory to store fetched artifacts.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Ignore cached results and HTTP responses.",
+)
+def serve(
+    profiles: tuple[str, ...],
+    host: str,
+    port: int,
+    workers: int,
+    queue_size: int,
+    artifacts_dir: str,
+    no_cache: bool,
+) -> None:
+    """Serves conformance checks over HTTP with warm profiles."""
+    from opendpp.service import ValidationServer, ValidationService
+
+    try:
+        service = ValidationService(
+            profiles,
+            workers=workers,
+            queue_size=queue_size,
+            report_artifacts_dir=artifacts_dir,
+            result_cache=None if no_cache else default_result_cache(),
+            http_cache=not no_cache,
+        )
+        server = ValidationServer((host, port), service)
+    except Exception as e:
+        click.echo(click.style(f"Error: {str(e)}", fg="red"))
+        raise click.Abort()
+
+    click.echo(f"Serving {', '.join(profiles)} on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+@cli.command()
+@click.option("--profile", default="battery-pass", help="Profile to benchmark.")
+@click.option(
+    "--testvectors",
+    default=None,
+    help="Directory of payloads (default: the profile's testvectors).",
+)
+@click.option(
+    "--rounds",
+    default=5,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Checks per case.",
+)
+@click.option(
+    "--scale",
+    "scales",
+    multiple=True,
+    type=int,
+    default=list(DEFAULT_SCALES),
+    show_default=True,
+    help="Array enlargement factor for synthetic payloads; repeatable.",
+)
+@click.option(
+    "--aasx-mb",
+    default=256,
+    show_default=True,
+    help="Size of the synthetic AASX package in MB (0 to skip).",
+)
+@click.option(
+    "--output", default="bench_results.json", help="Output path for the results."
+)
+@click.option("--baseline", default=None, help="Results JSON to compare against.")
+@click.option(
+    "--threshold",
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    help="Allowed relative slowdown per stage before failing.",
+)
+@click.option(
+    "--metric",
+    type=click.Choice(["p50_ms", "p95_ms"]),
+    default="p50_ms",
+    show_default=True,
+    help="Latency percentile compared against the baseline.",
+)
+def bench(
+    profile: str,
+    testvectors: str | None,
+    rounds: int,
+    scales: tuple[int, ...],
+    aasx_mb: int,
+    output: str,
+    baseline: str | None,
+    threshold: float,
+    metric: str,
+) -> None:
+    """Benchmarks every stage and fails on regressions against a baseline."""
+
+    def _echo_case(name: str, case: dict[str, Any]) -> None:
+        rss = case["max_rss_mb"]
+        click.echo(
+            f"{name}: p50 {case['p50_ms']:.1f} ms  p95 {case['p95_ms']:.1f} ms  "
+            f"{case['docs_per_s']:.1f} docs/s  {case['mb_per_s']:.2f} MB/s  "
+            f"RSS {'-' if rss is None else f'{rss:.0f}'} MB"
+        )
+
+    try:
+        results = run_benchmark(
+            profile_ref=profile,
+            testvectors=Path(testvectors) if testvectors else None,
+            rounds=rounds,
+            scales=scales,
+            aasx_mb=aasx_mb,
+            on_case=_echo_case,
+        )
+        Path(output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        click.echo(f"Results written to: {output}")
+
+        regressions: list[str] = []
+        if baseline:
+            reference = json.loads(Path(baseline).read_text(encoding="utf-8"))
+            regressions = compare_to_baseline(results, reference, threshold, metric)
+    except Exception as e:
+        click.echo(click.style(f"Error: {str(e)}", fg="red"))
+        raise click.Abort()
+
+    for regression in regressions:
+        click.echo(click.style(f"REGRESSION {regression}", fg="red"))
+    if regressions:
+        raise SystemExit(1)
 
 
 @cli.command("issue-attestation")
@@ -69,6 +462,11 @@ def check(
     default="conformance.vc.json",
     help="Output path for decoded VC JSON.",
 )
+@click.option(
+    "--artifacts-dir",
+    default=None,
+    help="Artifact store of the check; every artifact hash must resolve in it.",
+)
 def issue_attestation(
     report_path: str,
     issuer: str,
@@ -77,15 +475,25 @@ def issue_attestation(
     kid: str | None,
     output: str,
     decoded_output: str,
+    artifacts_dir: str | None,
 ) -> None:
     """Issue a VC-JWT conformance attestation from a report.json."""
+    from opendpp.trust.issue import issue_vc_jwt, load_jwk
+
     try:
         report_json = Path(report_path).read_text(encoding="utf-8")
         report = ConformanceReport.model_validate_json(report_json)
         jwk_data = load_jwk(jwk_path)
 
         token, vc = issue_vc_jwt(
-            report, issuer=issuer, jwk_data=jwk_data, alg=alg, kid=kid
+            report,
+            issuer=issuer,
+            jwk_data=jwk_data,
+            alg=alg,
+            kid=kid,
+            artifact_store=open_artifact_store(artifacts_dir)
+            if artifacts_dir
+            else None,
         )
         Path(output).write_text(token, encoding="utf-8")
 
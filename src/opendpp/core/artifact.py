@@ -1,10 +1,19 @@
 from __future__ import annotations
 
 import hashlib
+import json
+import mmap
+import os
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Annotated, Optional, Dict, Any, List, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PlainValidator, PrivateAttr
+
+from opendpp.core.codec import Buffer, decode_json_bytes
+
+if TYPE_CHECKING:
+    from aas_core3 import types as aas_types
+    from rdflib import Graph
 
 
 class ArtifactType(str, Enum):
@@ -17,16 +26,148 @@ class ArtifactType(str, Enum):
     RDF_GRAPH = "rdf_graph"
     SHACL_SHAPES = "shacl_shapes"
     AASX_PACKAGE = "aasx_package"
+    POLICY_RULES = "policy_rules"
+
+
+# Local files from this size on are memory-mapped instead of read.
+MMAP_THRESHOLD = 1024 * 1024
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _keep_buffer(value: Any) -> Buffer:
+    # Buffers are taken as they are; pydantic's own bytes validation would
+    # copy a bytearray while trying the union members.
+    if isinstance(value, (bytes, bytearray, memoryview, mmap.mmap)):
+        return value
+    raise ValueError("raw_bytes must be a bytes-like buffer")
+
+
+def sha256_hex(buffer: Buffer) -> str:
+    """Hashes a buffer in chunks, without copying it."""
+    digest = hashlib.sha256()
+    with memoryview(buffer) as view:
+        for start in range(0, len(view), _CHUNK_SIZE):
+            digest.update(view[start : start + _CHUNK_SIZE])
+    return digest.hexdigest()
 
 
 class Artifact(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     uri: str
     content_type: Optional[str]
     artifact_type: ArtifactType
-    raw_bytes: bytes
+    # Large inputs keep a zero-copy buffer (file mapping, zip member slice)
+    # rather than bytes; see view(), head() and contains().
+    raw_bytes: Annotated[Buffer, PlainValidator(_keep_buffer)]
     sha256: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    # Decoded views of raw_bytes, built on first access and shared by stages.
+    _text: Optional[str] = PrivateAttr(default=None)
+    _json: Any = PrivateAttr(default=None)
+    _json_loaded: bool = PrivateAttr(default=False)
+    _aas_environment: Any = PrivateAttr(default=None)
+    _rdf_graph: Any = PrivateAttr(default=None)
+    _rdf_evidence: Any = PrivateAttr(default=None)
+
+    def view(self) -> memoryview:
+        """Returns a read-only view of the payload without copying it."""
+        return memoryview(self.raw_bytes).toreadonly()
+
+    def head(self, size: int = 1024) -> bytes:
+        """Returns the first ``size`` bytes of the payload."""
+        return bytes(self.view()[:size])
+
+    def contains(self, needle: bytes) -> bool:
+        """Tells whether the payload contains ``needle``, scanning in chunks."""
+        if isinstance(self.raw_bytes, (bytes, bytearray, mmap.mmap)):
+            return self.raw_bytes.find(needle) != -1
+        view = self.view()
+        step = max(_CHUNK_SIZE, len(needle))
+        for start in range(0, len(view), step):
+            if needle in bytes(view[start : start + step + len(needle) - 1]):
+                return True
+        return False
+
+    def to_bytes(self) -> bytes:
+        """Returns the payload as ``bytes``, copying buffers other than bytes."""
+        if isinstance(self.raw_bytes, bytes):
+            return self.raw_bytes
+        return bytes(self.raw_bytes)
+
+    def text(self) -> str:
+        """Returns the payload decoded as text (BOM and UTF-16 tolerant)."""
+        if self._text is None:
+            self._text = decode_json_bytes(self.raw_bytes)
+        return self._text
+
+    def parsed_json(self) -> Any:
+        """Returns the parsed JSON tree; callers must not mutate it.
+
+        The decoded text is only kept if ``text()`` was asked for, so large
+        payloads do not hold a text copy next to the tree.
+        """
+        if not self._json_loaded:
+            text = self._text
+            self._json = json.loads(
+                text if text is not None else decode_json_bytes(self.raw_bytes)
+            )
+            self._json_loaded = True
+        return self._json
+
+    def aas_environment(self) -> "aas_types.Environment":
+        """Returns the AAS environment deserialized from the JSON payload."""
+        if self._aas_environment is None:
+            from aas_core3 import jsonization as aas_json
+
+            self._aas_environment = aas_json.environment_from_jsonable(
+                self.parsed_json()
+            )
+        environment: "aas_types.Environment" = self._aas_environment
+        return environment
+
+    def rdf_graph(self, document_loader: Any = None) -> "Graph":
+        """Returns the RDF graph for the payload; callers must not mutate it.
+
+        AAS payloads are mapped with ``aas_to_rdf``; everything else goes
+        through ``to_rdf_graph``, resolving JSON-LD contexts through
+        ``document_loader`` when given.
+        """
+        if self._rdf_graph is None:
+            if self.artifact_type == ArtifactType.AAS_PAYLOAD:
+                from opendpp.twin.aas.aas_to_rdf import aas_to_rdf
+
+                self._rdf_graph = aas_to_rdf(self.aas_environment())
+            else:
+                from opendpp.normalize.jsonld import to_rdf_graph
+
+                self._rdf_graph = to_rdf_graph(self, document_loader)
+        graph: "Graph" = self._rdf_graph
+        return graph
+
+    def rdf_evidence(self) -> "Artifact":
+        """Returns ``rdf_graph()`` as a canonical N-Triples artifact.
+
+        Built once, on first use, and shared by every shapes file. The
+        returned artifact hands out the same in-memory graph, so nothing is
+        parsed back.
+        """
+        if self._rdf_evidence is None:
+            from opendpp.normalize.ntriples import canonical_ntriples
+
+            graph = self.rdf_graph()
+            evidence = Artifact.from_bytes(
+                uri=f"{self.uri}#rdf",
+                content_type="application/n-triples",
+                artifact_type=ArtifactType.RDF_GRAPH,
+                raw_bytes=canonical_ntriples(graph),
+            )
+            evidence._rdf_graph = graph
+            self._rdf_evidence = evidence
+        artifact: "Artifact" = self._rdf_evidence
+        return artifact
+
     @classmethod
     def from_bytes(
         cls,
@@ -34,19 +175,49 @@ class Artifact(BaseModel):
         uri: str,
         content_type: Optional[str],
         artifact_type: ArtifactType,
-        raw_bytes: bytes,
+        raw_bytes: Buffer,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> "Artifact":
-        digest = hashlib.sha256(raw_bytes).hexdigest()
         return cls(
             uri=uri,
             content_type=content_type,
             artifact_type=artifact_type,
             raw_bytes=raw_bytes,
-            sha256=digest,
+            sha256=sha256_hex(raw_bytes),
             metadata=metadata or {},
         )
 
+    @classmethod
+    def from_file(
+        cls,
+        path: "str | os.PathLike[str]",
+        *,
+        content_type: Optional[str],
+        artifact_type: ArtifactType,
+        metadata: Optional[Dict[str, Any]] = None,
+        mmap_threshold: int = MMAP_THRESHOLD,
+    ) -> "Artifact":
+        """Loads a local file, memory-mapping it from ``mmap_threshold`` bytes.
+
+        Mapped pages are only read when touched and are shared with the page
+        cache, so a large file is never copied into the process. The file
+        must not be truncated while the artifact is alive.
+        """
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            raw_bytes: Buffer
+            if size and size >= mmap_threshold:
+                raw_bytes = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                raw_bytes = handle.read()
+        return cls.from_bytes(
+            uri=str(path),
+            content_type=content_type,
+            artifact_type=artifact_type,
+            raw_bytes=raw_bytes,
+            metadata=metadata,
+        )
+
 
 class ProfileArtifacts(BaseModel):
     schemas: List[str] = Field(default_factory=list)
@@ -56,6 +227,26 @@ class ProfileArtifacts(BaseModel):
     contexts: List[str] = Field(default_factory=list)
 
 
+class ProfileJsonSchema(BaseModel):
+    format_assertion: bool = False
+    backend: Literal["jsonschema", "codegen"] = "jsonschema"
+
+
+class ProfileShacl(BaseModel):
+    # Inference per shapes file (as listed under artifacts.shapes). "auto"
+    # enables RDFS only for shapes relying on subclass/subproperty reasoning.
+    inference: Dict[str, Literal["auto", "none", "rdfs", "owlrl", "both"]] = Field(
+        default_factory=dict
+    )
+
+
+class ProfileJsonLd(BaseModel):
+    # Remote @context URL -> bundled file listed under artifacts.contexts.
+    context_urls: Dict[str, str] = Field(default_factory=dict)
+    offline: bool = False
+    cache_ttl: int = 24 * 60 * 60
+
+
 class ProfileTrust(BaseModel):
     allowed_issuers: List[str] = Field(default_factory=list)
     vc_formats: List[str] = Field(default_factory=list)
@@ -67,6 +258,9 @@ class Profile(BaseModel):
     description: Optional[str] = None
     entrypoint_media_types: List[str] = Field(default_factory=list)
     artifacts: ProfileArtifacts = Field(default_factory=ProfileArtifacts)
+    json_schema: ProfileJsonSchema = Field(default_factory=ProfileJsonSchema)
+    shacl: ProfileShacl = Field(default_factory=ProfileShacl)
+    jsonld: ProfileJsonLd = Field(default_factory=ProfileJsonLd)
     trust: ProfileTrust = Field(default_factory=ProfileTrust)
 
 
@@ -0,0 +1,213 @@
+"""Batch conformance checking over many targets."""
+
+from __future__ import annotations
+
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from pydantic import BaseModel, Field
+
+from opendpp.core.engine import run_conformance_check
+from opendpp.core.report import ConformanceReport, Severity
+from opendpp.core.result_cache import default_result_cache
+from opendpp.core.store import open_artifact_store
+from opendpp.profiles.loader import (
+    CompiledProfile,
+    get_compiled_profile,
+    resolve_profile_path,
+)
+
+TARGET_SUFFIXES = {".json", ".jsonld", ".json-ld", ".aas", ".aasx", ".xml", ".ttl"}
+
+
+class BatchItem(BaseModel):
+    index: int
+    target: str
+    passed: bool | None = None
+    error: str | None = None
+    report: Optional[ConformanceReport] = None
+
+
+class BatchTargetResult(BaseModel):
+    index: int
+    target: str
+    passed: bool | None = None
+    error: str | None = None
+    report_path: str | None = None
+
+
+class BatchSummary(BaseModel):
+    profile_id: str
+    profile_version: str
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    errored: int = 0
+    rule_failures: dict[str, int] = Field(default_factory=dict)
+    targets: list[BatchTargetResult] = Field(default_factory=list)
+
+    def add(self, item: BatchItem, report_path: str | None = None) -> None:
+        self.total += 1
+        if item.error is not None:
+            self.errored += 1
+        elif item.passed:
+            self.passed += 1
+        else:
+            self.failed += 1
+
+        if item.report is not None:
+            failing_rules = {
+                f.rule_id for f in item.report.findings if f.severity == Severity.ERROR
+            }
+            for rule_id in failing_rules:
+                self.rule_failures[rule_id] = self.rule_failures.get(rule_id, 0) + 1
+
+        self.targets.append(
+            BatchTargetResult(
+                index=item.index,
+                target=item.target,
+                passed=item.passed,
+                error=item.error,
+                report_path=report_path,
+            )
+        )
+
+
+def collect_targets(source: str) -> list[str]:
+    """Expands a directory, glob pattern or manifest file into target list.
+
+    Directories are walked recursively for files with a known payload suffix,
+    glob patterns are expanded, and any other file is read as a
+    newline-delimited manifest (blank lines and ``#`` comments are ignored).
+    The result is sorted (directories and globs) or kept in manifest order,
+    so the batch output is deterministic.
+    """
+    path = Path(source)
+    if path.is_dir():
+        return sorted(
+            str(p)
+            for p in path.rglob("*")
+            if p.is_file() and p.suffix.lower() in TARGET_SUFFIXES
+        )
+    if any(ch in source for ch in "*?["):
+        return sorted(p for p in glob.glob(source, recursive=True) if Path(p).is_file())
+    if path.is_file():
+        targets: list[str] = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            entry = line.strip()
+            if entry and not entry.startswith("#"):
+                targets.append(entry)
+        return targets
+    raise FileNotFoundError(f"Batch source not found: {source}")
+
+
+_WORKER_PROFILE: CompiledProfile | None = None
+
+
+def _init_worker(profile_path: str) -> None:
+    global _WORKER_PROFILE
+    _WORKER_PROFILE = get_compiled_profile(profile_path).warm()
+
+
+def _check_one(
+    index: int,
+    target: str,
+    profile: str | CompiledProfile,
+    report_artifacts_dir: str,
+    use_cache: bool = False,
+    artifact_compression: str | None = None,
+) -> BatchItem:
+    try:
+        report = run_conformance_check(
+            target=target,
+            profile_ref=profile,
+            result_cache=default_result_cache() if use_cache else None,
+            http_cache=use_cache,
+            artifact_store=open_artifact_store(
+                report_artifacts_dir, artifact_compression
+            ),
+        )
+    except Exception as exc:
+        return BatchItem(index=index, target=target, error=str(exc))
+    return BatchItem(index=index, target=target, passed=report.passed, report=report)
+
+
+def _check_in_worker(job: tuple[int, str, str, bool, str | None]) -> BatchItem:
+    index, target, report_artifacts_dir, use_cache, compression = job
+    assert _WORKER_PROFILE is not None, "worker profile not initialised"
+    item = _check_one(
+        index, target, _WORKER_PROFILE, report_artifacts_dir, use_cache, compression
+    )
+    # Pool workers exit without running atexit handlers.
+    open_artifact_store(report_artifacts_dir, compression).flush()
+    return item
+
+
+def iter_batch(
+    targets: Iterable[str],
+    profile_ref: str,
+    jobs: int = 1,
+    report_artifacts_dir: str = "report_artifacts",
+    chunksize: int = 8,
+    use_cache: bool = False,
+    artifact_compression: str | None = None,
+) -> Iterator[BatchItem]:
+    """Checks targets and yields one item per target, in input order.
+
+    With ``jobs > 1`` the targets are spread over a process pool whose
+    workers each compile the profile once at start-up. A failing target is
+    reported as an item with ``error`` set and never aborts the batch.
+    ``use_cache`` replays results of unchanged payloads from the result
+    cache and revalidates fetched targets against the HTTP response cache.
+    Artifacts are stored with ``artifact_compression`` (``gzip`` or
+    ``zstd``) and are all on disk once iteration ends.
+    """
+    profile_path = str(resolve_profile_path(profile_ref).resolve())
+    work = (
+        (i, t, report_artifacts_dir, use_cache, artifact_compression)
+        for i, t in enumerate(targets)
+    )
+
+    if jobs <= 1:
+        profile = get_compiled_profile(profile_path).warm()
+        for job in work:
+            yield _check_one(job[0], job[1], profile, *job[2:])
+        open_artifact_store(report_artifacts_dir, artifact_compression).flush()
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(profile_path,)
+    ) as pool:
+        yield from pool.map(_check_in_worker, work, chunksize=chunksize)
+
+
+def run_batch(
+    targets: Iterable[str],
+    profile_ref: str,
+    jobs: int = 1,
+    report_artifacts_dir: str = "report_artifacts",
+    on_item: Callable[[BatchItem], str | None] | None = None,
+    use_cache: bool = False,
+    artifact_compression: str | None = None,
+) -> BatchSummary:
+    """Checks every target and returns the aggregated summary.
+
+    ``on_item`` is called with each item as it completes, for example to
+    write its report to disk; a returned path is recorded in the summary.
+    """
+    profile = get_compiled_profile(profile_ref)
+    summary = BatchSummary(profile_id=profile.id, profile_version=profile.version)
+    for item in iter_batch(
+        targets,
+        profile_ref,
+        jobs,
+        report_artifacts_dir,
+        use_cache=use_cache,
+        artifact_compression=artifact_compression,
+    ):
+        report_path = on_item(item) if on_item else None
+        summary.add(item, report_path)
+    summary.rule_failures = dict(sorted(summary.rule_failures.items()))
+    return summary
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+from opendpp.core.codec import Buffer
+
+
+def cache_root() -> Path:
+    """Returns the directory holding opendpp's persistent caches.
+
+    ``OPENDPP_CACHE_DIR`` takes precedence over ``$XDG_CACHE_HOME/opendpp``
+    (``~/.cache/opendpp`` when unset).
+    """
+    override = os.environ.get("OPENDPP_CACHE_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "opendpp"
+
+
+def atomic_write_bytes(path: Path, data: Buffer) -> None:
+    """Writes a file so concurrent readers never observe a partial write."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from typing import Iterable
+import mmap
+from typing import Iterable, Union
 
+# Payload contents: bytes, or a zero-copy view of a file mapping or zip member.
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
 
-def decode_json_bytes(raw_bytes: bytes, encodings: Iterable[str] | None = None) -> str:
+
+def decode_json_bytes(raw_bytes: Buffer, encodings: Iterable[str] | None = None) -> str:
     """Decode JSON bytes, tolerating BOM and UTF-16 sources."""
     candidates = (
         list(encodings)
@@ -19,10 +23,10 @@ def decode_json_bytes(raw_bytes: bytes, encodings: Iterable[str] | None = None)
     last_error: UnicodeDecodeError | None = None
     for encoding in candidates:
         try:
-            return raw_bytes.decode(encoding)
+            return str(raw_bytes, encoding)
         except UnicodeDecodeError as exc:
             last_error = exc
             continue
     if last_error:
         raise last_error
-    return raw_bytes.decode("utf-8")
+    return str(raw_bytes, "utf-8")
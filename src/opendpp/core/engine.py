@@ -1,22 +1,34 @@
 from __future__ import annotations
 
-import json
 import mimetypes
+import zipfile
 from pathlib import Path
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Sequence
 
 from opendpp.core.artifact import Artifact, ArtifactType
-from opendpp.core.codec import decode_json_bytes
-from opendpp.core.report import ConformanceReport, Severity
-from opendpp.fetch.http import HttpFetcher
-from opendpp.policy.espr_core import PolicyEngine
-from opendpp.profiles.loader import load_profile, resolve_artifact_paths
+from opendpp.core.findings import FindingSink
+from opendpp.core.metrics import MetricsRecorder
+from opendpp.core.report import ArtifactRecord, ConformanceReport, Finding, Severity
+from opendpp.core.result_cache import ResultCache, result_key
+from opendpp.core.scheduler import StageTask, run_stages_concurrently
+from opendpp.core.store import (
+    ArtifactStore,
+    close_artifact_stores,
+    open_artifact_store,
+)
+from opendpp.profiles.loader import CompiledProfile, get_compiled_profile
 from opendpp.resolve.parse_input import InputType, parse_input
-from opendpp.twin.aas.aas_to_rdf import aas_to_rdf
+from opendpp.trust.embedded import embedded_credentials
 from opendpp.twin.aas.aasx import extract_aasx, parse_aas_json
-from opendpp.validate.semantic.shacl import validate_shacl
 from opendpp.validate.syntax.openapi_contract import validate_openapi_contract
-from opendpp.validate.syntax.json_schema import validate_json_schema
+from opendpp.validate.syntax.schema_routing import SchemaRoute
+
+if TYPE_CHECKING:
+    from opendpp.trust.did import DidResolver
+
+
+# Shared disabled recorder for stage helpers called without instrumentation.
+_NO_METRICS = MetricsRecorder()
 
 
 def _looks_like_aas_json(data: dict[str, Any]) -> bool:
@@ -31,7 +43,7 @@ def _guess_content_type(path: Path) -> str | None:
     return guessed
 
 
-def _artifact_type_from_path(path: Path, raw_bytes: bytes) -> ArtifactType:
+def _artifact_type_from_path(path: Path, artifact: Artifact) -> ArtifactType:
     suffix = path.suffix.lower()
     if suffix == ".aasx":
         return ArtifactType.AASX_PACKAGE
@@ -39,9 +51,11 @@ def _artifact_type_from_path(path: Path, raw_bytes: bytes) -> ArtifactType:
         return ArtifactType.RDF_GRAPH
     if suffix in {".xml", ".aas"}:
         return ArtifactType.AAS_PAYLOAD
+    if suffix == ".jwt":
+        return ArtifactType.VC_JWT
     if suffix in {".json", ".jsonld", ".json-ld"}:
         try:
-            data = json.loads(decode_json_bytes(raw_bytes))
+            data = artifact.parsed_json()
             if isinstance(data, dict) and _looks_like_aas_json(data):
                 return ArtifactType.AAS_PAYLOAD
         except Exception:
@@ -50,43 +64,60 @@ def _artifact_type_from_path(path: Path, raw_bytes: bytes) -> ArtifactType:
     return ArtifactType.DPP_PAYLOAD
 
 
-def _persist_artifact(artifact: Artifact, output_dir: Path) -> None:
-    output_dir.mkdir(parents=True, exist_ok=True)
-    extension = ".bin"
-    if artifact.content_type:
-        if "json" in artifact.content_type:
-            extension = ".json"
-        elif "xml" in artifact.content_type:
-            extension = ".xml"
-        elif "turtle" in artifact.content_type:
-            extension = ".ttl"
-    path = output_dir / f"{artifact.sha256}{extension}"
-    if not path.exists():
-        path.write_bytes(artifact.raw_bytes)
-    artifact.metadata["stored_path"] = str(path)
-
-
 def _load_file_artifact(path: Path) -> Artifact:
-    raw_bytes = path.read_bytes()
-    content_type = _guess_content_type(path)
-    if content_type is None and raw_bytes.lstrip().startswith(b"<"):
-        content_type = "application/xml"
-    artifact_type = _artifact_type_from_path(path, raw_bytes)
-    return Artifact.from_bytes(
-        uri=str(path),
-        content_type=content_type,
-        artifact_type=artifact_type,
+    artifact = Artifact.from_file(
+        path,
+        content_type=_guess_content_type(path),
+        artifact_type=ArtifactType.DPP_PAYLOAD,
+    )
+    if artifact.content_type is None and artifact.head().lstrip().startswith(b"<"):
+        artifact.content_type = "application/xml"
+    artifact.artifact_type = _artifact_type_from_path(path, artifact)
+    return artifact
+
+
+def payload_artifact(
+    raw_bytes: bytes, uri: str = "payload", content_type: str | None = None
+) -> Artifact:
+    """Wraps payload bytes received in memory (e.g. over HTTP) as an artifact.
+
+    The artifact type is derived from ``content_type`` and the payload
+    itself, as it would be from a file suffix.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if raw_bytes.startswith(b"PK\x03\x04") or media_type in {
+        "application/zip",
+        "application/asset-administration-shell-package",
+    }:
+        suffix = ".aasx"
+    elif "turtle" in media_type or "n-triples" in media_type:
+        suffix = ".ttl"
+    elif media_type.endswith("jwt"):
+        suffix = ".jwt"
+    elif "xml" in media_type or raw_bytes.lstrip().startswith(b"<"):
+        suffix = ".xml"
+    else:
+        suffix = ".json"
+    artifact = Artifact.from_bytes(
+        uri=uri,
+        content_type=content_type or mimetypes.types_map.get(suffix),
+        artifact_type=ArtifactType.DPP_PAYLOAD,
         raw_bytes=raw_bytes,
     )
+    artifact.artifact_type = _artifact_type_from_path(
+        Path(f"payload{suffix}"), artifact
+    )
+    return artifact
 
 
-def _ingest_target(target: str) -> tuple[list[Artifact], str]:
+def _ingest_target(target: str, http_cache: bool = False) -> tuple[list[Artifact], str]:
     input_type, canonical = parse_input(target)
     artifacts: list[Artifact] = []
 
     if input_type in {InputType.URL, InputType.DIGITAL_LINK}:
-        fetcher = HttpFetcher()
-        artifacts.append(fetcher.fetch(canonical))
+        from opendpp.fetch.http import default_fetcher
+
+        artifacts.append(default_fetcher(http_cache).fetch(canonical))
     elif input_type == InputType.FILE:
         artifacts.append(_load_file_artifact(Path(canonical)))
     else:
@@ -95,65 +126,90 @@ def _ingest_target(target: str) -> tuple[list[Artifact], str]:
     return artifacts, canonical
 
 
-def _load_artifacts_from_paths(
-    paths: Iterable[str], artifact_type: ArtifactType
-) -> list[Artifact]:
-    loaded: list[Artifact] = []
-    for path in paths:
-        raw_bytes = Path(path).read_bytes()
-        content_type = _guess_content_type(Path(path))
-        loaded.append(
-            Artifact.from_bytes(
-                uri=str(path),
-                content_type=content_type,
-                artifact_type=artifact_type,
-                raw_bytes=raw_bytes,
+def _validate_routed(
+    artifact: Artifact,
+    profile: CompiledProfile,
+    report: ConformanceReport,
+    schema_backend: str | None = None,
+    metrics: MetricsRecorder = _NO_METRICS,
+) -> None:
+    """Validates a payload against a multi-schema profile.
+
+    The outcome is the same as trying every schema in profile order: the
+    first schema that accepts the payload is reported, otherwise the errors
+    of the schema with the fewest errors (earliest on ties). The routing
+    index lets most schemas be skipped: excluded schemas are known to fail
+    with at least their lower bound of errors, so they only run when they
+    could still beat the best error list found so far.
+    """
+    from opendpp.validate.syntax.json_schema import validate_json_schema
+
+    schemas = profile.schemas
+
+    def _errors(index: int) -> list[dict[str, str]]:
+        schema = schemas[index]
+        with metrics.validator("json_schema", schema.uri, artifact):
+            return validate_json_schema(
+                artifact,
+                schema,
+                report,
+                record=False,
+                validator=profile.schema_validator(schema, schema_backend),
             )
-        )
-    return loaded
 
+    try:
+        route = profile.schema_router().route(artifact.parsed_json())
+    except Exception:
+        route = SchemaRoute(candidates=list(range(len(schemas))))
+
+    best: tuple[int, int] | None = None
+    best_errors: list[dict[str, str]] = []
+    for index in route.candidates:
+        errors = _errors(index)
+        if not errors:
+            report.add_finding(
+                rule_id="JS-VAL-OK",
+                severity=Severity.INFO,
+                message=f"JSON Schema validation passed for {schemas[index].uri}",
+                evidence={
+                    "artifact_hash": artifact.sha256,
+                    "schema_hash": schemas[index].sha256,
+                },
+            )
+            return
+        if best is None or (len(errors), index) < best:
+            best, best_errors = (len(errors), index), errors
 
-def run_conformance_check(
-    target: str,
-    profile_ref: str,
-    report_artifacts_dir: str = "report_artifacts",
-) -> ConformanceReport:
-    loaded_profile = resolve_artifact_paths(load_profile(profile_ref))
-    manifest = loaded_profile.manifest
-
-    report = ConformanceReport(
-        target=target,
-        profile_id=manifest.id,
-        profile_version=manifest.version,
-    )
-
-    artifacts, canonical = _ingest_target(target)
-    report.add_finding(
-        rule_id="RESOLVE-INPUT",
-        severity=Severity.INFO,
-        message=f"Resolved input to {canonical}",
-    )
-
-    # Expand AASX packages
-    expanded: list[Artifact] = []
-    for artifact in artifacts:
-        if artifact.artifact_type == ArtifactType.AASX_PACKAGE:
-            expanded.extend(extract_aasx(artifact))
-    artifacts.extend(expanded)
-
-    output_dir = Path(report_artifacts_dir)
-    for artifact in artifacts:
-        _persist_artifact(artifact, output_dir)
-        report.add_artifact(
-            uri=artifact.uri,
-            sha256=artifact.sha256,
-            content_type=artifact.content_type,
-            artifact_type=artifact.artifact_type.value,
-            size=len(artifact.raw_bytes),
-            metadata=artifact.metadata,
+    for index, bound in sorted(route.lower_bounds.items(), key=lambda i: (i[1], i[0])):
+        if best is not None and (bound, index) > best:
+            continue
+        errors = _errors(index)
+        if best is None or (len(errors), index) < best:
+            best, best_errors = (len(errors), index), errors
+
+    if best is None:
+        return
+    best_schema = schemas[best[1]]
+    for error in best_errors:
+        report.add_finding(
+            rule_id="JS-VAL-01",
+            severity=Severity.ERROR,
+            message=f"JSON Schema validation error: {error['message']}",
+            evidence={
+                "location": error.get("location", "$"),
+                "artifact_hash": artifact.sha256,
+                "schema_hash": best_schema.sha256,
+            },
         )
 
-    # AAS parse sanity checks
+
+def _stage_aas_parse(
+    artifacts: list[Artifact],
+    profile: CompiledProfile,
+    report: ConformanceReport,
+    metrics: MetricsRecorder = _NO_METRICS,
+) -> None:
+    """Sanity-checks that AAS JSON payloads parse."""
     for artifact in artifacts:
         if artifact.artifact_type == ArtifactType.AAS_PAYLOAD:
             if artifact.content_type and "json" not in artifact.content_type:
@@ -165,7 +221,8 @@ def run_conformance_check(
                 )
                 continue
             try:
-                parse_aas_json(artifact)
+                with metrics.validator("aas_parse", "aas-core3", artifact):
+                    parse_aas_json(artifact)
                 report.add_finding(
                     rule_id="AAS-JSON-01",
                     severity=Severity.INFO,
@@ -180,73 +237,78 @@ def run_conformance_check(
                     evidence={"artifact_hash": artifact.sha256},
                 )
 
-    # JSON Schema validation
-    schema_artifacts = _load_artifacts_from_paths(
-        manifest.artifacts.schemas, ArtifactType.JSON_SCHEMA
-    )
+
+def _stage_json_schema(
+    artifacts: list[Artifact],
+    profile: CompiledProfile,
+    report: ConformanceReport,
+    schema_backend: str | None = None,
+    metrics: MetricsRecorder = _NO_METRICS,
+) -> None:
+    """Validates DPP payloads against the profile's JSON Schemas."""
+    schema_artifacts = profile.schemas
     for artifact in artifacts:
         if artifact.artifact_type != ArtifactType.DPP_PAYLOAD:
             continue
         if not schema_artifacts:
             continue
         if len(schema_artifacts) == 1:
-            validate_json_schema(artifact, schema_artifacts[0], report)
+            from opendpp.validate.syntax.json_schema import validate_json_schema
+
+            schema = schema_artifacts[0]
+            with metrics.validator("json_schema", schema.uri, artifact):
+                validate_json_schema(
+                    artifact,
+                    schema,
+                    report,
+                    validator=profile.schema_validator(schema, schema_backend),
+                )
             continue
 
-        best_errors: list[dict[str, str]] | None = None
-        best_schema: Artifact | None = None
-        matched = False
-        for schema in schema_artifacts:
-            errors = validate_json_schema(artifact, schema, report, record=False)
-            if not errors:
-                matched = True
-                report.add_finding(
-                    rule_id="JS-VAL-OK",
-                    severity=Severity.INFO,
-                    message=f"JSON Schema validation passed for {schema.uri}",
-                    evidence={
-                        "artifact_hash": artifact.sha256,
-                        "schema_hash": schema.sha256,
-                    },
-                )
-                break
-            if best_errors is None or len(errors) < len(best_errors):
-                best_errors = errors
-                best_schema = schema
+        _validate_routed(artifact, profile, report, schema_backend, metrics)
 
-        if not matched and best_schema is not None:
-            for error in best_errors or []:
-                report.add_finding(
-                    rule_id="JS-VAL-01",
-                    severity=Severity.ERROR,
-                    message=f"JSON Schema validation error: {error['message']}",
-                    evidence={
-                        "location": error.get("location", "$"),
-                        "artifact_hash": artifact.sha256,
-                        "schema_hash": best_schema.sha256,
-                    },
-                )
 
-    # OpenAPI validation (optional)
-    openapi_artifacts = _load_artifacts_from_paths(
-        manifest.artifacts.openapi, ArtifactType.OPENAPI_DOC
-    )
-    for spec in openapi_artifacts:
+def _stage_openapi(
+    artifacts: list[Artifact],
+    profile: CompiledProfile,
+    report: ConformanceReport,
+    metrics: MetricsRecorder = _NO_METRICS,
+) -> None:
+    """Validates payloads against the profile's OpenAPI contracts, if any."""
+    for spec in profile.openapi:
         for artifact in artifacts:
             if artifact.artifact_type == ArtifactType.DPP_PAYLOAD:
-                validate_openapi_contract(artifact, spec, report)
-
-    # SHACL validation
-    shape_artifacts = _load_artifacts_from_paths(
-        manifest.artifacts.shapes, ArtifactType.SHACL_SHAPES
-    )
-    for shape in shape_artifacts:
+                with metrics.validator("openapi", spec.uri, artifact):
+                    validate_openapi_contract(artifact, spec, report)
+
+
+def _stage_shacl(
+    artifacts: list[Artifact],
+    profile: CompiledProfile,
+    report: ConformanceReport,
+    store: ArtifactStore,
+    offline: bool | None = None,
+    metrics: MetricsRecorder = _NO_METRICS,
+    shapes: Sequence[Artifact] | None = None,
+) -> None:
+    """Validates JSON-LD and AAS-derived RDF against the SHACL shapes.
+
+    ``shapes`` restricts the run to some of the profile's shapes files.
+    """
+    from opendpp.validate.semantic.shacl import validate_shacl
+
+    for shape in profile.shapes if shapes is None else shapes:
+        compiled_shapes = profile.compiled_shapes(shape)
+        document_loader = profile.document_loader(offline)
         for artifact in artifacts:
             if artifact.artifact_type == ArtifactType.DPP_PAYLOAD:
-                if artifact.content_type and "ld+json" in artifact.content_type:
-                    validate_shacl(artifact, shape, report)
-                elif b'"@context"' in artifact.raw_bytes:
-                    validate_shacl(artifact, shape, report)
+                if (
+                    artifact.content_type and "ld+json" in artifact.content_type
+                ) or artifact.contains(b'"@context"'):
+                    with metrics.validator("shacl", shape.uri, artifact):
+                        validate_shacl(
+                            artifact, shape, report, compiled_shapes, document_loader
+                        )
                 else:
                     report.add_finding(
                         rule_id="SHACL-SKIP",
@@ -264,20 +326,12 @@ def run_conformance_check(
                     )
                     continue
                 try:
-                    graph = aas_to_rdf(artifact)
-                    rdf_bytes = graph.serialize(format="turtle")
-                    rdf_raw = (
-                        rdf_bytes
-                        if isinstance(rdf_bytes, bytes)
-                        else rdf_bytes.encode("utf-8")
-                    )
-                    rdf_artifact = Artifact.from_bytes(
-                        uri=f"{artifact.uri}#rdf",
-                        content_type="text/turtle",
-                        artifact_type=ArtifactType.RDF_GRAPH,
-                        raw_bytes=rdf_raw,
-                    )
-                    _persist_artifact(rdf_artifact, output_dir)
+                    # The graph and its N-Triples evidence copy are built
+                    # once per artifact and reused for every shapes file.
+                    with metrics.validator("shacl", "aas-to-rdf", artifact):
+                        graph = artifact.rdf_graph()
+                        rdf_artifact = artifact.rdf_evidence()
+                    store.put(rdf_artifact)
                     report.add_artifact(
                         uri=rdf_artifact.uri,
                         sha256=rdf_artifact.sha256,
@@ -286,7 +340,14 @@ def run_conformance_check(
                         size=len(rdf_artifact.raw_bytes),
                         metadata=rdf_artifact.metadata,
                     )
-                    validate_shacl(rdf_artifact, shape, report)
+                    with metrics.validator("shacl", shape.uri, artifact):
+                        validate_shacl(
+                            rdf_artifact,
+                            shape,
+                            report,
+                            compiled_shapes,
+                            data_graph=graph,
+                        )
                 except Exception as exc:
                     report.add_finding(
                         rule_id="AAS-RDF-ERR",
@@ -295,10 +356,369 @@ def run_conformance_check(
                         evidence={"artifact_hash": artifact.sha256},
                     )
 
-    # Policy checks
-    for rules_path in manifest.artifacts.rules:
-        engine = PolicyEngine(rules_path)
-        engine.run_checks(artifacts, report)
+
+def _stage_policy(
+    artifacts: list[Artifact],
+    profile: CompiledProfile,
+    report: ConformanceReport,
+    metrics: MetricsRecorder = _NO_METRICS,
+) -> None:
+    """Runs the profile's policy rules."""
+    for rules, engine in zip(profile.rules, profile.policy_engines()):
+        with metrics.validator("policy", rules.uri):
+            engine.run_checks(artifacts, report)
+
+
+def _verifies_vc_jwt(profile: CompiledProfile) -> bool:
+    return "vc+jwt" in profile.manifest.trust.vc_formats
+
+
+def _stage_trust(
+    artifacts: list[Artifact],
+    profile: CompiledProfile,
+    report: ConformanceReport,
+    offline: bool | None = None,
+    did_resolver: DidResolver | None = None,
+    metrics: MetricsRecorder = _NO_METRICS,
+) -> None:
+    """Verifies VC-JWT credentials, resolving each issuer once.
+
+    Only runs for profiles listing ``vc+jwt`` under ``trust.vc_formats``.
+    Offline, issuers are never fetched (see ``verify_vc_jwt``).
+    """
+    if not _verifies_vc_jwt(profile):
+        return
+    credentials = [a for a in artifacts if a.artifact_type == ArtifactType.VC_JWT]
+    if credentials:
+        from opendpp.trust.jwt_vc import verify_vc_jwts
+
+        if offline is None:
+            offline = profile.manifest.jsonld.offline
+        with metrics.validator("trust", "vc-jwt"):
+            verify_vc_jwts(
+                credentials,
+                report,
+                resolver=did_resolver,
+                allowed_issuers=profile.manifest.trust.allowed_issuers,
+                offline=offline,
+            )
+
+
+def _stage_tasks(
+    artifacts: list[Artifact],
+    profile: CompiledProfile,
+    store: ArtifactStore,
+    schema_backend: str | None,
+    offline: bool | None,
+    did_resolver: DidResolver | None = None,
+) -> list[tuple[str, list[StageTask]]]:
+    """Splits the validation stages into independent tasks, in stage order.
+
+    Running a stage's tasks one after another is the same as running the
+    stage over all artifacts, so the scheduler may run them concurrently.
+    """
+    payloads = [a for a in artifacts if a.artifact_type == ArtifactType.DPP_PAYLOAD]
+    aas = [a for a in artifacts if a.artifact_type == ArtifactType.AAS_PAYLOAD]
+    graphs = [
+        a
+        for a in artifacts
+        if a.artifact_type in {ArtifactType.DPP_PAYLOAD, ArtifactType.AAS_PAYLOAD}
+    ]
+
+    def _aas_parse(artifact: Artifact) -> StageTask:
+        return lambda r, m: _stage_aas_parse([artifact], profile, r, m)
+
+    def _json_schema(artifact: Artifact) -> StageTask:
+        return lambda r, m: _stage_json_schema(
+            [artifact], profile, r, schema_backend, m
+        )
+
+    def _shacl(shape: Artifact, artifact: Artifact) -> StageTask:
+        return lambda r, m: _stage_shacl(
+            [artifact], profile, r, store, offline, m, shapes=[shape]
+        )
+
+    def _trust(report: ConformanceReport, metrics: MetricsRecorder) -> None:
+        _stage_trust(artifacts, profile, report, offline, did_resolver, metrics)
+
+    return [
+        ("aas_parse", [_aas_parse(a) for a in aas]),
+        ("json_schema", [_json_schema(a) for a in payloads]),
+        ("openapi", [lambda r, m: _stage_openapi(artifacts, profile, r, m)]),
+        ("shacl", [_shacl(s, a) for s in profile.shapes for a in graphs]),
+        ("policy", [lambda r, m: _stage_policy(artifacts, profile, r, m)]),
+        ("trust", [_trust]),
+    ]
+
+
+# Stages whose results are cached per stage fingerprint. Trust depends on
+# more than the input bytes and the profile (DID documents, key rotation),
+# so it always runs.
+_CACHED_STAGES = ("aas_parse", "json_schema", "openapi", "shacl", "policy")
+
+
+def _is_error(finding: Finding) -> bool:
+    # ``*-ERR`` findings report a validator that could not run (a context
+    # that failed to download, say); such stages are retried next time.
+    return finding.rule_id.endswith("-ERR")
+
+
+def _replay_stage(
+    report: ConformanceReport,
+    cached: dict[str, Any],
+    artifacts: list[Artifact],
+    store: ArtifactStore,
+) -> None:
+    """Replays a cached stage into the report.
+
+    Replayed artifact records point into ``store``. RDF evidence missing
+    from it is rebuilt from its AAS payload and stored, so that the report's
+    hashes resolve like those of a fresh run.
+    """
+    for finding in cached["findings"]:
+        report.record(Finding.model_validate(finding))
+    sources = {
+        f"{a.uri}#rdf": a
+        for a in artifacts
+        if a.artifact_type == ArtifactType.AAS_PAYLOAD
+    }
+    for data in cached["artifacts"]:
+        record = ArtifactRecord.model_validate(data)
+        entry = store.entry(record.sha256)
+        if entry is None and record.uri in sources:
+            store.put(sources[record.uri].rdf_evidence())
+            entry = store.entry(record.sha256)
+        if entry is not None:
+            record.metadata["stored_path"] = str(store.root / entry.path)
+        else:
+            record.metadata.pop("stored_path", None)
+        report.artifacts.append(record)
+
+
+def run_conformance_check(
+    target: str,
+    profile_ref: str | CompiledProfile,
+    report_artifacts_dir: str = "report_artifacts",
+    schema_backend: str | None = None,
+    offline: bool | None = None,
+    result_cache: ResultCache | None = None,
+    artifacts: list[Artifact] | None = None,
+    collect_metrics: bool = False,
+    trace_memory: bool = False,
+    findings_sinks: Sequence[FindingSink] = (),
+    max_findings_per_rule: int | None = None,
+    stage_workers: int = 1,
+    stage_executor: str = "thread",
+    artifact_store: ArtifactStore | None = None,
+    http_cache: bool = False,
+    did_resolver: DidResolver | None = None,
+) -> ConformanceReport:
+    """Runs every profile stage against a target and returns the report.
+
+    ``profile_ref`` is either a profile reference understood by
+    ``load_profile`` or an already compiled profile. Profile references are
+    resolved through the process-wide cache, so repeated checks only pay for
+    loading and compiling the profile once. ``schema_backend`` overrides the
+    profile's JSON Schema backend (``jsonschema`` or ``codegen``);
+    ``offline`` overrides the profile's ``jsonld.offline`` setting.
+
+    VC-JWTs, including those embedded in payloads, are only verified for
+    profiles listing ``vc+jwt`` under ``trust.vc_formats``. Issuer DIDs are
+    resolved with ``did_resolver`` (default: the process-wide one), and
+    never fetched offline.
+
+    With a ``result_cache``, each stage's findings are cached against the
+    input bytes and the profile files and settings that stage reads. Stages
+    whose inputs are unchanged are replayed from the cache; only the others
+    run, so changing one rules file only re-runs the policy stage.
+    Pre-ingested ``artifacts`` (see ``payload_artifact``)
+    are checked as they are, with ``target`` only labelling the report.
+
+    ``collect_metrics`` records stage and validator timings in
+    ``report.metrics``; ``trace_memory`` additionally records peak memory
+    per stage with ``tracemalloc``.
+
+    Every finding is passed to ``findings_sinks`` as it is produced (see
+    ``opendpp.core.findings``); ``max_findings_per_rule`` caps the findings
+    kept in the report itself. Reports truncated by the cap are not stored
+    in the result cache.
+
+    With ``stage_workers > 1`` the validation stages, and their artifact x
+    validator pairs, run concurrently on a ``stage_executor`` (``thread`` or
+    ``process``) pool (see ``opendpp.core.scheduler``). Findings are merged
+    in serial order, so the report is the same as that of a serial run.
+
+    Artifacts go to ``artifact_store``, by default the shared store for
+    ``report_artifacts_dir`` (see ``opendpp.core.store``). They are written
+    in the background, so a ``stored_path`` in the report may only appear
+    once the store is flushed.
+
+    With ``http_cache``, fetched targets are kept in the on-disk HTTP
+    response cache and revalidated on later checks (see
+    ``opendpp.fetch.http``).
+    """
+    store = artifact_store or open_artifact_store(report_artifacts_dir)
+    recorder = MetricsRecorder(collect_metrics, trace_memory)
+    recorder.start()
+    try:
+        report = _run_check(
+            target,
+            profile_ref,
+            store,
+            schema_backend,
+            offline,
+            result_cache,
+            artifacts,
+            recorder,
+            findings_sinks,
+            max_findings_per_rule,
+            stage_workers,
+            stage_executor,
+            http_cache,
+            did_resolver,
+        )
+    finally:
+        run_metrics = recorder.finish()
+    report.metrics = run_metrics
+    return report
+
+
+def _run_check(
+    target: str,
+    profile_ref: str | CompiledProfile,
+    store: ArtifactStore,
+    schema_backend: str | None,
+    offline: bool | None,
+    result_cache: ResultCache | None,
+    artifacts: list[Artifact] | None,
+    metrics: MetricsRecorder,
+    findings_sinks: Sequence[FindingSink] = (),
+    max_findings_per_rule: int | None = None,
+    stage_workers: int = 1,
+    stage_executor: str = "thread",
+    http_cache: bool = False,
+    did_resolver: DidResolver | None = None,
+) -> ConformanceReport:
+    with metrics.stage("profile"):
+        profile = (
+            profile_ref
+            if isinstance(profile_ref, CompiledProfile)
+            else get_compiled_profile(profile_ref)
+        )
+    manifest = profile.manifest
+
+    report = ConformanceReport(
+        target=target,
+        profile_id=manifest.id,
+        profile_version=manifest.version,
+    )
+    report.configure_findings(findings_sinks, max_findings_per_rule)
+
+    with metrics.stage("ingest"):
+        if artifacts is None:
+            artifacts, canonical = _ingest_target(target, http_cache)
+        else:
+            artifacts, canonical = list(artifacts), target
+    report.add_finding(
+        rule_id="RESOLVE-INPUT",
+        severity=Severity.INFO,
+        message=f"Resolved input to {canonical}",
+    )
+
+    keys: dict[str, str] = {}
+    cached: dict[str, dict[str, Any]] = {}
+    if result_cache is not None:
+        with metrics.stage("result_cache"):
+            for name in _CACHED_STAGES:
+                fingerprint = profile.stage_fingerprint(name, offline, schema_backend)
+                keys[name] = result_key(artifacts, name, fingerprint)
+                hit = result_cache.get(keys[name])
+                if hit is not None:
+                    cached[name] = hit
+        state = "hit" if len(cached) == len(keys) else "partial" if cached else "miss"
+        for artifact in artifacts:
+            artifact.metadata["result_cache"] = state
+
+    with metrics.stage("expand"):
+        # Expand AASX packages
+        expanded: list[Artifact] = []
+        for artifact in artifacts:
+            if artifact.artifact_type == ArtifactType.AASX_PACKAGE:
+                try:
+                    expanded.extend(extract_aasx(artifact))
+                except (ValueError, zipfile.BadZipFile) as exc:
+                    report.add_finding(
+                        rule_id="AASX-ERR",
+                        severity=Severity.ERROR,
+                        message=f"AASX extraction failed: {str(exc)}",
+                        evidence={"artifact_hash": artifact.sha256},
+                    )
+        artifacts.extend(expanded)
+        # Embedded credentials are only worth finding if they get verified.
+        if _verifies_vc_jwt(profile):
+            for artifact in list(artifacts):
+                if artifact.artifact_type in {
+                    ArtifactType.DPP_PAYLOAD,
+                    ArtifactType.AAS_PAYLOAD,
+                } and "json" in (artifact.content_type or "json"):
+                    artifacts.extend(embedded_credentials(artifact))
+
+    with metrics.stage("persist"):
+        for artifact in artifacts:
+            store.put(artifact)
+            report.add_artifact(
+                uri=artifact.uri,
+                sha256=artifact.sha256,
+                content_type=artifact.content_type,
+                artifact_type=artifact.artifact_type.value,
+                size=len(artifact.raw_bytes),
+                metadata=artifact.metadata,
+            )
+
+    stages = _stage_tasks(
+        artifacts, profile, store, schema_backend, offline, did_resolver
+    )
+
+    def _run_serially(name: str, tasks: list[StageTask]) -> None:
+        with metrics.stage(name):
+            for task in tasks:
+                task(report, metrics)
+
+    pending = [(name, tasks) for name, tasks in stages if name not in cached]
+    outcomes = None
+    if stage_workers > 1:
+        if stage_executor == "process":
+            # Writer threads must not be running when the workers are forked.
+            store.close()
+            close_artifact_stores()
+        outcomes = iter(
+            run_stages_concurrently(
+                pending, stage_workers, stage_executor, metrics.enabled
+            )
+        )
+    results: dict[str, Any] = {}
+    for name, tasks in stages:
+        if name in cached:
+            with metrics.stage(name, cached=True):
+                _replay_stage(report, cached[name], artifacts, store)
+            continue
+        findings_start, artifacts_start = len(report.findings), len(report.artifacts)
+        if outcomes is not None:
+            next(outcomes).merge_into(report, metrics)
+        else:
+            _run_serially(name, tasks)
+        stage_findings = report.findings[findings_start:]
+        if name not in keys or any(_is_error(f) for f in stage_findings):
+            continue
+        results[name] = {
+            "findings": [f.model_dump(mode="json") for f in stage_findings],
+            "artifacts": [
+                a.model_dump(mode="json") for a in report.artifacts[artifacts_start:]
+            ],
+        }
+    if result_cache is not None and not report.findings_truncated:
+        for name, result in results.items():
+            result_cache.put(keys[name], profile.id, profile.version, result)
 
     report.finalize()
     return report
@@ -0,0 +1,104 @@
+"""Findings sinks for reports too large to keep in memory.
+
+A sink receives every finding as it is recorded (see
+``ConformanceReport.configure_findings``) and is closed when the report is
+finalized, at which point it may add a summary to the report.
+"""
+
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from os import PathLike
+from pathlib import Path
+from typing import IO, Optional, Self, Union
+
+from opendpp.core.report import (
+    SEVERITY_RANK,
+    ConformanceReport,
+    Finding,
+    FindingGroup,
+)
+
+_INDEX = re.compile(r"\[\d+\]")
+_DOTTED_INDEX = re.compile(r"(^|\.)\d+(?=\.|$)")
+
+
+def normalize_location(location: str) -> str:
+    """Replaces array indices in a location with ``*``.
+
+    ``$.cells[12].mass`` and ``cells.12.mass`` become ``$.cells[*].mass``
+    and ``cells.*.mass``, so errors repeated for every array item share a
+    pattern.
+    """
+    return _DOTTED_INDEX.sub(r"\1*", _INDEX.sub("[*]", location))
+
+
+class FindingSink(ABC):
+    """Receives findings as they are recorded."""
+
+    @abstractmethod
+    def add(self, finding: Finding) -> None:
+        """Called for every recorded finding."""
+
+    def close(self, report: ConformanceReport) -> None:
+        """Called once when ``report`` is finalized."""
+
+
+class NdjsonFindingSink(FindingSink):
+    """Streams findings to a file, one JSON object per line."""
+
+    def __init__(self, path: Union[str, PathLike[str]]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        self._file: IO[str] = self.path.open("w", encoding="utf-8")
+
+    def add(self, finding: Finding) -> None:
+        self._file.write(finding.model_dump_json())
+        self._file.write("\n")
+        self.count += 1
+
+    def close(self, report: Optional[ConformanceReport] = None) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class FindingAggregator(FindingSink):
+    """Groups findings by rule id and normalized evidence location.
+
+    Each group keeps a count, its most severe severity and the first
+    ``exemplars`` findings; groups are stored in ``report.finding_groups``
+    in first-seen order when the report is finalized.
+    """
+
+    def __init__(self, exemplars: int = 3) -> None:
+        self.exemplars = exemplars
+        self._groups: dict[tuple[str, Optional[str]], FindingGroup] = {}
+
+    def add(self, finding: Finding) -> None:
+        location = (finding.evidence or {}).get("location")
+        pattern = normalize_location(location) if isinstance(location, str) else None
+        group = self._groups.get((finding.rule_id, pattern))
+        if group is None:
+            group = FindingGroup(
+                rule_id=finding.rule_id, severity=finding.severity, location=pattern
+            )
+            self._groups[(finding.rule_id, pattern)] = group
+        group.count += 1
+        if SEVERITY_RANK[finding.severity] > SEVERITY_RANK[group.severity]:
+            group.severity = finding.severity
+        if len(group.exemplars) < self.exemplars:
+            group.exemplars.append(finding)
+
+    def groups(self) -> list[FindingGroup]:
+        return list(self._groups.values())
+
+    def close(self, report: ConformanceReport) -> None:
+        report.finding_groups = self.groups()
@@ -0,0 +1,119 @@
+"""Timing and memory instrumentation for conformance runs."""
+
+from __future__ import annotations
+
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterable, Iterator, Optional
+
+from opendpp.core.artifact import Artifact
+from opendpp.core.report import RunMetrics, StageMetrics, ValidatorMetrics
+
+
+class MetricsRecorder:
+    """Collects per-stage and per artifact x validator timings of one run.
+
+    A disabled recorder costs one attribute check per measurement, so the
+    engine can instrument unconditionally. With ``trace_memory`` the run is
+    traced with ``tracemalloc`` (unless tracing is already active) and each
+    stage records its peak traced allocation.
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = False) -> None:
+        self.enabled = enabled or trace_memory
+        self.trace_memory = trace_memory
+        self.metrics = RunMetrics()
+        self._lock = threading.Lock()
+        self._started_tracing = False
+        self._start = 0.0
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start = time.perf_counter()
+
+    def finish(self) -> Optional[RunMetrics]:
+        """Stops tracing and returns the metrics, or ``None`` when disabled."""
+        if not self.enabled:
+            return None
+        self.metrics.total_ms = (time.perf_counter() - self._start) * 1000
+        if self.trace_memory:
+            peaks = [s.peak_memory_bytes or 0 for s in self.metrics.stages]
+            self.metrics.peak_memory_bytes = max(peaks, default=0)
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        return self.metrics
+
+    @contextmanager
+    def _stage(self, name: str, cached: bool) -> Iterator[None]:
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = StageMetrics(
+                name=name,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                cached=cached,
+            )
+            if tracing:
+                entry.peak_memory_bytes = max(
+                    0, tracemalloc.get_traced_memory()[1] - baseline
+                )
+            with self._lock:
+                self.metrics.stages.append(entry)
+
+    def stage(self, name: str, cached: bool = False) -> ContextManager[None]:
+        """Times a pipeline stage; ``cached`` marks stages replayed from cache."""
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name, cached)
+
+    def record_stage(self, name: str, duration_ms: float, cached: bool = False) -> None:
+        """Records a stage timed elsewhere, e.g. one run concurrently."""
+        if not self.enabled:
+            return
+        entry = StageMetrics(name=name, duration_ms=duration_ms, cached=cached)
+        with self._lock:
+            self.metrics.stages.append(entry)
+
+    def record_validators(self, entries: Iterable[ValidatorMetrics]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.metrics.validators.extend(entries)
+
+    @contextmanager
+    def _validator(
+        self, stage: str, validator: str, artifact: Optional[Artifact]
+    ) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = ValidatorMetrics(
+                stage=stage,
+                validator=validator,
+                artifact_uri=artifact.uri if artifact else None,
+                artifact_hash=artifact.sha256 if artifact else None,
+                duration_ms=(time.perf_counter() - start) * 1000,
+            )
+            with self._lock:
+                self.metrics.validators.append(entry)
+
+    def validator(
+        self, stage: str, validator: str, artifact: Optional[Artifact] = None
+    ) -> ContextManager[None]:
+        """Times one validator applied to one artifact (or to all of them)."""
+        if not self.enabled:
+            return nullcontext()
+        return self._validator(stage, validator, artifact)
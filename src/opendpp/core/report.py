@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, List, Optional
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+if TYPE_CHECKING:
+    from opendpp.core.findings import FindingSink
 
 
 class Severity(str, Enum):
@@ -20,6 +23,17 @@ class Finding(BaseModel):
     evidence: dict[str, Any] | None = None
 
 
+SEVERITY_RANK = {Severity.INFO: 0, Severity.WARNING: 1, Severity.ERROR: 2}
+
+
+class FindingGroup(BaseModel):
+    rule_id: str
+    severity: Severity
+    location: Optional[str] = None
+    count: int = 0
+    exemplars: List[Finding] = Field(default_factory=list)
+
+
 class ArtifactRecord(BaseModel):
     uri: str
     sha256: str
@@ -29,6 +43,28 @@ class ArtifactRecord(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
+class StageMetrics(BaseModel):
+    name: str
+    duration_ms: float
+    peak_memory_bytes: Optional[int] = None
+    cached: bool = False
+
+
+class ValidatorMetrics(BaseModel):
+    stage: str
+    validator: str
+    artifact_uri: Optional[str] = None
+    artifact_hash: Optional[str] = None
+    duration_ms: float
+
+
+class RunMetrics(BaseModel):
+    total_ms: float = 0.0
+    peak_memory_bytes: Optional[int] = None
+    stages: List[StageMetrics] = Field(default_factory=list)
+    validators: List[ValidatorMetrics] = Field(default_factory=list)
+
+
 class ConformanceReport(BaseModel):
     target: str
     profile_id: str
@@ -37,6 +73,35 @@ class ConformanceReport(BaseModel):
     artifacts: List[ArtifactRecord] = Field(default_factory=list)
     findings: List[Finding] = Field(default_factory=list)
     passed: bool | None = None
+    metrics: Optional[RunMetrics] = None
+    finding_groups: Optional[List[FindingGroup]] = None
+
+    _sinks: list[FindingSink] = PrivateAttr(default_factory=list)
+    _max_per_rule: Optional[int] = PrivateAttr(default=None)
+    _kept: dict[str, int] = PrivateAttr(default_factory=dict)
+    # rule_id -> [omitted count, worst omitted severity]
+    _omitted: dict[str, list[Any]] = PrivateAttr(default_factory=dict)
+    _errors: int = PrivateAttr(default=0)
+    _truncated: bool = PrivateAttr(default=False)
+
+    def configure_findings(
+        self,
+        sinks: Iterable[FindingSink] = (),
+        max_per_rule: Optional[int] = None,
+    ) -> None:
+        """Streams findings to ``sinks`` and caps those kept per rule.
+
+        Sinks see every finding as it is recorded. At most ``max_per_rule``
+        findings per rule id are kept in ``findings``; the rest are counted
+        and summarised by one truncation finding per rule on ``finalize``.
+        """
+        self._sinks = list(sinks)
+        self._max_per_rule = max_per_rule
+
+    @property
+    def findings_truncated(self) -> bool:
+        """Whether some findings were left out of ``findings`` by the cap."""
+        return self._truncated
 
     def add_finding(
         self,
@@ -45,12 +110,31 @@ class ConformanceReport(BaseModel):
         message: str,
         evidence: dict[str, Any] | None = None,
     ) -> None:
-        self.findings.append(
+        self.record(
             Finding(
                 rule_id=rule_id, severity=severity, message=message, evidence=evidence
             )
         )
 
+    def record(self, finding: Finding) -> None:
+        if finding.severity == Severity.ERROR:
+            self._errors += 1
+        for sink in self._sinks:
+            sink.add(finding)
+        if self._max_per_rule is not None:
+            kept = self._kept.get(finding.rule_id, 0)
+            if kept >= self._max_per_rule:
+                omitted = self._omitted.setdefault(
+                    finding.rule_id, [0, finding.severity]
+                )
+                omitted[0] += 1
+                self._truncated = True
+                if SEVERITY_RANK[finding.severity] > SEVERITY_RANK[omitted[1]]:
+                    omitted[1] = finding.severity
+                return
+            self._kept[finding.rule_id] = kept + 1
+        self.findings.append(finding)
+
     def add_artifact(
         self,
         *,
@@ -73,4 +157,24 @@ class ConformanceReport(BaseModel):
         )
 
     def finalize(self) -> None:
-        self.passed = all(f.severity != Severity.ERROR for f in self.findings)
+        limit, omitted = self._max_per_rule, self._omitted
+        self._kept, self._omitted, self._max_per_rule = {}, {}, None
+        for rule_id, (count, severity) in omitted.items():
+            self.findings.append(
+                Finding(
+                    rule_id=rule_id,
+                    severity=severity,
+                    message=(
+                        f"{count} further {rule_id} findings omitted "
+                        f"(limit {limit} per rule)"
+                    ),
+                    evidence={"truncated": count, "limit": limit},
+                )
+            )
+        sinks, self._sinks = self._sinks, []
+        for sink in sinks:
+            sink.close(self)
+        # Findings dropped by the cap still count towards the outcome.
+        self.passed = self._errors == 0 and all(
+            f.severity != Severity.ERROR for f in self.findings
+        )
@@ -0,0 +1,173 @@
+"""SQLite cache of per-stage validation results.
+
+Each stage's results are keyed by the bytes being validated and by the
+profile settings and files that stage reads (see
+``CompiledProfile.stage_fingerprint``). Re-checking a payload after a
+profile change only runs the stages whose inputs changed; the others are
+replayed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable
+
+from opendpp.core.artifact import Artifact
+from opendpp.core.cache import cache_root
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Distributions whose behaviour shapes the cached findings.
+VALIDATOR_DISTRIBUTIONS = ("jsonschema", "pyshacl", "rdflib", "PyLD", "aas-core3.0")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    profile_id TEXT NOT NULL,
+    profile_version TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+@lru_cache(maxsize=1)
+def code_versions() -> dict[str, str | None]:
+    """Returns the versions of opendpp and of the validator libraries."""
+    from importlib import metadata
+
+    from opendpp import __version__
+
+    versions: dict[str, str | None] = {"opendpp": __version__}
+    for name in VALIDATOR_DISTRIBUTIONS:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def result_key(
+    artifacts: Iterable[Artifact], stage: str, stage_fingerprint: str
+) -> str:
+    """Derives the cache key for running ``stage`` over ``artifacts``.
+
+    ``stage_fingerprint`` covers the profile inputs of that stage only, so
+    the key does not change when other parts of the profile do. The key
+    also covers ``code_versions()``, so upgrades never replay findings
+    produced by older validators.
+    """
+    digest = hashlib.sha256()
+    parts: list[Any] = [stage, stage_fingerprint, code_versions()]
+    parts.extend((a.sha256, a.content_type, a.artifact_type.value) for a in artifacts)
+    digest.update(json.dumps(parts, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded, least-recently-used store of per-stage results.
+
+    Safe to share between threads; separate processes may open the same
+    database file concurrently.
+    """
+
+    def __init__(
+        self, path: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.path = path or cache_root() / "results.sqlite3"
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+        result: dict[str, Any] = json.loads(row[0])
+        return result
+
+    def put(
+        self,
+        key: str,
+        profile_id: str,
+        profile_version: str,
+        result: dict[str, Any],
+    ) -> None:
+        payload = json.dumps(result).encode("utf-8")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (key, profile_id, profile_version, payload, len(payload), time.time()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        stale: list[str] = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM results ORDER BY last_used"
+        ):
+            stale.append(key)
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany(
+            "DELETE FROM results WHERE key = ?", [(k,) for k in stale]
+        )
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+
+_DEFAULT_CACHE: tuple[int, ResultCache] | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_result_cache() -> ResultCache:
+    """Returns the process-wide result cache in the opendpp cache directory.
+
+    SQLite connections must not cross ``fork``, so forked workers open their
+    own connection.
+    """
+    global _DEFAULT_CACHE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CACHE is None or _DEFAULT_CACHE[0] != os.getpid():
+            _DEFAULT_CACHE = (os.getpid(), ResultCache())
+        return _DEFAULT_CACHE[1]
@@ -0,0 +1,137 @@
+"""Concurrent execution of the validation stages of one check.
+
+The engine splits every stage into tasks whose serial, in-order execution
+is the stage itself (one task per artifact, or per shapes file and
+artifact). Each task writes to its own buffer report, so tasks can run in
+any order on a pool; merging the buffers in task order reproduces the
+report of a serial run finding for finding.
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Sequence
+
+from opendpp.core.metrics import MetricsRecorder
+from opendpp.core.report import (
+    ArtifactRecord,
+    ConformanceReport,
+    Finding,
+    ValidatorMetrics,
+)
+
+StageTask = Callable[[ConformanceReport, MetricsRecorder], None]
+EXECUTORS = ("thread", "process")
+
+
+@dataclass
+class TaskOutcome:
+    findings: list[Finding]
+    artifacts: list[ArtifactRecord]
+    validators: list[ValidatorMetrics]
+    started: float
+    finished: float
+
+
+@dataclass
+class StageOutcome:
+    name: str
+    tasks: list[TaskOutcome] = field(default_factory=list)
+
+    def merge_into(self, report: ConformanceReport, metrics: MetricsRecorder) -> None:
+        """Adds the stage's findings and artifacts to ``report`` in task order.
+
+        The stage is timed from its first task start to its last task end;
+        peak memory is not attributed to stages that ran concurrently.
+        """
+        for task in self.tasks:
+            for finding in task.findings:
+                report.record(finding)
+            report.artifacts.extend(task.artifacts)
+        duration = 0.0
+        if self.tasks:
+            duration = max(t.finished for t in self.tasks) - min(
+                t.started for t in self.tasks
+            )
+        metrics.record_stage(self.name, duration * 1000)
+        metrics.record_validators(v for t in self.tasks for v in t.validators)
+
+
+def _run_task(task: StageTask, collect_metrics: bool) -> TaskOutcome:
+    buffer = ConformanceReport(target="", profile_id="", profile_version="")
+    recorder = MetricsRecorder(collect_metrics)
+    started = time.perf_counter()
+    task(buffer, recorder)
+    return TaskOutcome(
+        findings=buffer.findings,
+        artifacts=buffer.artifacts,
+        validators=recorder.metrics.validators,
+        started=started,
+        finished=time.perf_counter(),
+    )
+
+
+# Tasks handed to forked workers, which inherit them instead of unpickling.
+_FORKED_TASKS: dict[int, tuple[list[StageTask], bool]] = {}
+_TOKENS = itertools.count()
+
+
+def _run_forked(token: int, index: int) -> TaskOutcome:
+    tasks, collect_metrics = _FORKED_TASKS[token]
+    return _run_task(tasks[index], collect_metrics)
+
+
+def run_stages_concurrently(
+    stages: Sequence[tuple[str, Sequence[StageTask]]],
+    workers: int,
+    executor: str = "thread",
+    collect_metrics: bool = False,
+) -> list[StageOutcome]:
+    """Runs the tasks of every stage on a pool; returns outcomes in order.
+
+    ``executor`` is ``thread`` or ``process``. Worker processes are forked
+    so they inherit the artifacts and the warm profile; only findings and
+    artifact records travel back. The process executor therefore needs the
+    ``fork`` start method (not available on Windows), and it refuses to
+    fork while other threads are running: a child would inherit any lock
+    they hold, held forever. Callers stop their own threads first, as the
+    engine does with the artifact store writers. The first failing task,
+    in serial order, re-raises its exception.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown stage executor: {executor}")
+    if executor == "process" and threading.active_count() > 1:
+        running = ", ".join(
+            t.name for t in threading.enumerate() if t is not threading.current_thread()
+        )
+        raise ValueError(
+            f"The process stage executor cannot fork while threads are running: "
+            f"{running}"
+        )
+    flat = [(name, task) for name, tasks in stages for task in tasks]
+    pool: Executor
+    futures: list[Future[TaskOutcome]]
+    token = next(_TOKENS)
+    if executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stage")
+        futures = [pool.submit(_run_task, task, collect_metrics) for _, task in flat]
+    else:
+        _FORKED_TASKS[token] = ([task for _, task in flat], collect_metrics)
+        pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork")
+        )
+        futures = [pool.submit(_run_forked, token, i) for i in range(len(flat))]
+
+    outcomes = {name: StageOutcome(name) for name, _ in stages}
+    try:
+        for (name, _), future in zip(flat, futures):
+            outcomes[name].tasks.append(future.result())
+    finally:
+        pool.shutdown(cancel_futures=True)
+        _FORKED_TASKS.pop(token, None)
+    return list(outcomes.values())
@@ -0,0 +1,303 @@
+"""Content-addressed store for the artifacts a check fetched or derived.
+
+Artifacts are written once, however often they are seen, to
+``<root>/<aa>/<bb>/<sha256><ext>`` (optionally gzip or zstd compressed).
+An append-only ``index.ndjson`` records the size, type and first-seen time
+of every stored hash. Writes go through a bounded queue to a background
+thread, so a check only waits for the disk when the queue is full.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Self
+
+from opendpp.core.artifact import Artifact
+from opendpp.core.cache import atomic_write_bytes
+from opendpp.core.codec import Buffer
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIONS = ("gzip", "zstd")
+INDEX_NAME = "index.ndjson"
+DEFAULT_QUEUE_SIZE = 256
+
+_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstd() -> Any:
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ValueError(
+            "zstd compression needs the 'zstandard' package "
+            "(pip install 'opendpp-conformance-kit[zstd]')"
+        ) from exc
+    return zstandard
+
+
+def _compress(data: Buffer, compression: str | None) -> Buffer:
+    if compression == "gzip":
+        return gzip.compress(data, mtime=0)
+    if compression == "zstd":
+        return bytes(_zstd().ZstdCompressor().compress(data))
+    return data
+
+
+def _decompress(data: bytes, compression: str | None) -> bytes:
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd":
+        return bytes(_zstd().ZstdDecompressor().decompress(data))
+    return data
+
+
+def artifact_extension(content_type: str | None) -> str:
+    """Returns the file extension for a media type (``.bin`` if unknown)."""
+    if content_type:
+        if "json" in content_type:
+            return ".json"
+        if "xml" in content_type:
+            return ".xml"
+        if "turtle" in content_type:
+            return ".ttl"
+        if "n-triples" in content_type:
+            return ".nt"
+        if "jwt" in content_type:
+            return ".jwt"
+    return ".bin"
+
+
+@dataclass(frozen=True)
+class StoreEntry:
+    """Index record of one stored artifact; ``path`` is relative to the root."""
+
+    sha256: str
+    size: int
+    content_type: str | None
+    artifact_type: str
+    first_seen: float
+    path: str
+    compression: str | None = None
+
+
+class ArtifactStore:
+    """Sharded, deduplicating artifact store with a background writer.
+
+    Safe to share between threads. Separate processes may use the same
+    root: files are written atomically and index lines are appended, the
+    first record of a hash winning. In a forked child, where the writer
+    thread does not exist, ``put`` writes synchronously.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        compression: str | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown artifact compression: {compression}")
+        if compression == "zstd":
+            _zstd()
+        self.root = Path(root)
+        self.compression = compression
+        self._lock = threading.Lock()
+        self._entries = self._load_index()
+        self._queue: queue.Queue[tuple[StoreEntry, Buffer] | None] = queue.Queue(
+            maxsize=queue_size
+        )
+        self._pid = os.getpid()
+        self._writer: threading.Thread | None = None
+        self._error: BaseException | None = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_NAME
+
+    def _load_index(self) -> dict[str, StoreEntry]:
+        entries: dict[str, StoreEntry] = {}
+        if not self.index_path.is_file():
+            return entries
+        with self.index_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = StoreEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue  # torn line left by an interrupted writer
+                entries.setdefault(entry.sha256, entry)
+        return entries
+
+    def _relative_path(self, artifact: Artifact) -> str:
+        digest = artifact.sha256
+        name = (
+            digest
+            + artifact_extension(artifact.content_type)
+            + _SUFFIXES[self.compression]
+        )
+        return f"{digest[:2]}/{digest[2:4]}/{name}"
+
+    def put(self, artifact: Artifact) -> Path:
+        """Queues an artifact for storage unless its hash is already known.
+
+        Returns the path the artifact is (or will be) stored at, which is
+        also recorded as ``stored_path`` in its metadata.
+        """
+        with self._lock:
+            entry = self._entries.get(artifact.sha256)
+            new = entry is None
+            if entry is None:
+                entry = StoreEntry(
+                    sha256=artifact.sha256,
+                    size=len(artifact.raw_bytes),
+                    content_type=artifact.content_type,
+                    artifact_type=artifact.artifact_type.value,
+                    first_seen=time.time(),
+                    path=self._relative_path(artifact),
+                    compression=self.compression,
+                )
+                self._entries[artifact.sha256] = entry
+        path = self.root / entry.path
+        artifact.metadata["stored_path"] = str(path)
+        if new:
+            if os.getpid() != self._pid:
+                self._write(entry, artifact.raw_bytes)
+            else:
+                self._start_writer()
+                self._queue.put((entry, artifact.raw_bytes))
+        return path
+
+    def _start_writer(self) -> None:
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._drain, name="artifact-store", daemon=True
+                )
+                self._writer.start()
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            entry, data = item
+            try:
+                self._write(entry, data)
+            except Exception as exc:
+                logger.error("Failed to store artifact %s: %s", entry.sha256, exc)
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _write(self, entry: StoreEntry, data: Buffer) -> None:
+        path = self.root / entry.path
+        if path.exists():
+            return
+        atomic_write_bytes(path, _compress(data, entry.compression))
+        line = json.dumps(asdict(entry), sort_keys=True) + "\n"
+        with self.index_path.open("a", encoding="utf-8") as handle:
+            handle.write(line)
+
+    def flush(self) -> None:
+        """Waits until every queued artifact is on disk.
+
+        Re-raises the last write error, if any.
+        """
+        if self._writer is not None and os.getpid() == self._pid:
+            self._queue.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Flushes pending writes and stops the writer thread."""
+        try:
+            self.flush()
+        finally:
+            writer, self._writer = self._writer, None
+            if writer is not None and os.getpid() == self._pid:
+                self._queue.put(None)
+                writer.join()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def entry(self, sha256: str) -> StoreEntry | None:
+        """Returns the index record of a hash, rereading the index if needed."""
+        with self._lock:
+            entry = self._entries.get(sha256)
+            if entry is None:
+                for digest, found in self._load_index().items():
+                    self._entries.setdefault(digest, found)
+                entry = self._entries.get(sha256)
+        return entry
+
+    def get(self, sha256: str) -> bytes | None:
+        """Returns the stored bytes of a hash, or ``None`` if it is unknown.
+
+        Raises ``ValueError`` when the stored file is missing or its
+        content no longer matches the hash.
+        """
+        entry = self.entry(sha256)
+        if entry is None:
+            return None
+        self.flush()
+        path = self.root / entry.path
+        if not path.is_file():
+            raise ValueError(f"Stored artifact {sha256} is missing: {path}")
+        try:
+            data = _decompress(path.read_bytes(), entry.compression)
+        except (OSError, EOFError, ValueError) as exc:
+            raise ValueError(f"Stored artifact {sha256} is corrupt: {path}") from exc
+        if hashlib.sha256(data).hexdigest() != sha256:
+            raise ValueError(f"Stored artifact {sha256} is corrupt: {path}")
+        return data
+
+
+_STORES: dict[tuple[int, Path, str | None], ArtifactStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def open_artifact_store(
+    root: Path | str, compression: str | None = None
+) -> ArtifactStore:
+    """Returns the process-wide store for a directory.
+
+    Stores are shared by every check in a process, so their writer thread
+    and index are set up once; they are flushed at interpreter exit.
+    Forked processes get their own store.
+    """
+    key = (os.getpid(), Path(root).resolve(), compression)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = ArtifactStore(root, compression)
+        return store
+
+
+@atexit.register
+def close_artifact_stores() -> None:
+    """Flushes every store of this process and stops their writer threads.
+
+    Called at interpreter exit, and before forking stage workers.
+    """
+    for (pid, _, _), store in list(_STORES.items()):
+        if pid == os.getpid():
+            try:
+                store.close()
+            except Exception as exc:
+                logger.error("Failed to flush artifact store %s: %s", store.root, exc)
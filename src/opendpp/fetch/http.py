@@ -1,23 +1,124 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.core.cache import atomic_write_bytes, cache_root
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    final_url: str
+    sha256: str
+    content_type: str | None
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache of HTTP response bodies.
+
+    Bodies live under ``objects/`` named by their sha256, so identical
+    passports served from several URLs are stored once; ``index/`` maps each
+    requested URL to its body and the validators needed to revalidate it.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.directory = directory or cache_root() / "http"
+
+    def _index_path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / "index" / f"{digest}.json"
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.directory / "objects" / sha256[:2] / sha256
+
+    def lookup(self, url: str) -> tuple[CachedResponse, bytes] | None:
+        """Returns the cached entry and body for ``url`` if both are intact."""
+        try:
+            entry = CachedResponse(**json.loads(self._index_path(url).read_bytes()))
+            body = self._object_path(entry.sha256).read_bytes()
+        except (OSError, TypeError, ValueError):
+            return None
+        if entry.url != url or hashlib.sha256(body).hexdigest() != entry.sha256:
+            return None
+        return entry, body
+
+    def store(self, entry: CachedResponse, body: bytes | None = None) -> None:
+        try:
+            if body is not None:
+                path = self._object_path(entry.sha256)
+                if not path.exists():
+                    atomic_write_bytes(path, body)
+            atomic_write_bytes(
+                self._index_path(entry.url), json.dumps(asdict(entry)).encode("utf-8")
+            )
+        except OSError:
+            pass
+
+
+def _cacheable(response: requests.Response) -> bool:
+    cache_control = response.headers.get("Cache-Control", "").lower()
+    return (
+        response.status_code == 200
+        and "no-store" not in cache_control
+        and bool(response.headers.get("ETag") or response.headers.get("Last-Modified"))
+    )
 
 
 class HttpFetcher:
-    def __init__(self, timeout: int = 15) -> None:
+    """Fetches passports over a pooled keep-alive session.
+
+    With a ``cache``, responses carrying ``ETag``/``Last-Modified`` are kept
+    on disk and revalidated with ``If-None-Match``/``If-Modified-Since``; an
+    unchanged resource then costs a 304 instead of a full download. The
+    outcome is recorded under ``metadata["cache"]`` of the artifact.
+    """
+
+    def __init__(
+        self,
+        timeout: int = 15,
+        cache: ResponseCache | None = None,
+        pool_size: int = 10,
+    ) -> None:
         self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
 
     def fetch(self, url: str) -> Artifact:
         headers = {
             "Accept": "application/ld+json, application/json, */*;q=0.1",
             "User-Agent": "opendpp-conformance-kit/0.1",
         }
-        response = requests.get(
+        cached = self.cache.lookup(url) if self.cache else None
+        if cached:
+            entry, _ = cached
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = self.session.get(
             url, headers=headers, timeout=self.timeout, allow_redirects=True
         )
+        if cached and response.status_code == 304:
+            return self._revalidated(response, *cached)
         response.raise_for_status()
 
         content_type = response.headers.get("Content-Type")
@@ -28,7 +129,7 @@ class HttpFetcher:
             elif "application/json" in content_type:
                 artifact_type = ArtifactType.DPP_PAYLOAD
 
-        return Artifact.from_bytes(
+        artifact = Artifact.from_bytes(
             uri=response.url,
             content_type=content_type,
             artifact_type=artifact_type,
@@ -38,3 +139,72 @@ class HttpFetcher:
                 "headers": dict(response.headers),
             },
         )
+        if self.cache is None:
+            return artifact
+
+        cache_status = "bypass"
+        if _cacheable(response):
+            cache_status = "miss"
+            self.cache.store(
+                CachedResponse(
+                    url=url,
+                    final_url=response.url,
+                    sha256=artifact.sha256,
+                    content_type=content_type,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    stored_at=time.time(),
+                ),
+                artifact.to_bytes(),
+            )
+        artifact.metadata["cache"] = {"status": cache_status}
+        return artifact
+
+    def _revalidated(
+        self, response: requests.Response, entry: CachedResponse, body: bytes
+    ) -> Artifact:
+        # A 304 may carry updated validators; keep them for the next request.
+        etag = response.headers.get("ETag", entry.etag)
+        last_modified = response.headers.get("Last-Modified", entry.last_modified)
+        changed = (etag, last_modified) != (entry.etag, entry.last_modified)
+        if changed and self.cache is not None:
+            entry.etag, entry.last_modified = etag, last_modified
+            self.cache.store(entry)
+
+        return Artifact.from_bytes(
+            uri=entry.final_url,
+            content_type=entry.content_type,
+            artifact_type=ArtifactType.DPP_PAYLOAD,
+            raw_bytes=body,
+            metadata={
+                # Only 200 responses are cached, and the body is theirs.
+                "status_code": 200,
+                "headers": dict(response.headers),
+                "cache": {
+                    "status": "revalidated",
+                    "status_code": response.status_code,
+                    "etag": entry.etag,
+                    "last_modified": entry.last_modified,
+                    "stored_at": entry.stored_at,
+                },
+            },
+        )
+
+
+_DEFAULT_FETCHERS: dict[bool, HttpFetcher] = {}
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_fetcher(cache: bool = False) -> HttpFetcher:
+    """Returns the process-wide fetcher, sharing its connection pool.
+
+    With ``cache``, responses are kept in and revalidated against the
+    on-disk ``ResponseCache`` in the opendpp cache directory.
+    """
+    with _DEFAULT_LOCK:
+        fetcher = _DEFAULT_FETCHERS.get(cache)
+        if fetcher is None:
+            fetcher = _DEFAULT_FETCHERS[cache] = HttpFetcher(
+                cache=ResponseCache() if cache else None
+            )
+        return fetcher
@@ -0,0 +1,207 @@
+"""Offline-first resolution of remote JSON-LD ``@context`` documents.
+
+Contexts are served, in order, from the profile's bundled files, from the
+documents already resolved by this process, from a persistent on-disk cache
+and finally from the network. In offline mode the network is never used and
+unknown contexts fail immediately.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Mapping
+from urllib.parse import urljoin
+
+from opendpp.core.artifact import Artifact
+from opendpp.core.cache import atomic_write_bytes, cache_root
+from opendpp.core.codec import decode_json_bytes
+
+DEFAULT_TTL = 24 * 60 * 60
+
+# Remote documents resolved by this process, shared by every loader so a
+# context is fetched at most once per process.
+_RESOLVED: dict[str, Any] = {}
+_RESOLVED_LOCK = threading.Lock()
+
+
+class ContextNotAvailable(ValueError):
+    """Raised when a context cannot be resolved under the loader's policy."""
+
+
+class ContextCache:
+    """On-disk cache of remote JSON-LD documents with a time-to-live."""
+
+    def __init__(self, directory: Path | None = None, ttl: float = DEFAULT_TTL):
+        self.directory = directory or cache_root() / "contexts"
+        self.ttl = ttl
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str, allow_stale: bool = False) -> Any | None:
+        try:
+            entry = json.loads(self._path(url).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url:
+            return None
+        if not allow_stale and time.time() - entry.get("fetched_at", 0) > self.ttl:
+            return None
+        return entry.get("document")
+
+    def put(self, url: str, document: Any) -> None:
+        entry = {"url": url, "fetched_at": time.time(), "document": document}
+        try:
+            atomic_write_bytes(self._path(url), json.dumps(entry).encode("utf-8"))
+        except OSError:
+            pass
+
+
+def _fetch(url: str) -> Any:
+    from opendpp.fetch.http import default_fetcher
+
+    artifact = default_fetcher().fetch(url)
+    return json.loads(decode_json_bytes(artifact.raw_bytes))
+
+
+class ContextLoader:
+    """Resolves context URLs to parsed JSON-LD documents.
+
+    Instances are callable with pyld's document loader signature, so they can
+    be passed as ``documentLoader``.
+    """
+
+    def __init__(
+        self,
+        bundled: Mapping[str, Artifact] | None = None,
+        cache: ContextCache | None = None,
+        offline: bool = False,
+        fetch: Callable[[str], Any] = _fetch,
+    ) -> None:
+        self.bundled = dict(bundled or {})
+        self.cache = cache or ContextCache()
+        self.offline = offline
+        self._fetch = fetch
+
+    def load(self, url: str) -> Any:
+        bundled = self.bundled.get(url)
+        if bundled is not None:
+            return bundled.parsed_json()
+        with _RESOLVED_LOCK:
+            if url in _RESOLVED:
+                return _RESOLVED[url]
+
+        document = self.cache.get(url, allow_stale=self.offline)
+        if document is None:
+            if self.offline:
+                raise ContextNotAvailable(
+                    f"JSON-LD context not available offline: {url}"
+                )
+            try:
+                document = self._fetch(url)
+            except Exception as exc:
+                raise ContextNotAvailable(
+                    f"Failed to load JSON-LD context {url}: {exc}"
+                ) from exc
+            self.cache.put(url, document)
+
+        with _RESOLVED_LOCK:
+            return _RESOLVED.setdefault(url, document)
+
+    def __call__(self, url: str, options: Any = None) -> dict[str, Any]:
+        # Resolved documents never change within a process; "static" lets
+        # pyld keep the processed context in its resolver cache.
+        return {
+            "contentType": "application/ld+json",
+            "contextUrl": None,
+            "documentUrl": url,
+            "document": self.load(url),
+            "tag": "static",
+        }
+
+
+def clear_resolved_contexts() -> None:
+    """Forgets every remote context resolved by this process."""
+    with _RESOLVED_LOCK:
+        _RESOLVED.clear()
+
+
+def _resolve(
+    value: Any, base: str | None, loader: ContextLoader, seen: frozenset[str]
+) -> Any:
+    if isinstance(value, str):
+        url = urljoin(base, value) if base else value
+        if url in seen:
+            raise ContextNotAvailable(f"Recursive JSON-LD context inclusion: {url}")
+        document = loader.load(url)
+        if not isinstance(document, dict) or "@context" not in document:
+            raise ContextNotAvailable(f"Remote document has no @context: {url}")
+        return _resolve(document["@context"], url, loader, seen | {url})
+    if isinstance(value, list):
+        flattened: list[Any] = []
+        for entry in value:
+            resolved = _resolve(entry, base, loader, seen)
+            if isinstance(resolved, list):
+                flattened.extend(resolved)
+            else:
+                flattened.append(resolved)
+        return flattened
+    if not isinstance(value, dict):
+        return value
+
+    definition: dict[str, Any] = {}
+    imported = value.get("@import")
+    if isinstance(imported, str):
+        resolved = _resolve(imported, base, loader, seen)
+        if not isinstance(resolved, dict):
+            raise ContextNotAvailable(f"Imported context is not an object: {imported}")
+        definition.update(resolved)
+    for key, term in value.items():
+        if key == "@import":
+            continue
+        if isinstance(term, dict) and "@context" in term:
+            term = {**term, "@context": _resolve(term["@context"], base, loader, seen)}
+        definition[key] = term
+    return definition
+
+
+def resolve_context(value: Any, loader: ContextLoader) -> Any:
+    """Returns the ``@context`` value ``value`` with every remote part inlined."""
+    return _resolve(value, None, loader, frozenset())
+
+
+def inline_contexts(
+    document: Any,
+    loader: ContextLoader,
+    resolve: Callable[[Any], Any] | None = None,
+) -> Any:
+    """Returns ``document`` with every remote ``@context`` replaced inline.
+
+    Used for parsers such as rdflib's that cannot take a document loader.
+    ``resolve`` replaces ``resolve_context`` for each ``@context`` value,
+    e.g. to memoize it. The input is never modified.
+    """
+    if resolve is None:
+
+        def resolve(value: Any) -> Any:
+            return resolve_context(value, loader)
+
+    return _inline(document, resolve)
+
+
+def _inline(document: Any, resolve: Callable[[Any], Any]) -> Any:
+    if isinstance(document, list):
+        return [_inline(item, resolve) for item in document]
+    if not isinstance(document, dict) or "@value" in document:
+        return document
+    result = {
+        key: value if key == "@context" else _inline(value, resolve)
+        for key, value in document.items()
+    }
+    if "@context" in document:
+        result["@context"] = resolve(document["@context"])
+    return result
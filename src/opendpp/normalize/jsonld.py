@@ -1,34 +1,147 @@
+from __future__ import annotations
+
 import json
-from typing import Any
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Callable
 
+from cachetools import LRUCache
 from pyld import jsonld
 from rdflib import Graph
+from rdflib.parser import PythonInputSource
 
 from opendpp.core.artifact import Artifact, ArtifactType
-from opendpp.core.codec import decode_json_bytes
+from opendpp.normalize.contexts import (
+    ContextLoader,
+    inline_contexts,
+    resolve_context,
+)
+
+# Resolved contexts kept per context loader.
+RESOLVED_CONTEXTS_MAXSIZE = 128
+
+
+class ActiveContextCache:
+    """Bounded LRU of the JSON-LD contexts resolved in this process.
+
+    Holds the ``@context`` values that ``to_rdf_graph`` inlined, keyed by
+    loader and context, and one pyld resolved-context cache per loader for
+    ``expand_jsonld``. Payloads sharing a context only pay for resolving
+    it once per process and loader.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Any, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_create(self, key: Any, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        value = factory()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
 
+ACTIVE_CONTEXTS = ActiveContextCache()
 
-def expand_jsonld(artifact: Artifact) -> list[dict[str, Any]]:
-    """Expands JSON-LD using pyld."""
+
+def _context_resolver(document_loader: ContextLoader | None) -> Any:
+    """Returns a pyld context resolver sharing the loader's cached contexts."""
+    cache = ACTIVE_CONTEXTS.get_or_create(
+        ("pyld", document_loader),
+        lambda: LRUCache(maxsize=RESOLVED_CONTEXTS_MAXSIZE),
+    )
+    return jsonld.ContextResolver(
+        cache, document_loader or jsonld.get_document_loader()
+    )
+
+
+def _context_key(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _resolved_context(value: Any, loader: ContextLoader) -> Any:
+    """Returns ``value`` with remote contexts inlined, memoized per loader.
+
+    The result is shared between documents and must not be mutated.
+    """
+    return ACTIVE_CONTEXTS.get_or_create(
+        ("rdflib", loader, _context_key(value)),
+        lambda: resolve_context(value, loader),
+    )
+
+
+def expand_jsonld(
+    artifact: Artifact, document_loader: ContextLoader | None = None
+) -> list[dict[str, Any]]:
+    """Expands JSON-LD using pyld, resolving contexts via ``document_loader``.
+
+    Contexts are resolved and processed once per process and loader; pyld
+    reuses them through the resolver cache in ``ACTIVE_CONTEXTS``.
+    """
     if artifact.artifact_type not in [
         ArtifactType.DPP_PAYLOAD,
         ArtifactType.JSONLD_CONTEXT,
     ]:
         raise ValueError("Artifact is not JSON-LD")
 
-    data = json.loads(decode_json_bytes(artifact.raw_bytes))
-    expanded: list[dict[str, Any]] = jsonld.expand(data)
-    return expanded
+    options: dict[str, Any] = {"contextResolver": _context_resolver(document_loader)}
+    if document_loader is not None:
+        options["documentLoader"] = document_loader
+    result: list[dict[str, Any]] = jsonld.expand(artifact.parsed_json(), options)
+    return result
+
 
+def to_rdf_graph(
+    artifact: Artifact, document_loader: ContextLoader | None = None
+) -> Graph:
+    """Converts artifact content to an RDFLib graph.
 
-def to_rdf_graph(artifact: Artifact) -> Graph:
-    """Converts artifact content to an RDFLib graph."""
+    With a ``document_loader``, remote contexts are inlined up front so
+    rdflib never fetches them itself; the inlined contexts are reused from
+    ``ACTIVE_CONTEXTS`` across documents.
+    """
     g = Graph()
 
     if artifact.artifact_type == ArtifactType.RDF_GRAPH:
-        g.parse(data=artifact.raw_bytes, format=artifact.content_type)
+        g.parse(data=artifact.to_bytes(), format=artifact.content_type)
     elif artifact.artifact_type == ArtifactType.DPP_PAYLOAD:
-        # Try JSON-LD parsing via RDFLib
-        g.parse(data=artifact.raw_bytes, format="json-ld")
+        # Try JSON-LD parsing via RDFLib, reusing the artifact's parsed tree
+        data = artifact.parsed_json()
+        if document_loader is not None:
+            resolve = partial(_resolved_context, loader=document_loader)
+            data = inline_contexts(data, document_loader, resolve)
+        g.parse(source=PythonInputSource(data), format="json-ld")
 
     return g
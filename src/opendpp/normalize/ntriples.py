@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from rdflib import Graph
+
+
+def canonical_ntriples(graph: Graph) -> bytes:
+    """Serializes a graph as N-Triples with lines in sorted order.
+
+    Without blank nodes the output, and so its hash, depends only on the
+    triples and not on insertion order or the store. It is also much
+    cheaper to produce than Turtle for large graphs.
+    """
+    lines = sorted(f"{s.n3()} {p.n3()} {o.n3()} .\n" for s, p, o in graph)
+    return "".join(lines).encode("utf-8")
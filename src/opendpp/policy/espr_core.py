@@ -1,90 +1,367 @@
-import json
+import operator
 import re
-from typing import Any, Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import yaml
+from jsonpath_ng import jsonpath
 from jsonpath_ng import parse as jsonpath_parse
 
 from opendpp.core.artifact import Artifact, ArtifactType
-from opendpp.core.codec import decode_json_bytes
 from opendpp.core.report import ConformanceReport, Severity
 
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+_NUMBER = r"(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)"
+_COMPARISON = re.compile(r"^(<=|>=|==|!=|<|>)\s*" + _NUMBER + r"$")
+_COUNT = re.compile(r"^count\s*(<=|>=|==|!=|<|>)\s*(\d+)$")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+@dataclass(frozen=True)
+class Equals:
+    expected: str
+
+    def test(self, value: Any) -> bool:
+        return str(value) == self.expected
+
+
+@dataclass(frozen=True)
+class Matches:
+    pattern: "re.Pattern[str]"
+
+    def test(self, value: Any) -> bool:
+        return self.pattern.search(str(value)) is not None
+
+
+@dataclass(frozen=True)
+class OneOf:
+    options: frozenset
+
+    def test(self, value: Any) -> bool:
+        return str(value) in self.options
+
+
+@dataclass(frozen=True)
+class Compare:
+    op: str
+    operand: float
+
+    def test(self, value: Any) -> bool:
+        return _is_number(value) and _OPERATORS[self.op](value, self.operand)
+
+
+Predicate = Any  # Equals | Matches | OneOf | Compare
+
+
+@dataclass(frozen=True)
+class Exists:
+    def evaluate(self, matches: Sequence[Any]) -> bool:
+        return len(matches) > 0
+
+
+@dataclass(frozen=True)
+class Count:
+    op: str
+    operand: int
+
+    def evaluate(self, matches: Sequence[Any]) -> bool:
+        return _OPERATORS[self.op](len(matches), self.operand)
+
+
+@dataclass(frozen=True)
+class Quantified:
+    quantifier: str
+    predicate: Predicate
+
+    def evaluate(self, matches: Sequence[Any]) -> bool:
+        if self.quantifier == "all":
+            # An empty selection does not satisfy "all", otherwise a missing
+            # field would pass silently.
+            return bool(matches) and all(self.predicate.test(m) for m in matches)
+        return any(self.predicate.test(m) for m in matches)
+
+
+Assertion = Any  # Exists | Count | Quantified
+
+
+def _parse_predicate(text: str) -> Predicate:
+    if text.startswith("equals:"):
+        return Equals(text.split("equals:", 1)[1])
+    if text.startswith("regex:"):
+        pattern = text.split("regex:", 1)[1]
+        try:
+            return Matches(re.compile(pattern))
+        except re.error as exc:
+            raise ValueError(f"Invalid regex {pattern!r}: {exc}") from exc
+    if text.startswith("in:"):
+        options = text.split("in:", 1)[1].split(",")
+        return OneOf(frozenset(option.strip() for option in options))
+    match = _COMPARISON.match(text.strip())
+    if match:
+        return Compare(match.group(1), float(match.group(2)))
+    raise ValueError(f"Unknown assertion: {text}")
+
+
+def parse_assertion(text: str) -> Assertion:
+    """Parses a rule assertion into its evaluable form.
+
+    Supported forms are ``exists``, ``count <op> N`` and value predicates
+    (``equals:X``, ``regex:P``, ``in:A,B``, ``<op> N`` with ``<op>`` one of
+    ``< <= > >= == !=``). Value predicates hold when any match satisfies
+    them; prefix ``all:`` to require every match (and at least one) to.
+    """
+    text = text.strip()
+    if text == "exists":
+        return Exists()
+    count = _COUNT.match(text)
+    if count:
+        return Count(count.group(1), int(count.group(2)))
+    quantifier = "any"
+    for prefix in ("all:", "any:"):
+        if text.startswith(prefix):
+            quantifier, text = prefix[:-1], text[len(prefix) :].strip()
+    return Quantified(quantifier, _parse_predicate(text))
+
+
+# A path step: ("fields", names) with "*" for every key, ("index", indices)
+# or ("all",) for [*].
+Step = Tuple[Any, ...]
+
+
+def _path_steps(expr: Any) -> Optional[List[Step]]:
+    """Flattens a plain child path into steps; None for anything fancier."""
+    if isinstance(expr, jsonpath.Root):
+        return []
+    if isinstance(expr, jsonpath.Child):
+        left = _path_steps(expr.left)
+        right = _path_steps(expr.right)
+        if left is None or right is None:
+            return None
+        return left + right
+    if isinstance(expr, jsonpath.Fields):
+        return [("fields", tuple(expr.fields))]
+    if isinstance(expr, jsonpath.Index):
+        return [("index", tuple(expr.indices))]
+    if isinstance(expr, jsonpath.Slice) and (expr.start, expr.end, expr.step) == (
+        None,
+        None,
+        None,
+    ):
+        return [("all",)]
+    return None
+
+
+def _step_values(step: Step, value: Any) -> List[Any]:
+    """Applies one step the way jsonpath_ng does."""
+    kind = step[0]
+    if kind == "fields":
+        if not isinstance(value, dict):
+            return []
+        names = tuple(value) if "*" in step[1] else step[1]
+        return [value[name] for name in names if name in value]
+    if kind == "index":
+        if isinstance(value, dict) or not isinstance(value, (list, str)):
+            return []
+        return [value[i] for i in step[1] if value and -len(value) <= i < len(value)]
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+@dataclass
+class _PathNode:
+    terminals: List[str] = field(default_factory=list)
+    children: Dict[Step, "_PathNode"] = field(default_factory=dict)
+
+
+class SelectorIndex:
+    """Evaluates a set of JSONPath selectors in one walk over a document.
+
+    Plain child paths (fields, indices, ``[*]``) are merged into a trie so
+    shared prefixes are visited once; other expressions (e.g. ``..``) fall
+    back to ``jsonpath_ng``. Each distinct selector is evaluated once per
+    document however many rules use it.
+    """
+
+    def __init__(self, selectors: Sequence[str]) -> None:
+        self.root = _PathNode()
+        self.fallback: Dict[str, Any] = {}
+        for selector in dict.fromkeys(selectors):
+            expr = jsonpath_parse(selector)
+            steps = _path_steps(expr)
+            if steps is None:
+                self.fallback[selector] = expr
+                continue
+            node = self.root
+            for step in steps:
+                node = node.children.setdefault(step, _PathNode())
+            node.terminals.append(selector)
+
+    def evaluate(self, data: Any) -> Dict[str, List[Any]]:
+        results: Dict[str, List[Any]] = {}
+        self._walk(self.root, data, results)
+        for selector, expr in self.fallback.items():
+            results[selector] = [m.value for m in expr.find(data)]
+        return results
+
+    def _walk(self, node: _PathNode, value: Any, results: Dict[str, List[Any]]) -> None:
+        for selector in node.terminals:
+            results.setdefault(selector, []).append(value)
+        for step, child in node.children.items():
+            for item in _step_values(step, value):
+                self._walk(child, item, results)
+
+
+@dataclass
+class CompiledRule:
+    rule: Dict[str, Any]
+    rule_id: str
+    severity: Severity
+    message: str
+    selectors: List[str]
+    assertion: Assertion = None
+    error: Optional[str] = None
+
+
+def compile_rule(rule: Dict[str, Any]) -> CompiledRule:
+    """Validates a rule and parses its selectors and assertion once."""
+    selector = rule.get("selector")
+    compiled = CompiledRule(
+        rule=rule,
+        rule_id=rule.get("id", "ESPR-RULE"),
+        severity=Severity(rule.get("severity", "warning")),
+        message=rule.get("message", "Policy rule failed"),
+        selectors=(selector if isinstance(selector, list) else [selector])
+        if selector
+        else [],
+    )
+    if not selector:
+        return compiled
+    try:
+        for sel in compiled.selectors:
+            jsonpath_parse(sel)
+        compiled.assertion = parse_assertion(str(rule.get("assertion", "exists")))
+    except Exception as exc:
+        compiled.error = str(exc)
+    return compiled
+
 
 class PolicyEngine:
     def __init__(self, rules_path: str):
         with open(rules_path, "r", encoding="utf-8") as f:
-            self.rules = yaml.safe_load(f).get("rules", [])
+            self._compile((yaml.safe_load(f) or {}).get("rules", []))
+
+    @classmethod
+    def from_artifact(cls, rules_artifact: Artifact) -> "PolicyEngine":
+        """Builds an engine from an already loaded rules file."""
+        engine = cls.__new__(cls)
+        data = yaml.safe_load(str(rules_artifact.raw_bytes, "utf-8")) or {}
+        engine._compile(data.get("rules", []))
+        return engine
+
+    def _compile(self, rules: List[Dict[str, Any]]) -> None:
+        self.rules = rules
+        self.compiled = [compile_rule(rule) for rule in rules]
+        self.index = SelectorIndex(
+            [
+                sel
+                for rule in self.compiled
+                if rule.error is None
+                for sel in rule.selectors
+            ]
+        )
 
     def run_checks(self, artifacts: List[Artifact], report: ConformanceReport) -> None:
-        """Runs policy checks based on the profile's rules."""
-        for rule in self.rules:
-            self._evaluate_rule(rule, artifacts, report)
+        """Runs policy checks based on the profile's rules.
 
-    def _evaluate_rule(
-        self, rule: Dict[str, Any], artifacts: List[Artifact], report: ConformanceReport
-    ) -> None:
-        rule_id = rule.get("id", "ESPR-RULE")
-        severity = Severity(rule.get("severity", "warning"))
-        selector = rule.get("selector")
-        assertion = rule.get("assertion", "exists")
-        message = rule.get("message", "Policy rule failed")
+        Every DPP payload is walked once for all rules together.
+        """
+        targets = [a for a in artifacts if a.artifact_type == ArtifactType.DPP_PAYLOAD]
+        if not targets:
+            for rule in self.compiled:
+                if self._report_unusable(rule, report):
+                    continue
+                report.add_finding(
+                    rule_id=rule.rule_id,
+                    severity=Severity.ERROR,
+                    message="No DPP payload available for policy evaluation",
+                    evidence={"rule": rule.rule},
+                )
+            return
 
-        if not selector:
+        for position, target in enumerate(targets):
+            try:
+                selected = self.index.evaluate(target.parsed_json())
+                failure = None
+            except Exception as exc:
+                selected, failure = {}, exc
+            for rule in self.compiled:
+                if rule.error is not None or not rule.selectors:
+                    if position == 0:
+                        self._report_unusable(rule, report)
+                    continue
+                if failure is not None:
+                    report.add_finding(
+                        rule_id=rule.rule_id,
+                        severity=Severity.ERROR,
+                        message=f"Policy rule evaluation error: {str(failure)}",
+                        evidence={
+                            "selector": rule.rule.get("selector"),
+                            "artifact_hash": target.sha256,
+                        },
+                    )
+                    continue
+                self._evaluate_rule(rule, target, selected, report)
+
+    @staticmethod
+    def _report_unusable(rule: CompiledRule, report: ConformanceReport) -> bool:
+        if not rule.selectors:
             report.add_finding(
-                rule_id=rule_id,
-                severity=severity,
+                rule_id=rule.rule_id,
+                severity=rule.severity,
                 message="Policy rule missing selector; skipped",
-                evidence={"rule": rule},
+                evidence={"rule": rule.rule},
             )
-            return
-
-        target = next(
-            (a for a in artifacts if a.artifact_type == ArtifactType.DPP_PAYLOAD),
-            None,
-        )
-        if not target:
+            return True
+        if rule.error is not None:
             report.add_finding(
-                rule_id=rule_id,
+                rule_id=rule.rule_id,
                 severity=Severity.ERROR,
-                message="No DPP payload available for policy evaluation",
-                evidence={"rule": rule},
+                message=f"Policy rule invalid: {rule.error}",
+                evidence={"rule": rule.rule},
             )
-            return
+            return True
+        return False
 
-        try:
-            data = json.loads(decode_json_bytes(target.raw_bytes))
-            selectors = selector if isinstance(selector, list) else [selector]
-            matches: list[Any] = []
-            for sel in selectors:
-                expr = jsonpath_parse(sel)
-                matches.extend(m.value for m in expr.find(data))
-        except Exception as exc:
-            report.add_finding(
-                rule_id=rule_id,
-                severity=Severity.ERROR,
-                message=f"Policy rule evaluation error: {str(exc)}",
-                evidence={"selector": selector, "artifact_hash": target.sha256},
-            )
-            return
+    @staticmethod
+    def _evaluate_rule(
+        rule: CompiledRule,
+        target: Artifact,
+        selected: Dict[str, List[Any]],
+        report: ConformanceReport,
+    ) -> None:
+        matches: List[Any] = []
+        for sel in rule.selectors:
+            matches.extend(selected.get(sel, ()))
 
-        passed = False
-        if assertion == "exists":
-            passed = len(matches) > 0
-        elif assertion.startswith("equals:"):
-            expected = assertion.split("equals:", 1)[1]
-            passed = any(str(m) == expected for m in matches)
-        elif assertion.startswith("regex:"):
-            pattern = assertion.split("regex:", 1)[1]
-            passed = any(re.search(pattern, str(m)) for m in matches)
-
-        if not passed:
+        if not rule.assertion.evaluate(matches):
             report.add_finding(
-                rule_id=rule_id,
-                severity=severity,
-                message=message,
+                rule_id=rule.rule_id,
+                severity=rule.severity,
+                message=rule.message,
                 evidence={
-                    "selector": selector,
-                    "assertion": assertion,
+                    "selector": rule.rule.get("selector"),
+                    "assertion": rule.rule.get("assertion", "exists"),
                     "artifact_hash": target.sha256,
                     "matches": matches,
                 },
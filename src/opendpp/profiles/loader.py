@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import mimetypes
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable
 
 import yaml
 
-from opendpp.core.artifact import Profile
+from opendpp.core.artifact import Artifact, ArtifactType, Profile
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -61,4 +68,328 @@ def resolve_artifact_paths(profile: LoadedProfile) -> LoadedProfile:
     manifest.artifacts.contexts = _resolve_list(
         profile.base_dir, manifest.artifacts.contexts
     )
+    context_urls = manifest.jsonld.context_urls
+    manifest.jsonld.context_urls = dict(
+        zip(context_urls, _resolve_list(profile.base_dir, context_urls.values()))
+    )
+    inference = manifest.shacl.inference
+    manifest.shacl.inference = dict(
+        zip(_resolve_list(profile.base_dir, inference), inference.values())
+    )
     return profile
+
+
+def load_artifact_file(path: str, artifact_type: ArtifactType) -> Artifact:
+    """Reads a profile file from disk into an artifact."""
+    content_type, _ = mimetypes.guess_type(Path(path).name)
+    return Artifact.from_file(
+        path, content_type=content_type, artifact_type=artifact_type
+    )
+
+
+def _file_stamp(path: Path) -> tuple[str, int, int]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (str(path), -1, -1)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _profile_stamps(profile_path: Path, manifest: Profile) -> tuple[Any, ...]:
+    artifacts = manifest.artifacts
+    paths = [
+        profile_path,
+        *map(Path, artifacts.schemas),
+        *map(Path, artifacts.shapes),
+        *map(Path, artifacts.openapi),
+        *map(Path, artifacts.rules),
+        *map(Path, artifacts.contexts),
+    ]
+    return (manifest.id, manifest.version, *(_file_stamp(p) for p in paths))
+
+
+@dataclass(eq=False)
+class CompiledProfile:
+    """A profile with its artifacts loaded and its validators compiled.
+
+    Files are read once when the profile is compiled; parsed schemas,
+    validators, shapes graphs and policy engines are built on first use and
+    shared by every check that runs against the same profile afterwards.
+    """
+
+    manifest: Profile
+    base_dir: Path
+    path: Path
+    stamps: tuple[Any, ...]
+    schemas: list[Artifact]
+    openapi: list[Artifact]
+    shapes: list[Artifact]
+    rules: list[Artifact]
+    contexts: list[Artifact]
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    _cache: dict[tuple[str, str], Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def id(self) -> str:
+        return self.manifest.id
+
+    @property
+    def version(self) -> str:
+        return self.manifest.version
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash over the manifest settings and every profile file."""
+        digest = hashlib.sha256()
+        digest.update(self.manifest.model_dump_json(exclude={"artifacts"}).encode())
+        for artifact in [
+            *self.schemas,
+            *self.openapi,
+            *self.shapes,
+            *self.rules,
+            *self.contexts,
+        ]:
+            entry = f"\0{artifact.artifact_type.value}:{artifact.sha256}"
+            digest.update(entry.encode("utf-8"))
+        return digest.hexdigest()
+
+    def stage_fingerprint(
+        self,
+        stage: str,
+        offline: bool | None = None,
+        schema_backend: str | None = None,
+    ) -> str:
+        """Content hash over exactly the settings and files ``stage`` reads.
+
+        Results of a stage stay valid while its fingerprint is unchanged,
+        whatever else in the profile changes. ``offline`` is the run's
+        override of ``jsonld.offline``, which only SHACL depends on;
+        ``schema_backend`` overrides ``json_schema.backend``.
+        """
+        manifest = self.manifest
+        settings: Any
+        files: list[Artifact]
+        if stage == "aas_parse":
+            settings, files = None, []
+        elif stage == "json_schema":
+            settings, files = manifest.json_schema.model_dump(), self.schemas
+            if schema_backend is not None:
+                settings["backend"] = schema_backend
+        elif stage == "openapi":
+            settings, files = None, self.openapi
+        elif stage == "shacl":
+            jsonld = manifest.jsonld.model_dump()
+            if offline is not None:
+                jsonld["offline"] = offline
+            settings = [manifest.shacl.model_dump(), jsonld]
+            files = [*self.shapes, *self.contexts]
+        elif stage == "policy":
+            settings, files = None, self.rules
+        else:
+            raise ValueError(f"Stage has no profile fingerprint: {stage}")
+        digest = hashlib.sha256()
+        digest.update(json.dumps([stage, settings], sort_keys=True).encode("utf-8"))
+        for artifact in files:
+            entry = f"\0{artifact.uri}:{artifact.sha256}"
+            digest.update(entry.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _memoize(self, kind: str, key: str, factory: Any) -> Any:
+        cache_key = (kind, key)
+        try:
+            return self._cache[cache_key]
+        except KeyError:
+            pass
+        with self._lock:
+            if cache_key not in self._cache:
+                self._cache[cache_key] = factory()
+            return self._cache[cache_key]
+
+    def schema_document(self, schema: Artifact) -> Any:
+        """Returns the parsed JSON document of a profile schema."""
+        return self._memoize("schema", schema.sha256, schema.parsed_json)
+
+    def schema_registry(self) -> Any:
+        """Returns a ``$ref`` registry preloaded with every profile schema."""
+        from opendpp.validate.syntax.json_schema import build_registry
+
+        return self._memoize(
+            "registry",
+            "schemas",
+            lambda: build_registry(
+                (s.uri, self.schema_document(s)) for s in self.schemas
+            ),
+        )
+
+    def schema_validator(self, schema: Artifact, backend: str | None = None) -> Any:
+        """Returns a reusable JSON Schema validator for a profile schema.
+
+        ``backend`` overrides the profile's ``json_schema.backend``. The
+        ``codegen`` backend falls back to ``jsonschema`` for schemas it
+        cannot compile.
+        """
+        from opendpp.validate.syntax.json_schema import build_validator
+
+        backend = backend or self.manifest.json_schema.backend
+        format_assertion = self.manifest.json_schema.format_assertion
+
+        def _interpreted() -> Any:
+            return build_validator(
+                self.schema_document(schema),
+                registry=self.schema_registry(),
+                format_assertion=format_assertion,
+            )
+
+        def _generated() -> Any:
+            from opendpp.validate.syntax.codegen import (
+                UnsupportedSchema,
+                compile_schema,
+            )
+
+            try:
+                return compile_schema(
+                    self.schema_document(schema),
+                    cache_dir=self.base_dir / ".compiled",
+                    format_assertion=format_assertion,
+                )
+            except UnsupportedSchema as exc:
+                logger.info("Using jsonschema for %s: %s", schema.uri, exc)
+                return self.schema_validator(schema, "jsonschema")
+
+        if backend == "codegen":
+            return self._memoize("codegen", schema.sha256, _generated)
+        if backend == "jsonschema":
+            return self._memoize("validator", schema.sha256, _interpreted)
+        raise ValueError(f"Unknown JSON Schema backend: {backend}")
+
+    def schema_router(self) -> Any:
+        """Returns the routing index over the profile's schemas."""
+        from opendpp.validate.syntax.schema_routing import SchemaRouter
+
+        return self._memoize(
+            "router",
+            "schemas",
+            lambda: SchemaRouter([self.schema_document(s) for s in self.schemas]),
+        )
+
+    def compiled_shapes(self, shapes: Artifact) -> Any:
+        """Returns the parsed and analysed SHACL shapes of a profile file.
+
+        Inference follows ``shacl.inference`` for the file, defaulting to
+        ``auto``.
+        """
+        from opendpp.validate.semantic.shacl import compile_shapes
+
+        inference = self.manifest.shacl.inference.get(shapes.uri, "auto")
+        return self._memoize(
+            "shapes",
+            f"{shapes.uri}#{shapes.sha256}",
+            lambda: compile_shapes(shapes, inference),
+        )
+
+    def document_loader(self, offline: bool | None = None) -> Any:
+        """Returns the JSON-LD context loader backed by the profile contexts.
+
+        ``offline`` overrides the profile's ``jsonld.offline`` setting.
+        """
+        from opendpp.normalize.contexts import ContextCache, ContextLoader
+
+        settings = self.manifest.jsonld
+        if offline is None:
+            offline = settings.offline
+
+        def _build() -> Any:
+            by_path = {artifact.uri: artifact for artifact in self.contexts}
+            bundled = {
+                Path(uri).as_uri(): artifact for uri, artifact in by_path.items()
+            }
+            for url, path in settings.context_urls.items():
+                if path not in by_path:
+                    raise ValueError(
+                        f"Context for {url} is not listed under artifacts.contexts: "
+                        f"{path}"
+                    )
+                bundled[url] = by_path[path]
+            return ContextLoader(
+                bundled=bundled,
+                cache=ContextCache(ttl=settings.cache_ttl),
+                offline=offline,
+            )
+
+        return self._memoize("contexts", str(offline), _build)
+
+    def policy_engines(self) -> list[Any]:
+        """Returns one policy engine per rules file, in manifest order."""
+        if not self.rules:
+            return []
+        from opendpp.policy.espr_core import PolicyEngine
+
+        return [
+            self._memoize(
+                "rules", rules.sha256, lambda r=rules: PolicyEngine.from_artifact(r)
+            )
+            for rules in self.rules
+        ]
+
+    def warm(self) -> "CompiledProfile":
+        """Builds every lazily compiled member up front."""
+        for schema in self.schemas:
+            self.schema_validator(schema)
+        self.schema_router()
+        for shapes in self.shapes:
+            self.compiled_shapes(shapes)
+        self.policy_engines()
+        self.document_loader()
+        return self
+
+
+def compile_profile(profile_ref: str) -> CompiledProfile:
+    """Loads a profile and reads all of its artifacts from disk."""
+    path = resolve_profile_path(profile_ref).resolve()
+    loaded = resolve_artifact_paths(load_profile(str(path)))
+    manifest = loaded.manifest
+    stamps = _profile_stamps(path, manifest)
+
+    def _load(paths: list[str], artifact_type: ArtifactType) -> list[Artifact]:
+        return [load_artifact_file(p, artifact_type) for p in paths]
+
+    return CompiledProfile(
+        manifest=manifest,
+        base_dir=loaded.base_dir,
+        path=path,
+        stamps=stamps,
+        schemas=_load(manifest.artifacts.schemas, ArtifactType.JSON_SCHEMA),
+        openapi=_load(manifest.artifacts.openapi, ArtifactType.OPENAPI_DOC),
+        shapes=_load(manifest.artifacts.shapes, ArtifactType.SHACL_SHAPES),
+        rules=_load(manifest.artifacts.rules, ArtifactType.POLICY_RULES),
+        contexts=_load(manifest.artifacts.contexts, ArtifactType.JSONLD_CONTEXT),
+    )
+
+
+_COMPILED_PROFILES: dict[Path, CompiledProfile] = {}
+_COMPILED_LOCK = threading.Lock()
+
+
+def get_compiled_profile(profile_ref: str) -> CompiledProfile:
+    """Returns the process-wide compiled profile, recompiling on file changes.
+
+    Cache entries are keyed by the resolved ``profile.yaml`` path and are
+    invalidated when the profile id/version or the mtime or size of any file
+    the profile references changes.
+    """
+    path = resolve_profile_path(profile_ref).resolve()
+    with _COMPILED_LOCK:
+        cached = _COMPILED_PROFILES.get(path)
+    if cached is not None and _profile_stamps(path, cached.manifest) == cached.stamps:
+        return cached
+
+    compiled = compile_profile(str(path))
+    with _COMPILED_LOCK:
+        _COMPILED_PROFILES[path] = compiled
+    return compiled
+
+
+def clear_profile_cache() -> None:
+    """Drops every compiled profile held by this process."""
+    with _COMPILED_LOCK:
+        _COMPILED_PROFILES.clear()
@@ -0,0 +1,272 @@
+"""Long-running local validation service behind ``dppctl serve``."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterable, Iterator
+from urllib.parse import parse_qs, urlsplit
+
+from opendpp.core.engine import payload_artifact, run_conformance_check
+from opendpp.core.report import ConformanceReport
+from opendpp.core.result_cache import ResultCache
+from opendpp.profiles.loader import CompiledProfile, get_compiled_profile
+from opendpp.trust.did import DidResolver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BODY = 64 * 1024 * 1024
+
+
+class ServiceBusy(Exception):
+    """Raised when every worker is busy and the queue is full."""
+
+
+class ValidationService:
+    """Runs conformance checks on a bounded pool against warm profiles.
+
+    At most ``workers`` checks run at once and ``queue_size`` more may
+    wait; further submissions are rejected with ``ServiceBusy`` rather
+    than piling up behind a saturated pool. Issuer DIDs named by payloads
+    are only resolved on public hosts, so clients cannot make the service
+    request internal addresses.
+    """
+
+    def __init__(
+        self,
+        profile_refs: Iterable[str],
+        workers: int = 4,
+        queue_size: int = 16,
+        report_artifacts_dir: str = "report_artifacts",
+        result_cache: ResultCache | None = None,
+        http_cache: bool = False,
+    ) -> None:
+        self.profiles: dict[str, CompiledProfile] = {}
+        for ref in profile_refs:
+            profile = get_compiled_profile(ref).warm()
+            self.profiles[ref] = profile
+            self.profiles.setdefault(profile.id, profile)
+        if not self.profiles:
+            raise ValueError("At least one profile is required")
+        self.default_profile = next(iter(self.profiles))
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.report_artifacts_dir = report_artifacts_dir
+        self.result_cache = result_cache
+        self.http_cache = http_cache
+        self.did_resolver = DidResolver(public_only=True)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="dppctl-serve"
+        )
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Checks running or queued right now."""
+        return self._pending
+
+    def health(self) -> dict[str, Any]:
+        return {
+            "status": "ok",
+            "profiles": sorted({p.id for p in self.profiles.values()}),
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "pending": self.pending,
+        }
+
+    @contextmanager
+    def reserve(self) -> Iterator[None]:
+        """Holds one of the ``capacity`` slots for a check.
+
+        Raises ``ServiceBusy`` straight away when none is free, so callers
+        can reserve a slot before doing any work for a request.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusy(f"{self.capacity} checks already pending")
+        with self._lock:
+            self._pending += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def check(
+        self,
+        target: str,
+        profile_ref: str | None = None,
+        payload: bytes | None = None,
+        content_type: str | None = None,
+        offline: bool | None = None,
+    ) -> ConformanceReport:
+        """Checks payload bytes, or the URL ``target`` when no payload is given.
+
+        ``profile_ref`` must be one the service was started with. Raises
+        ``ServiceBusy`` when the pool is saturated.
+        """
+        with self.reserve():
+            return self.run_check(target, profile_ref, payload, content_type, offline)
+
+    def run_check(
+        self,
+        target: str,
+        profile_ref: str | None = None,
+        payload: bytes | None = None,
+        content_type: str | None = None,
+        offline: bool | None = None,
+    ) -> ConformanceReport:
+        """Like ``check``, for callers already holding a ``reserve`` slot."""
+        profile = self.profiles[profile_ref or self.default_profile]
+        artifacts = None
+        if payload is not None:
+            artifacts = [payload_artifact(payload, target, content_type)]
+        future = self._executor.submit(
+            run_conformance_check,
+            target,
+            profile,
+            report_artifacts_dir=self.report_artifacts_dir,
+            offline=offline,
+            result_cache=self.result_cache,
+            artifacts=artifacts,
+            http_cache=self.http_cache,
+            did_resolver=self.did_resolver,
+        )
+        return future.result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def _flag(value: str | None) -> bool | None:
+    if value is None:
+        return None
+    return value.lower() in {"1", "true", "yes"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "ValidationServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send_json(
+        self,
+        status: HTTPStatus,
+        body: Any,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(
+        self, status: HTTPStatus, message: str, headers: dict[str, str] | None = None
+    ) -> None:
+        self._send_json(status, {"error": message}, headers)
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path == "/health":
+            self._send_json(HTTPStatus.OK, self.server.service.health())
+        else:
+            self._error(HTTPStatus.NOT_FOUND, f"No such endpoint: {self.path}")
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+            return
+        if url.path != "/check":
+            self.close_connection = True
+            self._error(HTTPStatus.NOT_FOUND, f"No such endpoint: {url.path}")
+            return
+        if length > self.server.max_body:
+            self.close_connection = True
+            self._error(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Payload exceeds {self.server.max_body} bytes",
+            )
+            return
+        # Reserve a slot first: a saturated server must not buffer bodies
+        # it is going to reject anyway.
+        try:
+            with self.server.service.reserve():
+                self._check(url.query, length)
+        except ServiceBusy as exc:
+            self.close_connection = True
+            self._error(HTTPStatus.TOO_MANY_REQUESTS, str(exc), {"Retry-After": "1"})
+
+    def _check(self, query_string: str, length: int) -> None:
+        payload = self.rfile.read(length) if length else None
+        query = {key: values[-1] for key, values in parse_qs(query_string).items()}
+
+        target = query.get("target")
+        profile_ref = query.get("profile")
+        if profile_ref is not None and profile_ref not in self.server.service.profiles:
+            self._error(HTTPStatus.NOT_FOUND, f"Profile not loaded: {profile_ref}")
+            return
+        if payload is None:
+            if target is None:
+                self._error(HTTPStatus.BAD_REQUEST, "Send a payload or a target URL")
+                return
+            # Never let clients point the service at its own filesystem.
+            if urlsplit(target).scheme not in {"http", "https"}:
+                self._error(HTTPStatus.BAD_REQUEST, "Only URL targets are accepted")
+                return
+
+        try:
+            report = self.server.service.run_check(
+                target or "payload",
+                profile_ref=profile_ref,
+                payload=payload,
+                content_type=self.headers.get("Content-Type"),
+                offline=_flag(query.get("offline")),
+            )
+        except Exception as exc:
+            logger.exception("Check failed")
+            self._error(HTTPStatus.INTERNAL_SERVER_ERROR, str(exc))
+        else:
+            self._send_json(
+                HTTPStatus.OK, report.model_dump_json(indent=2).encode("utf-8")
+            )
+
+
+class ValidationServer(ThreadingHTTPServer):
+    """HTTP front end for a ``ValidationService``.
+
+    ``GET /health`` reports the loaded profiles and pool usage. ``POST
+    /check`` validates the request body, or the URL given as ``target``
+    query parameter when the body is empty; ``profile`` and ``offline``
+    are optional query parameters. Responses are ``ConformanceReport``
+    JSON, or 429 while the pool is saturated.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        service: ValidationService,
+        max_body: int = DEFAULT_MAX_BODY,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.service = service
+        self.max_body = max_body
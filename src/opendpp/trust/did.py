@@ -1,10 +1,27 @@
-from typing import Any, Optional
+from __future__ import annotations
+
+import ipaddress
+import re
+import socket
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Optional
+from urllib.parse import urlsplit
 
 import requests
 
+DEFAULT_TTL = 300
 
-def resolve_did_web(did: str) -> dict[str, Any]:
-    """Resolves did:web to a DID Document."""
+_MAX_AGE = re.compile(r"(?:^|,)\s*(?:s-maxage|max-age)\s*=\s*(\d+)")
+
+
+class DidNotAvailable(ValueError):
+    """Raised when a DID Document cannot be resolved under the run's policy."""
+
+
+def did_web_url(did: str) -> str:
+    """Returns the URL of the DID Document for a did:web identifier."""
     if not did.startswith("did:web:"):
         raise ValueError("Only did:web is supported in MVP")
 
@@ -13,13 +30,157 @@ def resolve_did_web(did: str) -> dict[str, Any]:
     parts = did.split(":")
     domain = parts[2]
     path = "/".join(parts[3:]) if len(parts) > 3 else ".well-known"
+    return f"https://{domain}/{path}/did.json"
+
+
+def require_public_host(url: str) -> None:
+    """Raises ``ValueError`` unless every address of the URL's host is public."""
+    host = urlsplit(url).hostname or ""
+    try:
+        infos = socket.getaddrinfo(host, None)
+    except OSError as exc:
+        raise ValueError(f"Cannot resolve did:web host {host}: {exc}") from exc
+    for info in infos:
+        address = ipaddress.ip_address(str(info[4][0]).split("%")[0])
+        if not address.is_global or address.is_multicast:
+            raise ValueError(
+                f"did:web host {host} resolves to non-public address {address}"
+            )
+
+
+def cache_lifetime(headers: Mapping[str, str], default: float) -> float:
+    """Seconds a response may be reused for, per its HTTP cache headers.
+
+    ``no-store``/``no-cache`` disable reuse, ``max-age`` (or ``s-maxage``)
+    wins over ``Expires``; without either, ``default`` applies.
+    """
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0.0
+    match = _MAX_AGE.search(cache_control)
+    if match:
+        return float(match.group(1))
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            expires_at = parsedate_to_datetime(expires).timestamp()
+            date = headers.get("Date")
+            now = parsedate_to_datetime(date).timestamp() if date else time.time()
+        except (TypeError, ValueError):
+            return 0.0
+        return max(0.0, expires_at - now)
+    return default
+
+
+class DidResolver:
+    """Resolves did:web identifiers, caching documents and imported keys.
+
+    Documents are kept for the lifetime their HTTP cache headers allow
+    (``ttl`` seconds when they say nothing). Imported keys are cached by
+    (issuer, kid) for as long as the document they came from. Concurrent
+    lookups of the same DID share a single resolution.
+
+    Lookups with ``offline`` never fetch: they use cached documents, even
+    expired ones, and raise ``DidNotAvailable`` otherwise. With
+    ``public_only`` (for services resolving DIDs taken from untrusted
+    payloads) hosts resolving to private, loopback or otherwise non-public
+    addresses are refused and redirects are not followed.
+    """
 
-    url = f"https://{domain}/{path}/did.json"
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        session: requests.Session | None = None,
+        public_only: bool = False,
+    ) -> None:
+        self.ttl = ttl
+        self.session = session
+        self.public_only = public_only
+        self.resolutions = 0
+        self._documents: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._keys: dict[tuple[str, Optional[str]], tuple[float, Any]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
 
-    did_doc: dict[str, Any] = response.json()
-    return did_doc
+    def _fetch(self, did: str) -> tuple[dict[str, Any], float]:
+        if self.session is None:
+            from opendpp.fetch.http import default_fetcher
+
+            self.session = default_fetcher().session
+        url = did_web_url(did)
+        if self.public_only:
+            require_public_host(url)
+        response = self.session.get(
+            url, timeout=10, allow_redirects=not self.public_only
+        )
+        response.raise_for_status()
+        did_doc: dict[str, Any] = response.json()
+        return did_doc, cache_lifetime(response.headers, self.ttl)
+
+    def _did_lock(self, did: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(did, threading.Lock())
+
+    def _entry(self, did: str, offline: bool = False) -> tuple[float, dict[str, Any]]:
+        cached = self._documents.get(did)
+        if cached and (offline or cached[0] > time.monotonic()):
+            return cached
+        if offline:
+            raise DidNotAvailable(f"DID Document not available offline: {did}")
+        with self._did_lock(did):
+            cached = self._documents.get(did)
+            if cached and cached[0] > time.monotonic():
+                return cached
+            did_doc, lifetime = self._fetch(did)
+            self.resolutions += 1
+            entry = (time.monotonic() + lifetime, did_doc)
+            self._documents[did] = entry
+            return entry
+
+    def resolve(self, did: str, offline: bool = False) -> dict[str, Any]:
+        """Returns the DID Document, fetching it only when the cached one expired."""
+        return self._entry(did, offline)[1]
+
+    def verification_key(
+        self, did: str, kid: Optional[str] = None, offline: bool = False
+    ) -> Any:
+        """Returns the imported public key of ``did`` matching ``kid``."""
+        from joserfc import jwk
+
+        cached = self._keys.get((did, kid))
+        if cached and (offline or cached[0] > time.monotonic()):
+            return cached[1]
+        expires_at, did_doc = self._entry(did, offline)
+        public_key_jwk = get_verification_key(did_doc, kid).get("publicKeyJwk")
+        if not public_key_jwk:
+            raise ValueError("No publicKeyJwk found in verification method")
+        key = jwk.import_key(public_key_jwk)
+        self._keys[(did, kid)] = (expires_at, key)
+        return key
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+            self._keys.clear()
+            self.resolutions = 0
+
+
+_DEFAULT_RESOLVER: DidResolver | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_did_resolver() -> DidResolver:
+    """Returns the process-wide resolver, sharing its document and key caches."""
+    global _DEFAULT_RESOLVER
+    with _DEFAULT_LOCK:
+        if _DEFAULT_RESOLVER is None:
+            _DEFAULT_RESOLVER = DidResolver()
+        return _DEFAULT_RESOLVER
+
+
+def resolve_did_web(did: str) -> dict[str, Any]:
+    """Resolves did:web to a DID Document."""
+    return default_did_resolver().resolve(did)
 
 
 def get_verification_key(
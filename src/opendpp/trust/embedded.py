@@ -0,0 +1,75 @@
+"""Discovery of VC-JWTs embedded in JSON payloads.
+
+Kept apart from ``jwt_vc`` so that scanning payloads for credentials does
+not import the JOSE and DID resolution stacks.
+"""
+
+import base64
+import json
+import re
+from typing import Any, Iterator, List
+
+from opendpp.core.artifact import Artifact, ArtifactType
+
+_COMPACT_JWS = re.compile(r"^[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]+$")
+
+
+def _b64url_decode(data: str) -> bytes:
+    padded = data + "=" * (-len(data) % 4)
+    return base64.urlsafe_b64decode(padded.encode("utf-8"))
+
+
+def peek_jwt(token: str) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Returns the header and claims of a compact JWT without verifying it."""
+    parts = token.split(".")
+    if len(parts) < 2:
+        raise ValueError("Invalid JWT format")
+    header = json.loads(_b64url_decode(parts[0]))
+    claims = json.loads(_b64url_decode(parts[1]))
+    return header, claims
+
+
+def _walk_strings(data: Any, pointer: str = "") -> Iterator[tuple[str, str]]:
+    if isinstance(data, str):
+        yield pointer, data
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            escaped = str(key).replace("~", "~0").replace("/", "~1")
+            yield from _walk_strings(value, f"{pointer}/{escaped}")
+    elif isinstance(data, list):
+        for index, value in enumerate(data):
+            yield from _walk_strings(value, f"{pointer}/{index}")
+
+
+def embedded_credentials(artifact: Artifact) -> List[Artifact]:
+    """Extracts VC-JWTs embedded as string values of a JSON payload.
+
+    A string counts as a credential when it is a compact JWS whose claims
+    carry a ``vc`` member. Each one becomes a ``VC_JWT`` artifact addressed
+    by the JSON pointer of its location.
+    """
+    try:
+        data = artifact.parsed_json()
+    except ValueError:
+        return []
+
+    credentials: List[Artifact] = []
+    for pointer, value in _walk_strings(data):
+        if not _COMPACT_JWS.match(value):
+            continue
+        try:
+            _, claims = peek_jwt(value)
+        except ValueError:
+            continue
+        if not isinstance(claims, dict) or "vc" not in claims:
+            continue
+        credentials.append(
+            Artifact.from_bytes(
+                uri=f"{artifact.uri}#{pointer}",
+                content_type="application/vc+jwt",
+                artifact_type=ArtifactType.VC_JWT,
+                raw_bytes=value.encode("utf-8"),
+                metadata={"embedded_in": artifact.sha256},
+            )
+        )
+    return credentials
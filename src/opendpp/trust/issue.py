@@ -8,6 +8,7 @@ from typing import Any, Dict
 from joserfc import jwk, jwt
 
 from opendpp.core.report import ConformanceReport
+from opendpp.core.store import ArtifactStore
 
 
 def _utc_now_ts() -> int:
@@ -15,7 +16,7 @@ def _utc_now_ts() -> int:
 
 
 def _report_digest(report: ConformanceReport) -> str:
-    payload = json.dumps(report.model_dump(), sort_keys=True)
+    payload = json.dumps(report.model_dump(mode="json"), sort_keys=True)
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
@@ -25,7 +26,20 @@ def issue_vc_jwt(
     jwk_data: Dict[str, Any],
     alg: str = "ES256",
     kid: str | None = None,
+    artifact_store: ArtifactStore | None = None,
 ) -> tuple[str, Dict[str, Any]]:
+    """Issues a VC-JWT attesting a report and the artifacts it covers.
+
+    With an ``artifact_store``, every artifact hash in the report must
+    resolve to intact stored bytes, or ``ValueError`` is raised.
+    """
+    if artifact_store is not None:
+        for artifact in report.artifacts:
+            if artifact_store.get(artifact.sha256) is None:
+                raise ValueError(
+                    f"Artifact {artifact.sha256} ({artifact.uri}) "
+                    "is not in the artifact store"
+                )
     key = jwk.import_key(jwk_data)
     effective_kid = kid if kid else getattr(key, "kid", None)
 
@@ -1,67 +1,156 @@
-import base64
-import json
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
 
 from joserfc import jwt
-from joserfc import jwk
 
 from opendpp.core.artifact import Artifact
 from opendpp.core.report import ConformanceReport, Severity
-from opendpp.trust.did import resolve_did_web, get_verification_key
+from opendpp.trust.did import DidNotAvailable, DidResolver, default_did_resolver
+from opendpp.trust.embedded import peek_jwt
 
 
-def _b64url_decode(data: str) -> bytes:
-    padded = data + "=" * (-len(data) % 4)
-    return base64.urlsafe_b64decode(padded.encode("utf-8"))
+def _decode(token: str, key: Any, alg: Optional[str]) -> Dict[str, Any]:
+    result = jwt.decode(token, key, algorithms=[alg] if alg else None)
+    return dict(result.claims)
 
 
-def _peek_jwt_header_and_claims(token: str) -> tuple[dict[str, Any], dict[str, Any]]:
-    parts = token.split(".")
-    if len(parts) < 2:
-        raise ValueError("Invalid JWT format")
-    header = json.loads(_b64url_decode(parts[0]))
-    claims = json.loads(_b64url_decode(parts[1]))
-    return header, claims
+def _record(
+    artifact: Artifact,
+    report: ConformanceReport,
+    iss: Optional[str],
+    error: Optional[Exception],
+) -> None:
+    if error is None:
+        report.add_finding(
+            rule_id="TRUST-VC-JWT-01",
+            severity=Severity.INFO,
+            message=f"VC-JWT signature verified successfully for issuer {iss}",
+            evidence={"artifact_hash": artifact.sha256, "issuer": iss},
+        )
+    elif isinstance(error, DidNotAvailable):
+        report.add_finding(
+            rule_id="TRUST-VC-JWT-02",
+            severity=Severity.WARNING,
+            message=f"VC-JWT not verified: {str(error)}",
+            evidence={"artifact_hash": artifact.sha256, "issuer": iss},
+        )
+    else:
+        report.add_finding(
+            rule_id="TRUST-VC-JWT-ERR",
+            severity=Severity.ERROR,
+            message=f"VC-JWT verification failed: {str(error)}",
+            evidence={"artifact_hash": artifact.sha256},
+        )
 
 
 def verify_vc_jwt(
-    artifact: Artifact, report: ConformanceReport
+    artifact: Artifact,
+    report: ConformanceReport,
+    resolver: Optional[DidResolver] = None,
+    offline: bool = False,
 ) -> Optional[Dict[str, Any]]:
-    """Verifies a VC secured as a JWT (RFC 7519 / W3C VC JOSE)."""
-    try:
-        token = artifact.raw_bytes.decode("utf-8")
+    """Verifies a VC secured as a JWT (RFC 7519 / W3C VC JOSE).
 
-        header, claims = _peek_jwt_header_and_claims(token)
-        kid = header.get("kid")
-        alg = header.get("alg")
+    With ``offline``, issuers whose DID Document is not cached are reported
+    with a ``TRUST-VC-JWT-02`` warning instead of being fetched.
+    """
+    resolver = resolver or default_did_resolver()
+    iss: Optional[str] = None
+    try:
+        token = str(artifact.raw_bytes, "utf-8").strip()
 
+        header, claims = peek_jwt(token)
         iss = claims.get("iss")
         if not iss:
             raise ValueError("Missing 'iss' claim in JWT")
 
-        did_doc = resolve_did_web(iss)
-        vm = get_verification_key(did_doc, kid)
-        public_key_jwk = vm.get("publicKeyJwk")
-        if not public_key_jwk:
-            raise ValueError("No publicKeyJwk found in verification method")
-        public_key = jwk.import_key(public_key_jwk)
+        key = resolver.verification_key(iss, header.get("kid"), offline)
+        verified = _decode(token, key, header.get("alg"))
+    except Exception as e:
+        _record(artifact, report, iss, e)
+        return None
+    _record(artifact, report, iss, None)
+    return verified
+
 
-        result = jwt.decode(token, public_key, algorithms=[alg] if alg else None)
+def verify_vc_jwts(
+    artifacts: Sequence[Artifact],
+    report: ConformanceReport,
+    resolver: Optional[DidResolver] = None,
+    allowed_issuers: Sequence[str] = (),
+    max_workers: int = 8,
+    offline: bool = False,
+) -> List[Optional[Dict[str, Any]]]:
+    """Verifies many VC-JWTs, resolving each issuer's keys only once.
 
-        report.add_finding(
-            rule_id="TRUST-VC-JWT-01",
-            severity=Severity.INFO,
-            message=f"VC-JWT signature verified successfully for issuer {iss}",
-            evidence={"artifact_hash": artifact.sha256, "issuer": iss},
-        )
+    Tokens are grouped by (issuer, kid); every group's key is resolved once,
+    in parallel across issuers, before the signatures are checked on a
+    thread pool. Findings are recorded in input order, and credentials from
+    issuers outside a non-empty ``allowed_issuers`` fail with
+    ``TRUST-ISSUER-01``. ``offline`` is passed on to the resolver, as in
+    ``verify_vc_jwt``.
+    """
+    resolver = resolver or default_did_resolver()
 
-        return result.claims
+    tokens: List[Optional[tuple[str, Optional[str], Optional[str], Optional[str]]]] = []
+    errors: Dict[int, Exception] = {}
+    for index, artifact in enumerate(artifacts):
+        try:
+            token = str(artifact.raw_bytes, "utf-8").strip()
+            header, claims = peek_jwt(token)
+            iss = claims.get("iss")
+            if not iss:
+                raise ValueError("Missing 'iss' claim in JWT")
+            tokens.append((token, iss, header.get("kid"), header.get("alg")))
+        except Exception as exc:
+            tokens.append(None)
+            errors[index] = exc
 
-    except Exception as e:
-        report.add_finding(
-            rule_id="TRUST-VC-JWT-ERR",
-            severity=Severity.ERROR,
-            message=f"VC-JWT verification failed: {str(e)}",
-            evidence={"artifact_hash": artifact.sha256},
-        )
-        return None
+    groups = list(
+        dict.fromkeys((entry[1], entry[2]) for entry in tokens if entry is not None)
+    )
+    keys: Dict[tuple[Optional[str], Optional[str]], Any] = {}
+
+    def _resolve(group: tuple[Any, Any]) -> Any:
+        try:
+            return resolver.verification_key(*group, offline=offline)
+        except Exception as exc:
+            return exc
+
+    def _verify(entry: Any) -> Any:
+        token, iss, kid, alg = entry
+        key = keys[(iss, kid)]
+        if isinstance(key, Exception):
+            return key
+        try:
+            return _decode(token, key, alg)
+        except Exception as exc:
+            return exc
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(artifacts)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        keys.update(zip(groups, executor.map(_resolve, groups)))
+        pending = [(i, entry) for i, entry in enumerate(tokens) if entry is not None]
+        outcomes = executor.map(_verify, [entry for _, entry in pending])
+        for (index, _), outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                errors[index] = outcome
+            else:
+                results[index] = outcome
+
+    for index, artifact in enumerate(artifacts):
+        entry = tokens[index]
+        iss = entry[1] if entry else None
+        _record(artifact, report, iss, errors.get(index))
+        if (
+            results[index] is not None
+            and allowed_issuers
+            and iss not in allowed_issuers
+        ):
+            report.add_finding(
+                rule_id="TRUST-ISSUER-01",
+                severity=Severity.ERROR,
+                message=f"Issuer {iss} is not allowed by the profile",
+                evidence={"artifact_hash": artifact.sha256, "issuer": iss},
+            )
+    return results
@@ -1,38 +1,220 @@
-import json
+"""Maps AAS environments to RDF for SHACL validation.
 
-from rdflib import Graph, Literal, Namespace, URIRef
-from rdflib.namespace import RDF
+The mapping is a flat rendering of the AAS metamodel in the ``aas:``
+namespace: shells, submodels, concept descriptions and submodel elements
+become nodes typed with their metamodel class, attributes become
+``aas:<attribute>`` properties and element values keep their ``xs:``
+datatype. Node IRIs are derived from ids and idShort paths, so the same
+environment always maps to the same graph.
+"""
+
+from __future__ import annotations
 
-from aas_core3 import jsonization as aas_json
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional, Tuple, Union
+from urllib.parse import quote
+
+from aas_core3 import types as aas_types
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.namespace import RDF, XSD
+from rdflib.term import Node
 
 from opendpp.core.artifact import Artifact
-from opendpp.core.codec import decode_json_bytes
 
 AAS = Namespace("https://admin-shell.io/aas/3/0/")
 
+Triple = Tuple[Node, Node, Node]
 
-def aas_to_rdf(artifact: Artifact) -> Graph:
-    """Converts a subset of AAS environment to RDF for validation."""
-    # Pragmatic approach: extract key IDs and Submodel structure
-    env = aas_json.environment_from_jsonable(
-        json.loads(decode_json_bytes(artifact.raw_bytes))
-    )
-    g = Graph()
-    g.bind("aas", AAS)
 
-    if env.asset_administration_shells:
-        for shell in env.asset_administration_shells:
-            if shell.id:
-                shell_uri = URIRef(f"shell:{shell.id}")
-                g.add((shell_uri, RDF.type, AAS.AssetAdministrationShell))
-                g.add((shell_uri, AAS.id, Literal(shell.id)))
-
-    if env.submodels:
-        for submodel in env.submodels:
-            if submodel.id:
-                sm_uri = URIRef(f"submodel:{submodel.id}")
-                g.add((sm_uri, RDF.type, AAS.Submodel))
-                g.add((sm_uri, AAS.id, Literal(submodel.id)))
-                # Further mapping of SubmodelElements could go here
+class _Terms:
+    """``aas:`` terms, each resolved once (``Namespace`` lookups are slow)."""
+
+    def __getattr__(self, name: str) -> URIRef:
+        term = AAS[name]
+        setattr(self, name, term)
+        return term
+
+
+_AAS: Any = _Terms()
+_TYPE = RDF.type
+
+# Literals are immutable, and idShorts, semanticIds and values repeat a lot
+# in large environments.
+_literal = lru_cache(maxsize=65536)(Literal)
+
+
+@lru_cache(maxsize=65536)
+def _typed(value: str, datatype: URIRef) -> Literal:
+    return Literal(value, datatype=datatype)
+
+
+@lru_cache(maxsize=None)
+def _datatype(value_type: aas_types.DataTypeDefXSD) -> URIRef:
+    return XSD[value_type.value.split(":", 1)[1]]
+
+
+def _reference(reference: Optional[aas_types.Reference]) -> Optional[Literal]:
+    """Renders a reference as the value of its last key."""
+    if reference is None or not reference.keys:
+        return None
+    return _literal(reference.keys[-1].value)
+
 
+@lru_cache(maxsize=65536)
+def _node(kind: str, identifier: str) -> URIRef:
+    """IRI of an identifiable; ids may hold spaces and other non-IRI text."""
+    return URIRef(f"{kind}:{quote(identifier, safe=':/#')}")
+
+
+def _child(node: URIRef, part: str) -> URIRef:
+    return URIRef(f"{node}/{quote(part, safe='')}")
+
+
+def _children(
+    node: URIRef,
+    predicate: URIRef,
+    elements: Optional[Iterable[aas_types.SubmodelElement]],
+    indexed: bool = False,
+) -> Iterator[Triple]:
+    for index, element in enumerate(elements or ()):
+        part = str(index) if indexed or not element.id_short else element.id_short
+        child = _child(node, part)
+        yield node, predicate, child
+        if indexed:
+            yield child, _AAS.index, _literal(index)
+        yield from _element_triples(element, child)
+
+
+def _element_triples(
+    element: aas_types.SubmodelElement, node: URIRef
+) -> Iterator[Triple]:
+    yield node, _TYPE, getattr(_AAS, type(element).__name__)
+    yield node, _TYPE, _AAS.SubmodelElement
+    if element.id_short:
+        yield node, _AAS.idShort, _literal(element.id_short)
+    semantic_id = _reference(element.semantic_id)
+    if semantic_id is not None:
+        yield node, _AAS.semanticId, semantic_id
+
+    if isinstance(element, aas_types.Property):
+        yield node, _AAS.valueType, _literal(element.value_type.value)
+        if element.value is not None:
+            datatype = _datatype(element.value_type)
+            yield node, _AAS.value, _typed(element.value, datatype)
+        value_id = _reference(element.value_id)
+        if value_id is not None:
+            yield node, _AAS.valueId, value_id
+    elif isinstance(element, aas_types.MultiLanguageProperty):
+        for text in element.value or ():
+            yield node, _AAS.value, Literal(text.text, lang=text.language)
+    elif isinstance(element, aas_types.Range):
+        datatype = _datatype(element.value_type)
+        yield node, _AAS.valueType, _literal(element.value_type.value)
+        if element.min is not None:
+            yield node, _AAS.min, _typed(element.min, datatype)
+        if element.max is not None:
+            yield node, _AAS.max, _typed(element.max, datatype)
+    elif isinstance(element, (aas_types.File, aas_types.Blob)):
+        if element.content_type is not None:
+            yield node, _AAS.contentType, _literal(element.content_type)
+        if isinstance(element, aas_types.File) and element.value is not None:
+            yield node, _AAS.value, _literal(element.value)
+    elif isinstance(element, aas_types.ReferenceElement):
+        value = _reference(element.value)
+        if value is not None:
+            yield node, _AAS.value, value
+    elif isinstance(element, aas_types.RelationshipElement):
+        for predicate, reference in (
+            (_AAS.first, element.first),
+            (_AAS.second, element.second),
+        ):
+            value = _reference(reference)
+            if value is not None:
+                yield node, predicate, value
+        if isinstance(element, aas_types.AnnotatedRelationshipElement):
+            yield from _children(node, _AAS.annotation, element.annotations)
+    elif isinstance(element, aas_types.SubmodelElementCollection):
+        yield from _children(node, _AAS.value, element.value)
+    elif isinstance(element, aas_types.SubmodelElementList):
+        yield (
+            node,
+            _AAS.typeValueListElement,
+            _literal(element.type_value_list_element.value),
+        )
+        if element.value_type_list_element is not None:
+            yield (
+                node,
+                _AAS.valueTypeListElement,
+                _literal(element.value_type_list_element.value),
+            )
+        list_semantic_id = _reference(element.semantic_id_list_element)
+        if list_semantic_id is not None:
+            yield node, _AAS.semanticIdListElement, list_semantic_id
+        yield from _children(node, _AAS.value, element.value, indexed=True)
+    elif isinstance(element, aas_types.Entity):
+        yield node, _AAS.entityType, _literal(element.entity_type.value)
+        if element.global_asset_id is not None:
+            yield node, _AAS.globalAssetId, _literal(element.global_asset_id)
+        yield from _children(node, _AAS.statement, element.statements)
+    elif isinstance(element, aas_types.Operation):
+        for predicate, variables in (
+            (_AAS.inputVariable, element.input_variables),
+            (_AAS.outputVariable, element.output_variables),
+            (_AAS.inoutputVariable, element.inoutput_variables),
+        ):
+            yield from _children(node, predicate, [v.value for v in variables or ()])
+    elif isinstance(element, aas_types.BasicEventElement):
+        observed = _reference(element.observed)
+        if observed is not None:
+            yield node, _AAS.observed, observed
+
+
+def aas_triples(environment: aas_types.Environment) -> Iterator[Triple]:
+    """Yields the RDF triples of an AAS environment."""
+    for shell in environment.asset_administration_shells or ():
+        node = _node("shell", shell.id)
+        yield node, _TYPE, _AAS.AssetAdministrationShell
+        yield node, _AAS.id, _literal(shell.id)
+        if shell.id_short:
+            yield node, _AAS.idShort, _literal(shell.id_short)
+        asset = shell.asset_information
+        yield node, _AAS.assetKind, _literal(asset.asset_kind.value)
+        if asset.global_asset_id is not None:
+            yield node, _AAS.globalAssetId, _literal(asset.global_asset_id)
+        for reference in shell.submodels or ():
+            if reference.keys:
+                submodel_node = _node("submodel", reference.keys[-1].value)
+                yield node, _AAS.submodel, submodel_node
+
+    for submodel in environment.submodels or ():
+        node = _node("submodel", submodel.id)
+        yield node, _TYPE, _AAS.Submodel
+        yield node, _AAS.id, _literal(submodel.id)
+        if submodel.id_short:
+            yield node, _AAS.idShort, _literal(submodel.id_short)
+        if submodel.kind is not None:
+            yield node, _AAS.kind, _literal(submodel.kind.value)
+        semantic_id = _reference(submodel.semantic_id)
+        if semantic_id is not None:
+            yield node, _AAS.semanticId, semantic_id
+        yield from _children(node, _AAS.submodelElement, submodel.submodel_elements)
+
+    for concept in environment.concept_descriptions or ():
+        node = _node("concept", concept.id)
+        yield node, _TYPE, _AAS.ConceptDescription
+        yield node, _AAS.id, _literal(concept.id)
+        if concept.id_short:
+            yield node, _AAS.idShort, _literal(concept.id_short)
+
+
+def aas_to_rdf(source: Union[Artifact, aas_types.Environment]) -> Graph:
+    """Converts an AAS environment, or an artifact holding one, to RDF.
+
+    Artifacts reuse their already parsed environment. Triples are inserted
+    in bulk with ``addN``.
+    """
+    environment = source.aas_environment() if isinstance(source, Artifact) else source
+    g = Graph()
+    g.bind("aas", AAS)
+    g.addN((s, p, o, g) for s, p, o in aas_triples(environment))
     return g
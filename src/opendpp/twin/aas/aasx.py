@@ -1,13 +1,59 @@
+from __future__ import annotations
+
 import hashlib
 import io
-import json
+import mmap
+import os
+import posixpath
+import struct
 import zipfile
-
-from aas_core3 import jsonization as aas_json
-from aas_core3 import types as aas_types
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterator, Union
+from xml.etree import ElementTree
 
 from opendpp.core.artifact import Artifact, ArtifactType
-from opendpp.core.codec import decode_json_bytes
+from opendpp.core.codec import Buffer
+
+if TYPE_CHECKING:
+    from aas_core3 import types as aas_types
+
+AasxSource = Union[Artifact, str, "os.PathLike[str]", Buffer]
+
+# IDTA Part 5 relationship types; packages from older tooling use the
+# "www." host.
+_ORIGIN_TYPES = {
+    "http://admin-shell.io/aasx/relationships/aasx-origin",
+    "http://www.admin-shell.io/aasx/relationships/aasx-origin",
+}
+_SPEC_TYPES = {
+    "http://admin-shell.io/aasx/relationships/aas-spec",
+    "http://www.admin-shell.io/aasx/relationships/aas-spec",
+}
+_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CHUNK_SIZE = 1024 * 1024
+_LOCAL_HEADER = b"PK\x03\x04"
+_LOCAL_HEADER_SIZE = 30
+
+
+class AasxLimitExceeded(ValueError):
+    """Raised when a package exceeds the configured extraction limits."""
+
+
+@dataclass(frozen=True)
+class AasxLimits:
+    """Bounds applied to a package, nested packages included.
+
+    Entry counts and sizes are checked against the central directory before
+    any member is decompressed; reads never go past the declared size.
+    """
+
+    max_entries: int = 10_000
+    max_total_size: int = 2 * 1024**3
+    max_entry_size: int = 512 * 1024**2
+    max_ratio: int = 200
+    max_depth: int = 3
 
 
 def parse_aas_json(artifact: Artifact) -> aas_types.Environment:
@@ -15,41 +61,263 @@ def parse_aas_json(artifact: Artifact) -> aas_types.Environment:
     if artifact.artifact_type != ArtifactType.AAS_PAYLOAD:
         raise ValueError("Artifact is not AAS JSON")
 
-    data = json.loads(decode_json_bytes(artifact.raw_bytes))
-    environment = aas_json.environment_from_jsonable(data)
-    return environment
-
-
-def extract_aasx(artifact: Artifact) -> list[Artifact]:
-    """Extracts artifacts from an AASX package."""
-    if artifact.artifact_type != ArtifactType.AASX_PACKAGE:
-        raise ValueError("Artifact is not AASX")
-
-    extracted_artifacts: list[Artifact] = []
-    with zipfile.ZipFile(io.BytesIO(artifact.raw_bytes)) as z:
-        for name in z.namelist():
-            # IDTA Part 5: look for environment files (usually .json or .xml)
-            if name.endswith((".json", ".xml", ".aasx")):
-                content = z.read(name)
-                sha256 = hashlib.sha256(content).hexdigest()
-                # Map to specific artifact type
-                atype = (
-                    ArtifactType.AAS_PAYLOAD
-                    if name.endswith((".json", ".xml"))
-                    else ArtifactType.AASX_PACKAGE
-                )
-                extracted_artifacts.append(
+    return artifact.aas_environment()
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only file over a buffer, without copying it."""
+
+    def __init__(self, buffer: Buffer) -> None:
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}
+        self._pos = max(0, base[whence] + offset)
+        return self._pos
+
+    def readinto(self, target: Any) -> int:
+        chunk = self._view[self._pos : self._pos + len(target)]
+        target[: len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def close(self) -> None:
+        self._view.release()
+        super().close()
+
+
+def _open_source(source: AasxSource) -> tuple[IO[bytes], str, Buffer | None]:
+    """Opens a package; buffer-backed packages also return their buffer."""
+    if isinstance(source, Artifact):
+        if source.artifact_type != ArtifactType.AASX_PACKAGE:
+            raise ValueError("Artifact is not AASX")
+        buffer = source.raw_bytes
+        return io.BufferedReader(_BufferReader(buffer)), source.uri, buffer
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return io.BufferedReader(_BufferReader(source)), "buffer", source
+    path = Path(source)
+    return path.open("rb"), str(path), None
+
+
+def _check_limits(
+    package: zipfile.ZipFile, limits: AasxLimits, budget: list[int]
+) -> None:
+    infos = package.infolist()
+    budget[0] -= len(infos)
+    if budget[0] < 0:
+        raise AasxLimitExceeded(f"Package has more than {limits.max_entries} entries")
+    for info in infos:
+        if info.file_size > limits.max_entry_size:
+            raise AasxLimitExceeded(
+                f"Entry {info.filename} declares {info.file_size} bytes "
+                f"(limit {limits.max_entry_size})"
+            )
+        if (
+            info.compress_size
+            and info.file_size / info.compress_size > limits.max_ratio
+        ):
+            raise AasxLimitExceeded(
+                f"Entry {info.filename} exceeds compression ratio {limits.max_ratio}"
+            )
+        budget[1] -= info.file_size
+    if budget[1] < 0:
+        raise AasxLimitExceeded(
+            f"Package declares more than {limits.max_total_size} uncompressed bytes"
+        )
+
+
+def _relationships(package: zipfile.ZipFile, part: str) -> Iterator[tuple[str, str]]:
+    """Yields (type, target part name) of the relationships of ``part``."""
+    directory, name = posixpath.split(part)
+    rels_name = posixpath.join(directory, "_rels", f"{name}.rels")
+    try:
+        root = ElementTree.fromstring(package.read(rels_name))
+    except (KeyError, ElementTree.ParseError):
+        return
+    for rel in root.iter(f"{_RELS_NS}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        yield rel.get("Type", ""), target
+
+
+def _environment_parts(package: zipfile.ZipFile) -> tuple[list[str], str]:
+    """Selects environment parts via ``aasx-origin`` -> ``aas-spec``.
+
+    Packages without OPC relationships fall back to every JSON/XML member
+    outside the package metadata.
+    """
+    names = set(package.namelist())
+    parts: list[str] = []
+    for rel_type, origin in _relationships(package, ""):
+        if rel_type in _ORIGIN_TYPES:
+            for spec_type, target in _relationships(package, origin):
+                if spec_type in _SPEC_TYPES and target in names:
+                    parts.append(target)
+    if parts:
+        return parts, "opc"
+    return [
+        name
+        for name in package.namelist()
+        if name.lower().endswith((".json", ".xml"))
+        and name != "[Content_Types].xml"
+        and "_rels/" not in name
+    ], "suffix"
+
+
+def _stored_member(source: Buffer, info: zipfile.ZipInfo) -> memoryview | None:
+    """Returns a stored (uncompressed) member as a view into the package.
+
+    Returns ``None`` when the member has to be read through ``zipfile``:
+    it is compressed or encrypted, or its local header looks wrong.
+    """
+    if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+        return None
+    view = memoryview(source).toreadonly()
+    offset = info.header_offset
+    if bytes(view[offset : offset + 4]) != _LOCAL_HEADER:
+        return None
+    name_length, extra_length = struct.unpack_from("<HH", view, offset + 26)
+    start = offset + _LOCAL_HEADER_SIZE + name_length + extra_length
+    member = view[start : start + info.file_size]
+    if len(member) != info.file_size:
+        return None
+    if zlib.crc32(member) != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+    return member
+
+
+def _read_member(
+    package: zipfile.ZipFile, info: zipfile.ZipInfo, source: Buffer | None = None
+) -> tuple[Buffer, str]:
+    """Reads a member without intermediate copies, hashing as it goes.
+
+    Stored members of a buffer-backed package are views into it; others are
+    decompressed in chunks straight into one buffer of the declared size.
+    """
+    if source is not None:
+        stored = _stored_member(source, info)
+        if stored is not None:
+            return stored, hashlib.sha256(stored).hexdigest()
+    digest = hashlib.sha256()
+    buffer = bytearray(info.file_size)
+    filled = 0
+    # ZipExtFile stops at the declared size, so the limit checks hold.
+    with package.open(info) as member, memoryview(buffer) as view:
+        while filled < len(buffer):
+            chunk = member.read(min(_CHUNK_SIZE, len(buffer) - filled))
+            if not chunk:
+                break
+            digest.update(chunk)
+            view[filled : filled + len(chunk)] = chunk
+            filled += len(chunk)
+        member.read(1)  # reach the end of the stream so the CRC is checked
+    del buffer[filled:]
+    return buffer, digest.hexdigest()
+
+
+def _extract(
+    source: AasxSource,
+    limits: AasxLimits,
+    budget: list[int],
+    depth: int,
+    uri: str | None = None,
+) -> list[Artifact]:
+    handle, default_uri, buffer = _open_source(source)
+    uri = uri or default_uri
+    extracted: list[Artifact] = []
+    try:
+        with zipfile.ZipFile(handle) as package:
+            _check_limits(package, limits, budget)
+            parts, selection = _environment_parts(package)
+            nested = [
+                name for name in package.namelist() if name.lower().endswith(".aasx")
+            ]
+            for name in parts:
+                content, sha256 = _read_member(package, package.getinfo(name), buffer)
+                extracted.append(
                     Artifact(
-                        uri=f"{artifact.uri}#{name}",
+                        uri=f"{uri}#{name}",
                         content_type=(
                             "application/json"
-                            if name.endswith(".json")
+                            if name.lower().endswith(".json")
                             else "application/xml"
                         ),
-                        artifact_type=atype,
+                        artifact_type=ArtifactType.AAS_PAYLOAD,
+                        raw_bytes=content,
+                        sha256=sha256,
+                        metadata={"filename": name, "selection": selection},
+                    )
+                )
+            for name in package.namelist():
+                if not name.lower().endswith(".jwt"):
+                    continue
+                content, sha256 = _read_member(package, package.getinfo(name), buffer)
+                extracted.append(
+                    Artifact(
+                        uri=f"{uri}#{name}",
+                        content_type="application/vc+jwt",
+                        artifact_type=ArtifactType.VC_JWT,
                         raw_bytes=content,
                         sha256=sha256,
                         metadata={"filename": name},
                     )
                 )
-    return extracted_artifacts
+            for name in nested:
+                if depth + 1 > limits.max_depth:
+                    raise AasxLimitExceeded(
+                        f"Nested package {name} exceeds depth {limits.max_depth}"
+                    )
+                content, sha256 = _read_member(package, package.getinfo(name), buffer)
+                nested_uri = f"{uri}#{name}"
+                extracted.append(
+                    Artifact(
+                        uri=nested_uri,
+                        content_type="application/asset-administration-shell-package",
+                        artifact_type=ArtifactType.AASX_PACKAGE,
+                        raw_bytes=content,
+                        sha256=sha256,
+                        metadata={"filename": name, "depth": depth + 1},
+                    )
+                )
+                extracted.extend(
+                    _extract(content, limits, budget, depth + 1, nested_uri)
+                )
+    finally:
+        handle.close()
+    return extracted
+
+
+def extract_aasx(
+    source: AasxSource, limits: AasxLimits | None = None
+) -> list[Artifact]:
+    """Extracts the AAS environments of an AASX package.
+
+    ``source`` is an AASX artifact, a file path, or a bytes/mmap buffer, so
+    large packages need not be loaded into memory. Members of buffer-backed
+    packages that are stored uncompressed are returned as views into the
+    package instead of copies. Only the parts reached
+    through the ``aasx-origin`` and ``aas-spec`` relationships are read;
+    supplementary files such as CAD models and PDFs are never decompressed.
+    Credentials packaged as ``.jwt`` members are returned as ``VC_JWT``
+    artifacts. Nested ``.aasx`` members are extracted recursively up to
+    ``limits.max_depth``. Raises ``AasxLimitExceeded`` for packages over the
+    limits and ``zipfile.BadZipFile`` for corrupt ones.
+    """
+    limits = limits or AasxLimits()
+    budget = [limits.max_entries, limits.max_total_size]
+    return _extract(source, limits, budget, depth=0)
@@ -1,23 +1,100 @@
+from dataclasses import dataclass
+from typing import Any, Literal
+
 from pyshacl import validate
-from rdflib import Graph
+from rdflib import RDFS, Graph
 from opendpp.core.artifact import Artifact
 from opendpp.core.report import ConformanceReport, Severity
-from opendpp.normalize.jsonld import to_rdf_graph
+
+InferenceMode = Literal["auto", "none", "rdfs", "owlrl", "both"]
+
+# RDFS terms whose meaning only materialises through RDFS entailment. Shapes
+# mentioning them (as axioms, in property paths or as sh:class values) expect
+# subclass/subproperty reasoning; rdfs:label, rdfs:comment etc. do not.
+_REASONING_TERMS = frozenset(
+    {
+        RDFS.subClassOf,
+        RDFS.subPropertyOf,
+        RDFS.domain,
+        RDFS.range,
+        RDFS.Resource,
+        RDFS.Class,
+    }
+)
+_SCHEMA_AXIOMS = (RDFS.subClassOf, RDFS.subPropertyOf, RDFS.domain, RDFS.range)
+
+
+@dataclass(frozen=True)
+class CompiledShapes:
+    """A parsed shapes graph together with the inference it needs.
+
+    ``inference`` is the pyshacl inference option, or ``None`` to decide per
+    data graph (``auto`` without reasoning-dependent shapes).
+    """
+
+    graph: Graph
+    inference: str | None
+
+
+def parse_shapes(shapes_artifact: Artifact) -> Graph:
+    """Parses a Turtle shapes file into a graph."""
+    return Graph().parse(data=shapes_artifact.to_bytes(), format="turtle")
+
+
+def needs_rdfs_inference(shapes_graph: Graph) -> bool:
+    """Tells whether shapes depend on subclass or subproperty reasoning."""
+    for _, predicate, obj in shapes_graph:
+        if predicate in _REASONING_TERMS or obj in _REASONING_TERMS:
+            return True
+    return False
+
+
+def compile_shapes(
+    shapes_artifact: Artifact, inference: InferenceMode = "auto"
+) -> CompiledShapes:
+    """Parses and analyses a shapes file once for reuse across payloads."""
+    graph = parse_shapes(shapes_artifact)
+    if inference != "auto":
+        return CompiledShapes(graph=graph, inference=inference)
+    return CompiledShapes(
+        graph=graph, inference="rdfs" if needs_rdfs_inference(graph) else None
+    )
+
+
+def _data_inference(data_graph: Graph) -> str:
+    # RDFS closure can only change the outcome when the data carries its own
+    # schema axioms; otherwise it just adds rdf:type rdfs:Resource noise.
+    for predicate in _SCHEMA_AXIOMS:
+        if (None, predicate, None) in data_graph:
+            return "rdfs"
+    return "none"
 
 
 def validate_shacl(
-    artifact: Artifact, shapes_artifact: Artifact, report: ConformanceReport
+    artifact: Artifact,
+    shapes_artifact: Artifact,
+    report: ConformanceReport,
+    shapes: CompiledShapes | None = None,
+    document_loader: Any = None,
+    data_graph: Graph | None = None,
 ) -> None:
-    """Validates an RDF graph against SHACL shapes."""
+    """Validates an RDF graph against SHACL shapes.
+
+    ``shapes`` may carry an already compiled copy of ``shapes_artifact``;
+    ``document_loader`` resolves JSON-LD contexts of the payload. An
+    in-memory ``data_graph`` is validated as is, with ``artifact`` only
+    identifying it in findings.
+    """
     try:
-        data_graph = to_rdf_graph(artifact)
-        shapes_graph = Graph().parse(data=shapes_artifact.raw_bytes, format="turtle")
+        if data_graph is None:
+            data_graph = artifact.rdf_graph(document_loader)
+        if shapes is None:
+            shapes = compile_shapes(shapes_artifact)
 
-        conforms, results_graph, results_text = validate(
+        conforms, _, results_text = validate(
             data_graph,
-            shacl_graph=shapes_graph,
-            inference="rdfs",
-            serialize_report_graph=True,
+            shacl_graph=shapes.graph,
+            inference=shapes.inference or _data_inference(data_graph),
         )
 
         if not conforms:
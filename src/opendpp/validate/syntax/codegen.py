@@ -0,0 +1,515 @@
+"""Code-generating JSON Schema backend.
+
+Compiles a schema into specialised Python validation functions, in the style
+of fastjsonschema, that report the same errors (message, location and order)
+as the interpreted ``jsonschema`` validators. Only the keywords listed in
+``_SUPPORTED`` are compiled; any other validation keyword raises
+``UnsupportedSchema`` so callers can fall back to ``jsonschema``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from numbers import Number
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Sequence
+from urllib.parse import unquote
+
+import jsonschema
+
+from opendpp.core.cache import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+CODEGEN_VERSION = "1"
+
+_DRAFTS: dict[type, int] = {
+    jsonschema.Draft4Validator: 4,
+    jsonschema.Draft6Validator: 6,
+    jsonschema.Draft7Validator: 7,
+    jsonschema.Draft201909Validator: 2019,
+    jsonschema.Draft202012Validator: 2020,
+}
+
+_SUPPORTED = {
+    "$ref",
+    "type",
+    "properties",
+    "required",
+    "items",
+    "allOf",
+    "anyOf",
+    "enum",
+    "const",
+    "pattern",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "minLength",
+    "maxLength",
+    "minItems",
+    "maxItems",
+    "additionalProperties",
+    "format",
+}
+
+_TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, Number) and not isinstance({v}, bool))",
+}
+
+
+class UnsupportedSchema(ValueError):
+    """Raised when a schema uses features the code generator does not cover."""
+
+
+class _Invalid(Exception):
+    pass
+
+
+class _StopAtFirst:
+    """Error sink that aborts validation at the first error."""
+
+    __slots__ = ()
+
+    def append(self, item: Any) -> None:
+        raise _Invalid
+
+
+def _unbool(element: Any, true: Any = object(), false: Any = object()) -> Any:
+    if element is True:
+        return true
+    if element is False:
+        return false
+    return element
+
+
+def _equal(one: Any, two: Any) -> bool:
+    """JSON Schema equality (``True`` is not ``1``), as used by ``jsonschema``."""
+    if one is two:
+        return True
+    if isinstance(one, str) or isinstance(two, str):
+        return bool(one == two)
+    if isinstance(one, Sequence) and isinstance(two, Sequence):
+        return len(one) == len(two) and all(_equal(i, j) for i, j in zip(one, two))
+    if isinstance(one, Mapping) and isinstance(two, Mapping):
+        return len(one) == len(two) and all(
+            key in two and _equal(value, two[key]) for key, value in one.items()
+        )
+    return bool(_unbool(one) == _unbool(two))
+
+
+def _json_path(path: Any) -> str:
+    elements: list[Any] = []
+    while path is not None:
+        path, element = path
+        elements.append(element)
+    location = "$"
+    for element in reversed(elements):
+        if isinstance(element, int):
+            location += "[" + str(element) + "]"
+        else:
+            location += "." + element
+    return location
+
+
+class SchemaError:
+    """A validation error with the attributes ``validate_json_schema`` reads."""
+
+    __slots__ = ("json_path", "message")
+
+    def __init__(self, message: str, json_path: str) -> None:
+        self.message = message
+        self.json_path = json_path
+
+    @property
+    def path(self) -> list[Any]:
+        return []
+
+
+class _Generator:
+    def __init__(self, root: Any, draft: int, format_assertion: bool) -> None:
+        self.root = root
+        self.draft = draft
+        self.format_assertion = format_assertion
+        self.validator_keys = set(jsonschema.validators.validator_for(root).VALIDATORS)
+        self.constants: list[str] = []
+        self.functions: dict[str, str] = {}
+        self.queue: list[str] = []
+        self.counter = 0
+        self.sink = "errors"
+
+    def generate(self) -> str:
+        entry = self._function_for("#")
+        bodies: list[str] = []
+        while self.queue:
+            pointer = self.queue.pop(0)
+            bodies.append(self._function(pointer, self.functions[pointer]))
+        return "\n".join(
+            [
+                f"# Generated by {__name__} (version {CODEGEN_VERSION}); do not edit.",
+                *self.constants,
+                "",
+                *bodies,
+                f"validate = {entry}",
+                "",
+            ]
+        )
+
+    def _constant(self, literal: str) -> str:
+        name = f"_c{len(self.constants)}"
+        self.constants.append(f"{name} = {literal}")
+        return name
+
+    def _var(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def _function_for(self, ref: str) -> str:
+        if not ref.startswith("#"):
+            raise UnsupportedSchema(f"Non-local $ref not supported: {ref}")
+        if ref not in self.functions:
+            self.functions[ref] = f"_v{len(self.functions)}"
+            self.queue.append(ref)
+        return self.functions[ref]
+
+    def _resolve(self, ref: str) -> Any:
+        fragment = unquote(ref[1:])
+        node = self.root
+        if not fragment:
+            return node
+        if not fragment.startswith("/"):
+            raise UnsupportedSchema(f"Anchor $ref not supported: {ref}")
+        for token in fragment[1:].split("/"):
+            token = token.replace("~1", "/").replace("~0", "~")
+            if isinstance(node, list):
+                node = node[int(token)]
+            elif isinstance(node, dict) and token in node:
+                node = node[token]
+            else:
+                raise UnsupportedSchema(f"Unresolvable $ref: {ref}")
+        return node
+
+    def _function(self, pointer: str, name: str) -> str:
+        lines = [f"def {name}(data, path, errors):"]
+        self._schema(self._resolve(pointer), "data", "path", lines, 1, pointer == "#")
+        if len(lines) == 1:
+            lines.append("    pass")
+        return "\n".join(lines) + "\n"
+
+    def _error(self, out: list[str], pad: str, path: str, message: str) -> None:
+        out.append(f"{pad}{self.sink}.append(({path}, {message}))")
+
+    @staticmethod
+    def _drop_if_empty(out: list[str], start: int, header_lines: int) -> None:
+        if len(out) == start + header_lines:
+            del out[start:]
+
+    def _schema(
+        self,
+        schema: Any,
+        var: str,
+        path: str,
+        out: list[str],
+        level: int,
+        is_root: bool = False,
+    ) -> None:
+        pad = "    " * level
+        if schema is True:
+            return
+        if schema is False:
+            message = f"'False schema does not allow ' + repr({var})"
+            self._error(out, pad, path, message)
+            return
+        if not isinstance(schema, dict):
+            raise UnsupportedSchema(f"Invalid subschema: {schema!r}")
+        if not is_root and ("$id" in schema or (self.draft == 4 and "id" in schema)):
+            raise UnsupportedSchema("Nested $id is not supported")
+
+        if "$ref" in schema and self.draft <= 7:
+            keywords: Any = [("$ref", schema["$ref"])]
+        else:
+            keywords = schema.items()
+
+        for keyword, value in keywords:
+            if keyword not in self.validator_keys:
+                continue
+            if keyword not in _SUPPORTED:
+                raise UnsupportedSchema(f"Keyword not supported: {keyword}")
+            getattr(self, "_kw_" + keyword.lstrip("$"))(
+                value, schema, var, path, out, level
+            )
+
+    def _type_check(self, name: str, var: str) -> str:
+        if name == "integer":
+            check = f"(isinstance({var}, int) and not isinstance({var}, bool))"
+            if self.draft >= 6:
+                check = (
+                    f"({check} or (isinstance({var}, float) and {var}.is_integer()))"
+                )
+            return check
+        if name not in _TYPE_CHECKS:
+            raise UnsupportedSchema(f"Unknown type: {name!r}")
+        return _TYPE_CHECKS[name].format(v=var)
+
+    def _kw_ref(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        name = self._function_for(value)
+        out.append(f"{'    ' * level}{name}({var}, {path}, {self.sink})")
+
+    def _kw_type(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        types = [value] if isinstance(value, str) else list(value)
+        checks = " or ".join(self._type_check(t, var) for t in types) or "False"
+        suffix = repr(" is not of type " + ", ".join(repr(t) for t in types))
+        pad = "    " * level
+        out.append(f"{pad}if not ({checks}):")
+        self._error(out, pad + "    ", path, f"repr({var}) + {suffix}")
+
+    def _kw_properties(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        pad = "    " * level
+        start = len(out)
+        out.append(f"{pad}if isinstance({var}, dict):")
+        for name, subschema in value.items():
+            key = repr(name)
+            child = self._var("d")
+            mark = len(out)
+            out.append(f"{pad}    if {key} in {var}:")
+            out.append(f"{pad}        {child} = {var}[{key}]")
+            self._schema(subschema, child, f"({path}, {key})", out, level + 2)
+            self._drop_if_empty(out, mark, 2)
+        self._drop_if_empty(out, start, 1)
+
+    def _kw_required(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        pad = "    " * level
+        start = len(out)
+        out.append(f"{pad}if isinstance({var}, dict):")
+        for name in value:
+            out.append(f"{pad}    if {name!r} not in {var}:")
+            message = repr(f"{name!r} is a required property")
+            self._error(out, pad + "        ", path, message)
+        self._drop_if_empty(out, start, 1)
+
+    def _kw_items(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        if not isinstance(value, dict) or (
+            self.draft >= 2020 and "prefixItems" in schema
+        ):
+            raise UnsupportedSchema("Only single-schema 'items' is supported")
+        pad = "    " * level
+        index, child = self._var("i"), self._var("d")
+        start = len(out)
+        out.append(f"{pad}if isinstance({var}, list):")
+        out.append(f"{pad}    for {index}, {child} in enumerate({var}):")
+        self._schema(value, child, f"({path}, {index})", out, level + 2)
+        self._drop_if_empty(out, start, 2)
+
+    def _kw_allOf(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        for subschema in value:
+            self._schema(subschema, var, path, out, level)
+
+    def _kw_anyOf(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        # Each branch only needs a yes/no answer, so it reports into the
+        # stop-at-first sink and the first error aborts the branch.
+        pad = "    " * level
+        matched = self._var("m")
+        out.append(f"{pad}{matched} = False")
+        outer_sink, self.sink = self.sink, "_stop"
+        try:
+            for subschema in value:
+                out.append(f"{pad}if not {matched}:")
+                out.append(f"{pad}    try:")
+                self._schema(subschema, var, path, out, level + 2)
+                out.append(f"{pad}        {matched} = True")
+                out.append(f"{pad}    except _Invalid:")
+                out.append(f"{pad}        pass")
+        finally:
+            self.sink = outer_sink
+        out.append(f"{pad}if not {matched}:")
+        message = f"repr({var}) + ' is not valid under any of the given schemas'"
+        self._error(out, pad + "    ", path, message)
+
+    def _kw_enum(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        pad = "    " * level
+        enums = self._constant(repr(value))
+        suffix = repr(f" is not one of {value!r}")
+        out.append(f"{pad}if not any(_equal(each, {var}) for each in {enums}):")
+        self._error(out, pad + "    ", path, f"repr({var}) + {suffix}")
+
+    def _kw_const(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        pad = "    " * level
+        const = self._constant(repr(value))
+        out.append(f"{pad}if not _equal({var}, {const}):")
+        self._error(out, pad + "    ", path, repr(f"{value!r} was expected"))
+
+    def _kw_pattern(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        pad = "    " * level
+        regex = self._constant(f"re.compile({value!r})")
+        suffix = repr(f" does not match {value!r}")
+        out.append(f"{pad}if isinstance({var}, str) and not {regex}.search({var}):")
+        self._error(out, pad + "    ", path, f"repr({var}) + {suffix}")
+
+    def _bound(self, var, path, out, level, op, text, limit) -> None:  # type: ignore[no-untyped-def]
+        pad = "    " * level
+        number = self._type_check("number", var)
+        out.append(f"{pad}if {number} and {var} {op} {limit!r}:")
+        self._error(out, pad + "    ", path, f"repr({var}) + {text!r}")
+
+    def _kw_minimum(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        if self.draft == 4 and schema.get("exclusiveMinimum", False):
+            op, cmp = "<=", "less than or equal to"
+        else:
+            op, cmp = "<", "less than"
+        text = f" is {cmp} the minimum of {value!r}"
+        self._bound(var, path, out, level, op, text, value)
+
+    def _kw_maximum(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        if self.draft == 4 and schema.get("exclusiveMaximum", False):
+            op, cmp = ">=", "greater than or equal to"
+        else:
+            op, cmp = ">", "greater than"
+        text = f" is {cmp} the maximum of {value!r}"
+        self._bound(var, path, out, level, op, text, value)
+
+    def _kw_exclusiveMinimum(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        text = f" is less than or equal to the minimum of {value!r}"
+        self._bound(var, path, out, level, "<=", text, value)
+
+    def _kw_exclusiveMaximum(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        text = f" is greater than or equal to the maximum of {value!r}"
+        self._bound(var, path, out, level, ">=", text, value)
+
+    def _length(self, kind, var, path, out, level, op, limit, text) -> None:  # type: ignore[no-untyped-def]
+        pad = "    " * level
+        check = _TYPE_CHECKS[kind].format(v=var)
+        out.append(f"{pad}if {check} and len({var}) {op} {limit!r}:")
+        self._error(out, pad + "    ", path, f"repr({var}) + {' ' + text!r}")
+
+    def _kw_minLength(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        text = "should be non-empty" if value == 1 else "is too short"
+        self._length("string", var, path, out, level, "<", value, text)
+
+    def _kw_maxLength(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        text = "is expected to be empty" if value == 0 else "is too long"
+        self._length("string", var, path, out, level, ">", value, text)
+
+    def _kw_minItems(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        text = "should be non-empty" if value == 1 else "is too short"
+        self._length("array", var, path, out, level, "<", value, text)
+
+    def _kw_maxItems(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        text = "is expected to be empty" if value == 0 else "is too long"
+        self._length("array", var, path, out, level, ">", value, text)
+
+    def _kw_additionalProperties(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        if "patternProperties" in schema:
+            raise UnsupportedSchema("patternProperties is not supported")
+        if value is True or value == {}:
+            return
+        pad = "    " * level
+        known = self._constant(repr(set(schema.get("properties", {}))))
+        extras = self._var("x")
+        out.append(f"{pad}if isinstance({var}, dict):")
+        out.append(f"{pad}    {extras} = set(k for k in {var} if k not in {known})")
+        if isinstance(value, dict):
+            key, child = self._var("k"), self._var("d")
+            out.append(f"{pad}    for {key} in {extras}:")
+            out.append(f"{pad}        {child} = {var}[{key}]")
+            self._schema(value, child, f"({path}, {key})", out, level + 2)
+            return
+        out.append(f"{pad}    if {extras}:")
+        message = f"_extras_message(sorted({extras}, key=str))"
+        self._error(out, pad + "        ", path, message)
+
+    def _kw_format(self, value, schema, var, path, out, level) -> None:  # type: ignore[no-untyped-def]
+        if self.format_assertion:
+            raise UnsupportedSchema("Format assertion is not supported")
+
+
+def _extras_message(extras: list[Any]) -> str:
+    verb = "was" if len(extras) == 1 else "were"
+    joined = ", ".join(repr(extra) for extra in extras)
+    return f"Additional properties are not allowed ({joined} {verb} unexpected)"
+
+
+def generate_source(schema: Any, format_assertion: bool = False) -> str:
+    """Returns the Python source of a compiled validator for ``schema``."""
+    validator_cls = jsonschema.validators.validator_for(schema)
+    draft = _DRAFTS.get(validator_cls)
+    if draft is None:
+        raise UnsupportedSchema(f"Unsupported draft: {validator_cls.__name__}")
+    return _Generator(schema, draft, format_assertion).generate()
+
+
+class CompiledValidator:
+    """Validator backed by generated code, interchangeable with ``jsonschema``.
+
+    Exposes the ``is_valid``/``iter_errors`` subset of the ``jsonschema``
+    validator protocol used by ``validate_json_schema``.
+    """
+
+    def __init__(self, source: str) -> None:
+        namespace: dict[str, Any] = {
+            "re": re,
+            "Number": Number,
+            "_equal": _equal,
+            "_extras_message": _extras_message,
+            "_Invalid": _Invalid,
+            "_stop": _StopAtFirst(),
+        }
+        exec(compile(source, "<opendpp-codegen>", "exec"), namespace)  # nosec B102
+        self.source = source
+        self._validate = namespace["validate"]
+
+    def is_valid(self, instance: Any) -> bool:
+        try:
+            self._validate(instance, None, _StopAtFirst())
+        except _Invalid:
+            return False
+        return True
+
+    def iter_errors(self, instance: Any) -> Iterator[SchemaError]:
+        errors: list[tuple[Any, str]] = []
+        self._validate(instance, None, errors)
+        for path, message in errors:
+            yield SchemaError(message, _json_path(path))
+
+
+def _cache_key(schema: Any, format_assertion: bool) -> str:
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(canonical.encode("utf-8"))
+    digest.update(f"\0{CODEGEN_VERSION}\0{format_assertion}".encode())
+    return digest.hexdigest()
+
+
+def compile_schema(
+    schema: Any, cache_dir: Path | None = None, format_assertion: bool = False
+) -> CompiledValidator:
+    """Compiles a schema, reusing generated source cached in ``cache_dir``.
+
+    Raises ``UnsupportedSchema`` when the schema cannot be compiled. Failing
+    to read or write the cache, or a corrupt cache entry, is not an error;
+    the source is regenerated.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = cache_dir / f"{_cache_key(schema, format_assertion)}.py"
+        try:
+            return CompiledValidator(cache_path.read_text(encoding="utf-8"))
+        except (OSError, SyntaxError, ValueError, KeyError) as exc:
+            # Missing, or damaged by something other than this module.
+            if not isinstance(exc, FileNotFoundError):
+                logger.debug("Regenerating cached validator %s: %s", cache_path, exc)
+
+    source = generate_source(schema, format_assertion)
+    if cache_path is not None:
+        try:
+            atomic_write_bytes(cache_path, source.encode("utf-8"))
+        except OSError as exc:
+            logger.debug("Could not cache generated validator: %s", exc)
+    return CompiledValidator(source)
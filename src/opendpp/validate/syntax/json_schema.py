@@ -1,28 +1,85 @@
-import json
+from pathlib import Path
+from typing import Any, Iterable
+
 import jsonschema
+from referencing import Registry, Resource
+from referencing.exceptions import NoSuchResource
+from referencing.jsonschema import DRAFT202012
 
 from opendpp.core.artifact import Artifact
-from opendpp.core.codec import decode_json_bytes
 from opendpp.core.report import ConformanceReport, Severity
 
 
+def _refuse_retrieval(uri: str) -> Resource:
+    # Only schemas preloaded from the profile may be referenced; never go to
+    # the network to resolve a $ref during validation.
+    raise NoSuchResource(ref=uri)  # type: ignore[call-arg]
+
+
+def build_registry(schemas: Iterable[tuple[str, Any]]) -> Registry:
+    """Builds a crawled ``$ref`` registry from ``(path, document)`` pairs.
+
+    Each schema is registered under its ``$id`` (or draft-04 ``id``), its
+    ``file://`` URI and its file name, so both absolute and sibling-relative
+    references resolve without I/O. Unknown references fail instead of being
+    fetched remotely.
+    """
+    resources: list[tuple[str, Resource]] = []
+    for path, document in schemas:
+        resource = Resource.from_contents(document, default_specification=DRAFT202012)
+        uris = {Path(path).resolve().as_uri(), Path(path).name}
+        if isinstance(document, dict):
+            for key in ("$id", "id"):
+                if isinstance(document.get(key), str):
+                    uris.add(document[key])
+        resources.extend((uri, resource) for uri in sorted(uris))
+    registry: Registry = Registry(retrieve=_refuse_retrieval)  # type: ignore[call-arg]
+    return registry.with_resources(resources).crawl()
+
+
+def build_validator(
+    schema: dict[str, Any],
+    registry: Registry | None = None,
+    format_assertion: bool = False,
+) -> Any:
+    """Builds a validator for a schema using the draft it declares.
+
+    Validators are immutable once built, so a single instance can be shared
+    between threads and reused for every payload checked against the schema.
+    """
+    validator_cls = jsonschema.validators.validator_for(schema)
+    kwargs: dict[str, Any] = {}
+    if registry is not None:
+        kwargs["registry"] = registry
+    if format_assertion:
+        kwargs["format_checker"] = validator_cls.FORMAT_CHECKER
+    return validator_cls(schema, **kwargs)
+
+
 def validate_json_schema(
     artifact: Artifact,
     schema_artifact: Artifact,
     report: ConformanceReport,
     record: bool = True,
+    validator: Any | None = None,
 ) -> list[dict[str, str]]:
-    """Validates an artifact against a JSON Schema."""
+    """Validates an artifact against a JSON Schema.
+
+    A prebuilt ``validator`` (see ``build_validator``) can be passed to skip
+    parsing the schema and constructing a validator on every call. Valid
+    documents take the ``is_valid`` fast path; errors are only enumerated
+    when the document actually fails.
+    """
     collected: list[dict[str, str]] = []
     try:
-        data = json.loads(decode_json_bytes(artifact.raw_bytes))
-        schema = json.loads(decode_json_bytes(schema_artifact.raw_bytes))
-
-        validator_cls = jsonschema.validators.validator_for(schema)
-        validator = validator_cls(schema)
-        errors = list(validator.iter_errors(data))
-
-        for error in errors:
+        data = artifact.parsed_json()
+        if validator is None:
+            validator = build_validator(schema_artifact.parsed_json())
+        if validator.is_valid(data):
+            return collected
+        # Errors are consumed as they are produced so large error lists are
+        # never held as ValidationError objects all at once.
+        for error in validator.iter_errors(data):
             location = getattr(error, "json_path", None)
             if not location:
                 location = ".".join(str(p) for p in list(error.path)) or "$"
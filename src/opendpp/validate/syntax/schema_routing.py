@@ -0,0 +1,114 @@
+"""Routing of payloads to the schemas of multi-schema profiles."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class SchemaRoute:
+    """Routing decision for one payload.
+
+    ``candidates`` lists, in profile order, the schemas the payload may
+    satisfy. Every other schema is guaranteed to reject the payload with at
+    least ``lower_bounds[index]`` errors.
+    """
+
+    candidates: list[int]
+    lower_bounds: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def ambiguous(self) -> bool:
+        return len(self.candidates) > 1
+
+
+@dataclass(frozen=True)
+class _SchemaKeys:
+    required: frozenset[str]
+    properties: frozenset[str]
+    requires_object: bool
+    closed: bool
+
+
+def _keys_of(schema: Any) -> _SchemaKeys | None:
+    """Extracts the top-level constraints routing can reason about.
+
+    Returns ``None`` for schemas whose top level cannot be analysed cheaply
+    (for example a draft-04..07 ``$ref``, which replaces its siblings); those
+    schemas are always treated as candidates.
+    """
+    if not isinstance(schema, dict) or "$ref" in schema:
+        return None
+    declared = schema.get("type")
+    requires_object = declared == "object" or (
+        isinstance(declared, list) and declared == ["object"]
+    )
+    required = schema.get("required", [])
+    properties = schema.get("properties", {})
+    closed = schema.get("additionalProperties") is False and not schema.get(
+        "patternProperties"
+    )
+    return _SchemaKeys(
+        required=frozenset(required) if isinstance(required, list) else frozenset(),
+        properties=frozenset(properties)
+        if isinstance(properties, dict)
+        else frozenset(),
+        requires_object=requires_object,
+        closed=closed,
+    )
+
+
+class SchemaRouter:
+    """Index of top-level ``required``/``properties`` keys across schemas.
+
+    A schema whose ``required`` keys are not all present in a payload (or
+    which is closed by ``additionalProperties: false`` and sees unknown keys,
+    or which requires an object and gets something else) cannot validate
+    that payload, and each of those violations is reported as its own
+    top-level error. The router uses this to exclude schemas without running
+    them and to give a lower bound on how many errors they would report.
+    """
+
+    def __init__(self, schemas: list[Any]) -> None:
+        self._keys = [_keys_of(schema) for schema in schemas]
+        self._by_required: dict[str, list[int]] = {}
+        for index, keys in enumerate(self._keys):
+            if keys is None:
+                continue
+            for key in keys.required:
+                self._by_required.setdefault(key, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def route(self, data: Any) -> SchemaRoute:
+        candidates: list[int] = []
+        lower_bounds: dict[int, int] = {}
+
+        if not isinstance(data, dict):
+            for index, keys in enumerate(self._keys):
+                if keys is not None and keys.requires_object:
+                    lower_bounds[index] = 1
+                else:
+                    candidates.append(index)
+            return SchemaRoute(candidates=candidates, lower_bounds=lower_bounds)
+
+        present: dict[int, int] = {}
+        for key in data:
+            for index in self._by_required.get(key, ()):
+                present[index] = present.get(index, 0) + 1
+
+        payload_keys = data.keys()
+        for index, keys in enumerate(self._keys):
+            if keys is None:
+                candidates.append(index)
+                continue
+            bound = len(keys.required) - present.get(index, 0)
+            if keys.closed and payload_keys - keys.properties:
+                bound += 1
+            if bound:
+                lower_bounds[index] = bound
+            else:
+                candidates.append(index)
+        return SchemaRoute(candidates=candidates, lower_bounds=lower_bounds)
@@ -0,0 +1,207 @@
+import json
+
+from aas_core3 import jsonization
+from rdflib import Literal, URIRef
+from rdflib.namespace import RDF, XSD
+
+from opendpp.core.engine import payload_artifact, run_conformance_check
+from opendpp.core.result_cache import ResultCache
+from opendpp.core.store import open_artifact_store
+from opendpp.normalize.ntriples import canonical_ntriples
+from opendpp.twin.aas.aas_to_rdf import AAS, aas_to_rdf
+
+
+def _semantic(value):
+    return {
+        "type": "ExternalReference",
+        "keys": [{"type": "GlobalReference", "value": value}],
+    }
+
+
+ENVIRONMENT = {
+    "submodels": [
+        {
+            "modelType": "Submodel",
+            "id": "urn:example:sm",
+            "idShort": "Battery",
+            "semanticId": _semantic("urn:sem:battery"),
+            "submodelElements": [
+                {
+                    "modelType": "Property",
+                    "idShort": "Capacity",
+                    "semanticId": _semantic("urn:sem:capacity"),
+                    "valueType": "xs:double",
+                    "value": "42.5",
+                },
+                {
+                    "modelType": "MultiLanguageProperty",
+                    "idShort": "Name",
+                    "value": [{"language": "en", "text": "Cell"}],
+                },
+                {
+                    "modelType": "Range",
+                    "idShort": "Voltage",
+                    "valueType": "xs:int",
+                    "min": "3",
+                    "max": "4",
+                },
+                {
+                    "modelType": "SubmodelElementCollection",
+                    "idShort": "Chemistry",
+                    "value": [
+                        {
+                            "modelType": "Property",
+                            "idShort": "Short Name",
+                            "valueType": "xs:string",
+                            "value": "NMC",
+                        }
+                    ],
+                },
+                {
+                    "modelType": "SubmodelElementList",
+                    "idShort": "Cells",
+                    "typeValueListElement": "Property",
+                    "valueTypeListElement": "xs:boolean",
+                    "value": [
+                        {
+                            "modelType": "Property",
+                            "valueType": "xs:boolean",
+                            "value": "true",
+                        },
+                        {"modelType": "Property", "valueType": "xs:boolean"},
+                    ],
+                },
+            ],
+        }
+    ]
+}
+
+
+def test_submodel_elements_are_mapped_with_datatypes():
+    graph = aas_to_rdf(jsonization.environment_from_jsonable(ENVIRONMENT))
+    submodel = URIRef("submodel:urn:example:sm")
+    capacity = URIRef("submodel:urn:example:sm/Capacity")
+    chemistry = URIRef("submodel:urn:example:sm/Chemistry")
+    cells = URIRef("submodel:urn:example:sm/Cells")
+
+    assert (submodel, AAS.semanticId, Literal("urn:sem:battery")) in graph
+    assert (submodel, AAS.submodelElement, capacity) in graph
+    assert (capacity, RDF.type, AAS.Property) in graph
+    assert (capacity, AAS.semanticId, Literal("urn:sem:capacity")) in graph
+    assert (capacity, AAS.value, Literal("42.5", datatype=XSD.double)) in graph
+    name = URIRef("submodel:urn:example:sm/Name")
+    assert (name, AAS.value, Literal("Cell", lang="en")) in graph
+    voltage = URIRef("submodel:urn:example:sm/Voltage")
+    assert (voltage, AAS.max, Literal("4", datatype=XSD.int)) in graph
+
+    short_name = URIRef("submodel:urn:example:sm/Chemistry/Short%20Name")
+    assert (chemistry, AAS.value, short_name) in graph
+    assert (short_name, AAS.value, Literal("NMC", datatype=XSD.string)) in graph
+
+    first, second = URIRef(f"{cells}/0"), URIRef(f"{cells}/1")
+    assert (cells, AAS.value, first) in graph
+    assert (second, AAS["index"], Literal(1)) in graph
+    assert (first, AAS.value, Literal("true", datatype=XSD.boolean)) in graph
+    assert not list(graph.objects(second, AAS.value))
+
+
+def test_mapping_is_deterministic():
+    environment = jsonization.environment_from_jsonable(ENVIRONMENT)
+    first = aas_to_rdf(environment).serialize(format="nt")
+    second = aas_to_rdf(environment).serialize(format="nt")
+    assert sorted(first.splitlines()) == sorted(second.splitlines())
+
+
+def test_ids_are_quoted_into_valid_iris():
+    environment = {
+        "assetAdministrationShells": [
+            {
+                "modelType": "AssetAdministrationShell",
+                "id": "urn:shell 1",
+                "assetInformation": {"assetKind": "Instance"},
+                "submodels": [
+                    {
+                        "type": "ModelReference",
+                        "keys": [{"type": "Submodel", "value": "urn:sm 1"}],
+                    }
+                ],
+            }
+        ],
+        "submodels": [{"modelType": "Submodel", "id": "urn:sm 1"}],
+    }
+    graph = aas_to_rdf(jsonization.environment_from_jsonable(environment))
+    submodel = URIRef("submodel:urn:sm%201")
+
+    assert (URIRef("shell:urn:shell%201"), AAS.submodel, submodel) in graph
+    assert (submodel, AAS.id, Literal("urn:sm 1")) in graph
+    assert b"<submodel:urn:sm%201>" in canonical_ntriples(graph)
+
+
+SHAPES = """
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix aas: <https://admin-shell.io/aas/3/0/> .
+[] a sh:NodeShape ;
+   sh:targetClass aas:Property ;
+   sh:property [ sh:path aas:valueId ; sh:minCount 1 ] .
+"""
+
+
+def test_shacl_reuses_one_in_memory_graph_per_aas_artifact(tmp_path):
+    (tmp_path / "a.ttl").write_text(SHAPES, encoding="utf-8")
+    (tmp_path / "b.ttl").write_text(SHAPES, encoding="utf-8")
+    (tmp_path / "profile.yaml").write_text(
+        "id: p\nversion: '1'\nartifacts:\n  shapes: [a.ttl, b.ttl]\n",
+        encoding="utf-8",
+    )
+    target = tmp_path / "twin.json"
+    target.write_text(json.dumps(ENVIRONMENT), encoding="utf-8")
+
+    report = run_conformance_check(
+        str(target),
+        str(tmp_path / "profile.yaml"),
+        str(tmp_path / "artifacts"),
+    )
+
+    records = [a for a in report.artifacts if a.uri.endswith("#rdf")]
+    failures = [f for f in report.findings if f.rule_id == "SHACL-VAL-01"]
+    assert len(records) == len(failures) == 2
+    assert {r.sha256 for r in records} == {records[0].sha256}
+    assert {f.evidence["artifact_hash"] for f in failures} == {records[0].sha256}
+    stored = open_artifact_store(tmp_path / "artifacts").get(records[0].sha256)
+    assert stored is not None
+    assert records[0].metadata["stored_path"].endswith(".nt")
+
+
+def test_evidence_copy_is_canonical_and_shares_the_graph():
+    raw = json.dumps(ENVIRONMENT).encode("utf-8")
+    artifact = payload_artifact(raw, uri="twin.json")
+    evidence = artifact.rdf_evidence()
+
+    assert artifact.rdf_evidence() is evidence
+    assert evidence.rdf_graph() is artifact.rdf_graph()
+    assert evidence.raw_bytes == canonical_ntriples(artifact.rdf_graph())
+    assert payload_artifact(raw).rdf_evidence().sha256 == evidence.sha256
+
+
+def test_replayed_rdf_evidence_is_stored_in_the_current_store(tmp_path):
+    (tmp_path / "a.ttl").write_text(SHAPES, encoding="utf-8")
+    (tmp_path / "profile.yaml").write_text(
+        "id: p\nversion: '1'\nartifacts:\n  shapes: [a.ttl]\n", encoding="utf-8"
+    )
+    target = tmp_path / "twin.json"
+    target.write_text(json.dumps(ENVIRONMENT), encoding="utf-8")
+    cache = ResultCache(tmp_path / "results.sqlite3")
+
+    for name in ("a1", "a2"):
+        report = run_conformance_check(
+            str(target),
+            str(tmp_path / "profile.yaml"),
+            str(tmp_path / name),
+            result_cache=cache,
+        )
+
+    assert report.artifacts[0].metadata["result_cache"] == "hit"
+    record = next(a for a in report.artifacts if a.uri.endswith("#rdf"))
+    store = open_artifact_store(tmp_path / "a2")
+    assert record.metadata["stored_path"].startswith(str(tmp_path / "a2"))
+    assert store.get(record.sha256) is not None
@@ -0,0 +1,146 @@
+import hashlib
+import io
+import json
+import mmap
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.core.engine import run_conformance_check
+from opendpp.twin.aas.aasx import AasxLimitExceeded, AasxLimits, extract_aasx
+
+ENVIRONMENT = json.dumps({"assetAdministrationShells": [], "submodels": []}).encode()
+
+ROOT_RELS = """<?xml version="1.0" encoding="utf-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Type="http://admin-shell.io/aasx/relationships/aasx-origin"
+    Target="/aasx/aasx-origin" Id="r1"/>
+</Relationships>"""
+
+ORIGIN_RELS = """<?xml version="1.0" encoding="utf-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Type="http://admin-shell.io/aasx/relationships/aas-spec"
+    Target="/aasx/data.json" Id="r2"/>
+</Relationships>"""
+
+
+def _package(extra: dict[str, bytes] | None = None, opc: bool = True) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        if opc:
+            package.writestr("_rels/.rels", ROOT_RELS)
+            package.writestr("aasx/aasx-origin", "Intentionally empty.")
+            package.writestr("aasx/_rels/aasx-origin.rels", ORIGIN_RELS)
+        package.writestr("aasx/data.json", ENVIRONMENT)
+        for name, content in (extra or {}).items():
+            package.writestr(name, content)
+    return buffer.getvalue()
+
+
+def _artifact(raw: bytes) -> Artifact:
+    return Artifact.from_bytes(
+        uri="package.aasx",
+        content_type=None,
+        artifact_type=ArtifactType.AASX_PACKAGE,
+        raw_bytes=raw,
+    )
+
+
+def test_extract_follows_opc_relationships() -> None:
+    raw = _package({"aasx/suppl/manual.json": b"{}", "aasx/suppl/model.xml": b"<a/>"})
+    extracted = extract_aasx(_artifact(raw))
+
+    assert [a.metadata["filename"] for a in extracted] == ["aasx/data.json"]
+    environment = extracted[0]
+    assert environment.artifact_type == ArtifactType.AAS_PAYLOAD
+    assert environment.metadata["selection"] == "opc"
+    assert environment.sha256 == hashlib.sha256(ENVIRONMENT).hexdigest()
+
+
+def test_extract_without_relationships_skips_package_metadata() -> None:
+    extracted = extract_aasx(_artifact(_package(opc=False)))
+    assert [a.metadata["filename"] for a in extracted] == ["aasx/data.json"]
+    assert extracted[0].metadata["selection"] == "suffix"
+
+
+def test_extract_from_path_and_mmap(tmp_path: Path) -> None:
+    path = tmp_path / "package.aasx"
+    path.write_bytes(_package())
+
+    from_path = extract_aasx(path)
+    assert from_path[0].uri == f"{path}#aasx/data.json"
+
+    with path.open("rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            from_mmap = extract_aasx(mapped)
+    assert from_mmap[0].raw_bytes == ENVIRONMENT
+
+
+def test_extract_nested_packages_up_to_depth_limit() -> None:
+    inner = _package()
+    outer = _package({"aasx/suppl/inner.aasx": inner})
+
+    extracted = extract_aasx(_artifact(outer))
+    assert [(a.artifact_type, a.uri) for a in extracted] == [
+        (ArtifactType.AAS_PAYLOAD, "package.aasx#aasx/data.json"),
+        (ArtifactType.AASX_PACKAGE, "package.aasx#aasx/suppl/inner.aasx"),
+        (
+            ArtifactType.AAS_PAYLOAD,
+            "package.aasx#aasx/suppl/inner.aasx#aasx/data.json",
+        ),
+    ]
+
+    with pytest.raises(AasxLimitExceeded, match="depth"):
+        extract_aasx(_artifact(outer), AasxLimits(max_depth=0))
+
+
+def test_limits_are_enforced_before_decompression(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    raw = _package({"aasx/suppl/bomb.bin": b"\0" * 1_000_000})
+
+    def _no_reads(*args: object, **kwargs: object) -> None:
+        raise AssertionError("member decompressed")
+
+    monkeypatch.setattr(zipfile.ZipFile, "open", _no_reads)
+    with pytest.raises(AasxLimitExceeded, match="entries"):
+        extract_aasx(_artifact(raw), AasxLimits(max_entries=3))
+    with pytest.raises(AasxLimitExceeded, match="declares"):
+        extract_aasx(_artifact(raw), AasxLimits(max_entry_size=1000))
+    with pytest.raises(AasxLimitExceeded, match="ratio"):
+        extract_aasx(_artifact(raw))
+
+
+def test_engine_reports_corrupt_package(tmp_path: Path) -> None:
+    path = tmp_path / "broken.aasx"
+    path.write_bytes(b"PK\x03\x04 not a zip")
+
+    report = run_conformance_check(
+        str(path),
+        "espr-core",
+        report_artifacts_dir=str(tmp_path / "artifacts"),
+    )
+    assert "AASX-ERR" in {finding.rule_id for finding in report.findings}
+
+
+def test_stored_members_are_views_into_the_package() -> None:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as package:
+        package.writestr("aasx/data.json", ENVIRONMENT)
+        package.writestr("aasx/cert.jwt", b"a.b.c", zipfile.ZIP_DEFLATED)
+    raw = buffer.getvalue()
+
+    environment, credential = extract_aasx(_artifact(raw))
+    assert isinstance(environment.raw_bytes, memoryview)
+    assert environment.view().obj is raw
+    assert environment.contains(b'"submodels"')
+    assert environment.parsed_json() == json.loads(ENVIRONMENT)
+    assert environment.sha256 == hashlib.sha256(ENVIRONMENT).hexdigest()
+    assert bytes(credential.raw_bytes) == b"a.b.c"
+
+    corrupt = raw.replace(b"submodels", b"submodelz", 1)
+    with pytest.raises(zipfile.BadZipFile):
+        extract_aasx(_artifact(corrupt))
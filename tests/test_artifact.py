@@ -0,0 +1,76 @@
+import hashlib
+import json
+import mmap
+
+from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.twin.aas.aasx import parse_aas_json
+
+AAS_ENV = {
+    "assetAdministrationShells": [
+        {
+            "id": "urn:example:shell",
+            "modelType": "AssetAdministrationShell",
+            "assetInformation": {
+                "assetKind": "Instance",
+                "globalAssetId": "urn:example:asset",
+            },
+        }
+    ],
+    "submodels": [{"id": "urn:example:submodel", "modelType": "Submodel"}],
+}
+
+
+def _artifact(data, artifact_type, encoding="utf-8"):
+    return Artifact.from_bytes(
+        uri="memory://payload",
+        content_type="application/json",
+        artifact_type=artifact_type,
+        raw_bytes=json.dumps(data).encode(encoding),
+    )
+
+
+def test_parsed_views_are_memoized():
+    artifact = _artifact(
+        {"@context": {"@vocab": "https://example.org/"}, "@id": "urn:x", "name": "n"},
+        ArtifactType.DPP_PAYLOAD,
+        encoding="utf-16",
+    )
+
+    assert artifact.parsed_json() is artifact.parsed_json()
+    assert artifact.parsed_json()["name"] == "n"
+    graph = artifact.rdf_graph()
+    assert graph is artifact.rdf_graph()
+    assert len(graph) == 1
+
+
+def test_aas_environment_is_shared_between_stages():
+    artifact = _artifact(AAS_ENV, ArtifactType.AAS_PAYLOAD)
+
+    environment = parse_aas_json(artifact)
+
+    assert environment is artifact.aas_environment()
+    assert len(artifact.rdf_graph()) == 6
+
+
+def test_large_files_are_memory_mapped(tmp_path):
+    path = tmp_path / "env.json"
+    path.write_bytes(b"  " + json.dumps(AAS_ENV).encode("utf-8"))
+
+    artifact = Artifact.from_file(
+        path,
+        content_type="application/json",
+        artifact_type=ArtifactType.AAS_PAYLOAD,
+        mmap_threshold=16,
+    )
+    assert isinstance(artifact.raw_bytes, mmap.mmap)
+    assert artifact.sha256 == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert artifact.head(3) == b"  {"
+    assert artifact.contains(b"urn:example:submodel")
+    assert not artifact.contains(b"urn:example:missing")
+    assert parse_aas_json(artifact).submodels[0].id == "urn:example:submodel"
+
+    small = Artifact.from_file(
+        path, content_type=None, artifact_type=ArtifactType.AAS_PAYLOAD
+    )
+    assert isinstance(small.raw_bytes, bytes)
+    assert small.sha256 == artifact.sha256
@@ -0,0 +1,90 @@
+import json
+
+from click.testing import CliRunner
+
+from opendpp.cli import cli
+from opendpp.core.batch import collect_targets, iter_batch, run_batch
+
+
+def _write_corpus(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.json").write_text('{"id": "a"}', encoding="utf-8")
+    (corpus / "b.json").write_text('{"id": 42}', encoding="utf-8")
+    (corpus / "c.json").write_text('{"name": "no id"}', encoding="utf-8")
+    (corpus / "notes.md").write_text("ignored", encoding="utf-8")
+    return corpus
+
+
+def test_collect_targets_from_directory_glob_and_manifest(tmp_path):
+    corpus = _write_corpus(tmp_path)
+    expected = [str(corpus / n) for n in ("a.json", "b.json", "c.json")]
+
+    assert collect_targets(str(corpus)) == expected
+    assert collect_targets(str(corpus / "*.json")) == expected
+
+    manifest = tmp_path / "targets.txt"
+    manifest.write_text(
+        f"# nightly export\n{expected[2]}\n\n{expected[0]}\n", encoding="utf-8"
+    )
+    assert collect_targets(str(manifest)) == [expected[2], expected[0]]
+
+
+def test_run_batch_aggregates_and_isolates_failures(tmp_path):
+    corpus = _write_corpus(tmp_path)
+    targets = collect_targets(str(corpus)) + ["did:web:example.com"]
+
+    summary = run_batch(
+        targets,
+        profile_ref="espr-core",
+        jobs=2,
+        report_artifacts_dir=str(tmp_path / "artifacts"),
+    )
+
+    assert [t.target for t in summary.targets] == targets
+    assert (summary.total, summary.passed, summary.failed, summary.errored) == (
+        4,
+        1,
+        2,
+        1,
+    )
+    # ESPR-02 is a warning and does not fail a target.
+    assert summary.rule_failures == {"ESPR-01": 1, "JS-VAL-01": 1}
+    assert "Unsupported input type" in (summary.targets[3].error or "")
+
+
+def test_iter_batch_in_process_matches_pool(tmp_path):
+    targets = collect_targets(str(_write_corpus(tmp_path)))
+    artifacts = str(tmp_path / "artifacts")
+
+    serial = [i.passed for i in iter_batch(targets, "espr-core", 1, artifacts)]
+    pooled = [i.passed for i in iter_batch(targets, "espr-core", 2, artifacts)]
+
+    assert serial == pooled == [True, False, False]
+
+
+def test_check_batch_cli_writes_reports_and_summary(tmp_path):
+    corpus = _write_corpus(tmp_path)
+    summary_path = tmp_path / "summary.json"
+    result = CliRunner().invoke(
+        cli,
+        [
+            "check-batch",
+            str(corpus),
+            "--output-dir",
+            str(tmp_path / "reports"),
+            "--summary-output",
+            str(summary_path),
+            "--artifacts-dir",
+            str(tmp_path / "artifacts"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    assert summary["total"] == 3
+    assert sorted(p.name for p in (tmp_path / "reports").iterdir()) == [
+        "000000.json",
+        "000001.json",
+        "000002.json",
+    ]
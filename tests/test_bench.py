@@ -0,0 +1,126 @@
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from opendpp import bench
+from opendpp.bench import (
+    collect_cases,
+    compare_to_baseline,
+    enlarge_payload,
+    run_benchmark,
+    write_synthetic_aasx,
+)
+from opendpp.cli import cli
+from opendpp.twin.aas.aasx import extract_aasx
+
+POSITIVE = Path("profiles/battery-pass/testvectors/positive")
+
+
+def test_enlarge_payload_scales_outermost_arrays():
+    data = {"id": "x", "items": [{"parts": [1, 2]}], "nested": {"tags": ["a"]}}
+    enlarged = enlarge_payload(data, 3)
+    assert len(enlarged["items"]) == 3
+    assert enlarged["items"][0]["parts"] == [1, 2]
+    assert enlarged["nested"]["tags"] == ["a", "a", "a"]
+    assert enlarged["id"] == "x"
+
+
+def test_synthetic_aasx_has_one_environment(tmp_path):
+    path = write_synthetic_aasx(tmp_path / "big.aasx", 2)
+    assert path.stat().st_size > 2 * 2**20
+    extracted = extract_aasx(path)
+    assert [a.metadata["filename"] for a in extracted] == ["aasx/environment.json"]
+
+
+def test_collect_cases_adds_enlarged_payloads(tmp_path):
+    vectors = tmp_path / "vectors"
+    vectors.mkdir()
+    shutil.copy(POSITIVE / "Labeling-payload.json", vectors)
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+
+    cases = collect_cases(vectors, workdir, scales=[10], aasx_mb=1)
+    assert [case.name for case in cases] == [
+        "Labeling-payload.json",
+        "Labeling-payload.json@x10",
+        "synthetic-1mb.aasx",
+    ]
+
+
+def test_run_benchmark_reports_stage_statistics(tmp_path, monkeypatch):
+    vectors = tmp_path / "vectors"
+    vectors.mkdir()
+    shutil.copy(POSITIVE / "Labeling-payload.json", vectors)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    results = run_benchmark(testvectors=vectors, rounds=2, scales=[2])
+    assert [p.name for p in tmp_path.iterdir()] == ["vectors"]
+    case = results["cases"]["Labeling-payload.json@x2"]
+    assert case["docs_per_s"] > 0
+    assert case["p95_ms"] >= case["p50_ms"]
+    assert case["max_rss_mb"] > 0
+    stage = case["stages"]["json_schema"]
+    assert set(stage) == {"p50_ms", "p95_ms", "peak_traced_mb"}
+
+
+def test_max_rss_is_none_without_resource(monkeypatch):
+    monkeypatch.setitem(sys.modules, "resource", None)
+    assert bench._max_rss_mb() is None
+
+
+def test_run_benchmark_requires_a_round(tmp_path):
+    with pytest.raises(ValueError, match="rounds"):
+        run_benchmark(testvectors=tmp_path, rounds=0)
+    result = CliRunner().invoke(cli, ["bench", "--rounds", "0"])
+    assert result.exit_code == 2
+    assert "--rounds" in result.output
+
+
+def test_compare_to_baseline_flags_slow_stages():
+    def _results(ms: float) -> dict:
+        return {"cases": {"a": {"stages": {"policy": {"p50_ms": ms}}}}}
+
+    assert compare_to_baseline(_results(12.0), _results(10.0), threshold=0.25) == []
+    assert compare_to_baseline(_results(13.0), _results(10.0), threshold=0.25) == [
+        "a policy: p50_ms 13.0 ms vs baseline 10.0 ms"
+    ]
+    # Sub-millisecond stages are noise.
+    assert compare_to_baseline(_results(0.9), _results(0.1)) == []
+
+
+def test_cli_bench_fails_on_regression(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench, "NOISE_FLOOR_MS", 0.0)
+    vectors = tmp_path / "vectors"
+    vectors.mkdir()
+    shutil.copy(POSITIVE / "Labeling-payload.json", vectors)
+    output = tmp_path / "bench.json"
+    args = [
+        "bench",
+        "--testvectors",
+        str(vectors),
+        "--rounds",
+        "1",
+        "--scale",
+        "2",
+        "--aasx-mb",
+        "0",
+        "--output",
+        str(output),
+    ]
+
+    assert CliRunner().invoke(cli, args).exit_code == 0
+    baseline = json.loads(output.read_text())
+    for case in baseline["cases"].values():
+        for stage in case["stages"].values():
+            stage["p50_ms"] = 0.001
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps(baseline))
+
+    result = CliRunner().invoke(cli, [*args, "--baseline", str(baseline_path)])
+    assert result.exit_code == 1
+    assert "REGRESSION" in result.output
@@ -0,0 +1,154 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from opendpp.core.engine import run_conformance_check
+from opendpp.profiles.loader import compile_profile
+from opendpp.validate.syntax.codegen import (
+    CompiledValidator,
+    UnsupportedSchema,
+    compile_schema,
+)
+from opendpp.validate.syntax.json_schema import build_validator
+
+POSITIVE = Path("profiles/battery-pass/testvectors/positive")
+REPLACEMENTS = [12345, "text", None, -1e12, {}, 2.5]
+
+
+def _errors(validator, data):
+    return [(e.json_path, e.message) for e in validator.iter_errors(data)]
+
+
+def _paths(node, path=()):
+    yield path
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _paths(value, path + (key,))
+    elif isinstance(node, list):
+        for index, value in enumerate(node):
+            yield from _paths(value, path + (index,))
+
+
+def _mutations(data):
+    yield data
+    for path in list(_paths(data))[1:]:
+        for replacement in REPLACEMENTS:
+            mutated = copy.deepcopy(data)
+            node = mutated
+            for step in path[:-1]:
+                node = node[step]
+            node[path[-1]] = replacement
+            yield mutated
+        if isinstance(path[-1], str):
+            mutated = copy.deepcopy(data)
+            node = mutated
+            for step in path[:-1]:
+                node = node[step]
+            del node[path[-1]]
+            yield mutated
+
+
+@pytest.mark.parametrize(
+    "schema_path",
+    sorted(Path("profiles/battery-pass/schemas").glob("*.json")),
+    ids=lambda p: p.stem,
+)
+def test_codegen_matches_jsonschema_on_testvectors(schema_path):
+    schema = json.loads(schema_path.read_text(encoding="utf-8-sig"))
+    reference = build_validator(schema)
+    generated = compile_schema(schema)
+
+    for payload_path in sorted(POSITIVE.glob("*.json")):
+        payload = json.loads(payload_path.read_text(encoding="utf-8-sig"))
+        for data in _mutations(payload):
+            assert generated.is_valid(data) == reference.is_valid(data)
+            assert _errors(generated, data) == _errors(reference, data)
+
+
+@pytest.mark.parametrize(
+    "schema,data",
+    [
+        ({"type": "string", "minLength": 3, "maxLength": 4}, "ab"),
+        ({"const": {"a": [1, 2]}}, {"a": [1, 2.5]}),
+        ({"enum": [1, True]}, 1.0),
+        ({"anyOf": [{"type": "string"}, {"minimum": 3}]}, 1),
+        ({"items": {"type": "string"}, "maxItems": 1}, ["a", 1]),
+        (
+            {
+                "type": "object",
+                "properties": {"a": {"type": "integer"}},
+                "additionalProperties": False,
+            },
+            {"a": "1", "c": 3, "d": 4},
+        ),
+        ({"additionalProperties": {"type": "string"}}, {"a": 1, "b": "x"}),
+        ({"exclusiveMaximum": 2, "type": ["integer", "null"]}, 2.25),
+        (
+            {
+                "$defs": {"n": {"type": "integer"}},
+                "properties": {"v": {"$ref": "#/$defs/n"}},
+            },
+            {"v": "x"},
+        ),
+    ],
+)
+def test_codegen_matches_jsonschema_keywords(schema, data):
+    schema = {"$schema": "https://json-schema.org/draft/2020-12/schema", **schema}
+    reference = build_validator(schema)
+    generated = compile_schema(schema)
+
+    assert generated.is_valid(data) == reference.is_valid(data)
+    assert _errors(generated, data) == _errors(reference, data)
+
+
+def test_generated_source_is_cached_on_disk(tmp_path):
+    schema = {"type": "object", "required": ["id"]}
+
+    first = compile_schema(schema, cache_dir=tmp_path)
+    cached = list(tmp_path.glob("*.py"))
+    assert len(cached) == 1
+
+    cached[0].write_text(first.source + "\n# reused\n", encoding="utf-8")
+    second = compile_schema(schema, cache_dir=tmp_path)
+    assert second.source.endswith("# reused\n")
+    assert _errors(second, {}) == [("$", "'id' is a required property")]
+
+    cached[0].write_text(first.source[: len(first.source) // 2], encoding="utf-8")
+    third = compile_schema(schema, cache_dir=tmp_path)
+    assert third.source == first.source
+    assert cached[0].read_text(encoding="utf-8") == first.source
+    assert [p.name for p in tmp_path.iterdir()] == [cached[0].name]
+
+
+def test_unsupported_keywords_are_rejected():
+    for schema in (
+        {"oneOf": [{"type": "number"}, {"type": "integer"}]},
+        {"patternProperties": {"^x-": {}}, "additionalProperties": False},
+        {"prefixItems": [{"type": "string"}]},
+    ):
+        with pytest.raises(UnsupportedSchema):
+            compile_schema(schema)
+    with pytest.raises(UnsupportedSchema):
+        compile_schema({"$ref": "https://schemas.invalid/remote.json"})
+
+
+def test_profile_codegen_backend(tmp_path):
+    profile = compile_profile("battery-pass")
+    schema = profile.schemas[0]
+    profile.base_dir = tmp_path
+
+    validator = profile.schema_validator(schema, "codegen")
+    assert isinstance(validator, CompiledValidator)
+    assert validator is profile.schema_validator(schema, "codegen")
+    assert list((tmp_path / ".compiled").glob("*.py"))
+
+    target = str(next(POSITIVE.glob("*.json")))
+    interpreted = run_conformance_check(target, profile, str(tmp_path / "a"))
+    generated = run_conformance_check(
+        target, profile, str(tmp_path / "b"), schema_backend="codegen"
+    )
+    assert [f.rule_id for f in generated.findings] == [
+        f.rule_id for f in interpreted.findings
+    ]
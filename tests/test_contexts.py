@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.core.engine import run_conformance_check
+from opendpp.normalize.contexts import (
+    ContextCache,
+    ContextLoader,
+    ContextNotAvailable,
+    clear_resolved_contexts,
+    inline_contexts,
+)
+from opendpp.normalize.jsonld import expand_jsonld, to_rdf_graph
+from opendpp.profiles.loader import compile_profile
+
+CONTEXT_URL = "https://contexts.invalid/battery.jsonld"
+CONTEXT = {"@context": {"@vocab": "https://example.org/", "id": "@id"}}
+PAYLOAD = {"@context": CONTEXT_URL, "id": "urn:battery:1", "mass": 12}
+
+
+@pytest.fixture(autouse=True)
+def _isolated(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENDPP_CACHE_DIR", str(tmp_path / "cache"))
+    clear_resolved_contexts()
+    yield
+    clear_resolved_contexts()
+
+
+class _Fetcher:
+    def __init__(self, document=CONTEXT):
+        self.document = document
+        self.calls = []
+
+    def __call__(self, url):
+        self.calls.append(url)
+        return self.document
+
+
+def _payload(data):
+    return Artifact.from_bytes(
+        uri="memory://payload",
+        content_type="application/ld+json",
+        artifact_type=ArtifactType.DPP_PAYLOAD,
+        raw_bytes=json.dumps(data).encode("utf-8"),
+    )
+
+
+def test_remote_context_is_fetched_once_per_process_and_cached(tmp_path):
+    fetch = _Fetcher()
+    cache = ContextCache(tmp_path / "contexts")
+
+    assert ContextLoader(cache=cache, fetch=fetch).load(CONTEXT_URL) == CONTEXT
+    assert ContextLoader(cache=cache, fetch=fetch).load(CONTEXT_URL) == CONTEXT
+    assert fetch.calls == [CONTEXT_URL]
+
+    clear_resolved_contexts()
+    assert ContextLoader(cache=cache, fetch=fetch).load(CONTEXT_URL) == CONTEXT
+    assert fetch.calls == [CONTEXT_URL]
+
+    clear_resolved_contexts()
+    expired = ContextCache(tmp_path / "contexts", ttl=-1)
+    ContextLoader(cache=expired, fetch=fetch).load(CONTEXT_URL)
+    assert fetch.calls == [CONTEXT_URL, CONTEXT_URL]
+
+
+def test_offline_mode_uses_stale_cache_and_rejects_unknown(tmp_path):
+    cache = ContextCache(tmp_path / "contexts", ttl=-1)
+    cache.put(CONTEXT_URL, CONTEXT)
+    fetch = _Fetcher()
+    loader = ContextLoader(cache=cache, offline=True, fetch=fetch)
+
+    assert loader.load(CONTEXT_URL) == CONTEXT
+    with pytest.raises(ContextNotAvailable, match="not available offline"):
+        loader.load("https://contexts.invalid/unknown.jsonld")
+    assert fetch.calls == []
+
+
+def test_inlined_contexts_parse_like_remote_ones():
+    fetch = _Fetcher()
+    loader = ContextLoader(fetch=fetch)
+    nested = {
+        "@context": [CONTEXT_URL, {"cell": {"@context": CONTEXT_URL}}],
+        "id": "urn:battery:1",
+        "cell": {"id": "urn:cell:1", "mass": 1},
+    }
+
+    inlined = inline_contexts(nested, loader)
+    assert inlined["@context"][0] == CONTEXT["@context"]
+    assert nested["@context"][0] == CONTEXT_URL
+
+    graph = to_rdf_graph(_payload(PAYLOAD), loader)
+    expected = to_rdf_graph(_payload({**PAYLOAD, "@context": CONTEXT["@context"]}))
+    assert set(graph) == set(expected)
+    assert expand_jsonld(_payload(PAYLOAD), loader)[0]["@id"] == "urn:battery:1"
+    assert fetch.calls == [CONTEXT_URL]
+
+
+def test_profile_serves_bundled_contexts_offline(tmp_path):
+    (tmp_path / "battery.jsonld").write_text(json.dumps(CONTEXT), encoding="utf-8")
+    (tmp_path / "shapes.ttl").write_text(
+        "@prefix sh: <http://www.w3.org/ns/shacl#> .\n"
+        "[] a sh:NodeShape ; sh:targetNode <urn:battery:1> ;\n"
+        "   sh:property [ sh:path <https://example.org/mass> ; sh:minCount 1 ] .\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "profile.yaml").write_text(
+        "id: p\nversion: '1'\n"
+        "artifacts:\n  shapes: [shapes.ttl]\n  contexts: [battery.jsonld]\n"
+        f"jsonld:\n  offline: true\n  context_urls:\n    {CONTEXT_URL}: battery.jsonld\n",
+        encoding="utf-8",
+    )
+    profile = compile_profile(str(tmp_path / "profile.yaml"))
+    assert profile.document_loader().load(CONTEXT_URL) == CONTEXT
+
+    known = tmp_path / "known.json"
+    known.write_text(json.dumps(PAYLOAD), encoding="utf-8")
+    report = run_conformance_check(str(known), profile, str(tmp_path / "out"))
+    assert not [f for f in report.findings if f.rule_id.startswith("SHACL")]
+
+    unknown = tmp_path / "unknown.json"
+    unknown.write_text(
+        json.dumps({**PAYLOAD, "@context": "https://contexts.invalid/other"}),
+        encoding="utf-8",
+    )
+    report = run_conformance_check(str(unknown), profile, str(tmp_path / "out"))
+    errors = [f for f in report.findings if f.rule_id == "SHACL-VAL-ERR"]
+    assert errors and "not available offline" in errors[0].message
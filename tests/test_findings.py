@@ -0,0 +1,97 @@
+import json
+import shutil
+
+from opendpp.core.engine import run_conformance_check
+from opendpp.core.findings import (
+    FindingAggregator,
+    NdjsonFindingSink,
+    normalize_location,
+)
+from opendpp.core.report import ConformanceReport, Severity
+from opendpp.core.result_cache import ResultCache
+from opendpp.profiles.loader import compile_profile
+
+
+def _broken_profile(tmp_path):
+    shutil.copytree("profiles/espr-core", tmp_path / "espr-core")
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "type": "object",
+        "properties": {
+            "cells": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"mass": {"type": "number"}},
+                },
+            }
+        },
+    }
+    (tmp_path / "espr-core" / "schemas" / "dpp_core.schema.json").write_text(
+        json.dumps(schema), encoding="utf-8"
+    )
+    return compile_profile(str(tmp_path / "espr-core" / "profile.yaml"))
+
+
+def test_normalize_location():
+    assert normalize_location("$.cells[12].mass") == "$.cells[*].mass"
+    assert normalize_location("cells.3.parts.0") == "cells.*.parts.*"
+    assert normalize_location("$.v2.name") == "$.v2.name"
+
+
+def test_cap_keeps_passed_and_adds_truncation_marker():
+    report = ConformanceReport(target="t", profile_id="p", profile_version="1")
+    report.configure_findings(max_per_rule=2)
+    for _ in range(3):
+        report.add_finding("W", Severity.WARNING, "warn")
+    report.add_finding("E", Severity.INFO, "info")
+    report.add_finding("E", Severity.INFO, "info")
+    report.add_finding("E", Severity.ERROR, "error")
+    assert report.findings_truncated
+    report.finalize()
+
+    assert [(f.rule_id, f.severity.value) for f in report.findings] == [
+        ("W", "warning"),
+        ("W", "warning"),
+        ("E", "info"),
+        ("E", "info"),
+        ("W", "warning"),
+        ("E", "error"),
+    ]
+    assert report.findings[-1].evidence == {"truncated": 1, "limit": 2}
+    assert report.passed is False
+
+
+def test_streamed_and_aggregated_check(tmp_path):
+    profile = _broken_profile(tmp_path)
+    target = tmp_path / "dpp.json"
+    target.write_text(
+        json.dumps({"id": "x", "cells": [{"mass": "heavy"}] * 50}), encoding="utf-8"
+    )
+    cache = ResultCache(tmp_path / "results.sqlite3")
+    aggregator = FindingAggregator(exemplars=2)
+    with NdjsonFindingSink(tmp_path / "findings.ndjson") as ndjson:
+        report = run_conformance_check(
+            str(target),
+            profile,
+            str(tmp_path / "artifacts"),
+            result_cache=cache,
+            findings_sinks=[ndjson, aggregator],
+            max_findings_per_rule=5,
+        )
+
+    lines = (tmp_path / "findings.ndjson").read_text().splitlines()
+    streamed = [json.loads(line)["rule_id"] for line in lines]
+    assert streamed.count("JS-VAL-01") == 50
+    assert len(lines) == ndjson.count
+
+    kept = [f for f in report.findings if f.rule_id == "JS-VAL-01"]
+    assert len(kept) == 6
+    assert kept[-1].evidence == {"truncated": 45, "limit": 5}
+    assert report.passed is False
+
+    groups = {(g.rule_id, g.location): g for g in report.finding_groups or []}
+    group = groups[("JS-VAL-01", "$.cells[*].mass")]
+    assert group.count == 50 and len(group.exemplars) == 2
+    # Truncated reports are not cached, so the next run validates again.
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,121 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from opendpp.fetch.http import HttpFetcher, ResponseCache, default_fetcher
+
+PASSPORT = b'{"batteryCategory": "lmt"}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        server.clients.add(self.client_address)
+        etag = '"' + hashlib.sha256(server.body).hexdigest()[:16] + '"'
+        if self.path == "/etag" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/modified" and self.headers.get("If-Modified-Since"):
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(server.body)))
+        if self.path == "/etag":
+            self.send_header("ETag", etag)
+        elif self.path == "/modified":
+            self.send_header("Last-Modified", "Wed, 01 Oct 2025 10:00:00 GMT")
+        elif self.path == "/no-store":
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.body = PASSPORT
+    httpd.requests = []
+    httpd.clients = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_unchanged_resource_is_revalidated_from_cache(server, tmp_path):
+    fetcher = HttpFetcher(cache=ResponseCache(tmp_path))
+
+    first = fetcher.fetch(_url(server, "/etag"))
+    second = fetcher.fetch(_url(server, "/etag"))
+
+    assert first.metadata["cache"] == {"status": "miss"}
+    assert second.metadata["cache"]["status"] == "revalidated"
+    assert second.metadata["status_code"] == 200
+    assert second.metadata["cache"]["status_code"] == 304
+    assert second.raw_bytes == first.raw_bytes == PASSPORT
+    assert second.sha256 == first.sha256
+    assert second.content_type == "application/json"
+    assert "If-None-Match" in server.requests[1][1]
+    assert len(list((tmp_path / "objects").rglob("*"))) == 2  # shard dir + body
+
+    server.body = b'{"batteryCategory": "ev"}'
+    changed = fetcher.fetch(_url(server, "/etag"))
+    assert changed.metadata["cache"] == {"status": "miss"}
+    assert changed.raw_bytes == server.body
+
+
+def test_last_modified_survives_a_new_fetcher(server, tmp_path):
+    HttpFetcher(cache=ResponseCache(tmp_path)).fetch(_url(server, "/modified"))
+    again = HttpFetcher(cache=ResponseCache(tmp_path)).fetch(_url(server, "/modified"))
+
+    assert again.metadata["cache"]["status"] == "revalidated"
+    assert again.raw_bytes == PASSPORT
+    assert server.requests[1][1]["If-Modified-Since"] == (
+        "Wed, 01 Oct 2025 10:00:00 GMT"
+    )
+
+
+def test_uncacheable_responses_bypass_the_cache(server, tmp_path):
+    fetcher = HttpFetcher(cache=ResponseCache(tmp_path))
+
+    for path in ("/plain", "/no-store"):
+        fetcher.fetch(_url(server, path))
+        artifact = fetcher.fetch(_url(server, path))
+        assert artifact.metadata["cache"] == {"status": "bypass"}
+    assert all("If-None-Match" not in headers for _, headers in server.requests)
+
+
+def test_session_reuses_connections(server):
+    fetcher = HttpFetcher()
+    for _ in range(5):
+        artifact = fetcher.fetch(_url(server, "/plain"))
+        assert "cache" not in artifact.metadata
+
+    assert len(server.requests) == 5
+    assert len(server.clients) == 1
+
+
+def test_default_fetcher_only_caches_when_asked():
+    assert default_fetcher().cache is None
+    assert isinstance(default_fetcher(cache=True).cache, ResponseCache)
+    assert default_fetcher() is default_fetcher()
@@ -0,0 +1,65 @@
+import json
+import subprocess
+import sys
+
+# Packages behind individual stages; none may load just to start the CLI.
+STAGE_PACKAGES = (
+    "aas_core3",
+    "jinja2",
+    "joserfc",
+    "jsonpath_ng",
+    "jsonschema",
+    "pyld",
+    "pyshacl",
+    "rdflib",
+    "requests",
+)
+# Cumulative `-X importtime` budget for `import opendpp.cli`, in microseconds.
+CLI_IMPORT_BUDGET_US = 600_000
+
+
+def _importtime(code: str) -> dict[str, int]:
+    """Runs ``code`` under ``-X importtime``; maps modules to cumulative us."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line[len("import time:") :].split("|")
+        cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def test_cli_import_stays_within_budget():
+    modules = _importtime("import opendpp.cli")
+
+    assert not {m.split(".")[0] for m in modules} & set(STAGE_PACKAGES)
+    assert modules["opendpp.cli"] < CLI_IMPORT_BUDGET_US
+
+
+def test_schema_only_check_loads_no_other_stage(tmp_path):
+    (tmp_path / "schema.json").write_text(
+        json.dumps({"type": "object", "required": ["id"]}), encoding="utf-8"
+    )
+    (tmp_path / "profile.yaml").write_text(
+        "id: p\nversion: '1'\nartifacts:\n  schemas: [schema.json]\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "dpp.json").write_text('{"id": "x"}', encoding="utf-8")
+    code = (
+        "from opendpp.core.engine import run_conformance_check\n"
+        f"report = run_conformance_check({str(tmp_path / 'dpp.json')!r}, "
+        f"{str(tmp_path / 'profile.yaml')!r}, {str(tmp_path / 'out')!r})\n"
+        "assert report.passed\n"
+    )
+
+    modules = _importtime(code)
+
+    assert "jsonschema" in modules
+    loaded = {m.split(".")[0] for m in modules}
+    assert not loaded & {"aas_core3", "joserfc", "jsonpath_ng", "pyshacl", "rdflib"}
@@ -0,0 +1,92 @@
+import json
+
+from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.core.report import ConformanceReport
+from opendpp.profiles.loader import get_compiled_profile
+from opendpp.validate.syntax.json_schema import (
+    build_registry,
+    build_validator,
+    validate_json_schema,
+)
+
+
+def _payload(data):
+    return Artifact.from_bytes(
+        uri="memory://payload",
+        content_type="application/json",
+        artifact_type=ArtifactType.DPP_PAYLOAD,
+        raw_bytes=json.dumps(data).encode("utf-8"),
+    )
+
+
+def _schema_artifact(schema):
+    return Artifact.from_bytes(
+        uri="memory://schema",
+        content_type="application/json",
+        artifact_type=ArtifactType.JSON_SCHEMA,
+        raw_bytes=json.dumps(schema).encode("utf-8"),
+    )
+
+
+def _report():
+    return ConformanceReport(target="t", profile_id="p", profile_version="1")
+
+
+def test_registry_resolves_sibling_schemas_without_io(tmp_path):
+    unit = {"$schema": "https://json-schema.org/draft/2020-12/schema", "type": "string"}
+    main = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "properties": {"unit": {"$ref": "unit.schema.json"}},
+    }
+    registry = build_registry(
+        [
+            (str(tmp_path / "unit.schema.json"), unit),
+            (str(tmp_path / "main.json"), main),
+        ]
+    )
+    validator = build_validator(main, registry=registry)
+
+    report = _report()
+    errors = validate_json_schema(
+        _payload({"unit": 5}), _schema_artifact(main), report, validator=validator
+    )
+
+    assert errors == [{"location": "$.unit", "message": "5 is not of type 'string'"}]
+
+
+def test_remote_refs_are_never_fetched():
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "$ref": "https://schemas.invalid/remote.json",
+    }
+    validator = build_validator(schema, registry=build_registry([]))
+
+    report = _report()
+    validate_json_schema(
+        _payload({}), _schema_artifact(schema), report, validator=validator
+    )
+
+    assert [f.rule_id for f in report.findings] == ["JS-VAL-ERR"]
+    assert "schemas.invalid/remote.json" in report.findings[0].message
+
+
+def test_format_assertion_is_opt_in():
+    schema = {"type": "string", "format": "date"}
+    data = _payload("not-a-date")
+
+    assert validate_json_schema(data, _schema_artifact(schema), _report()) == []
+    strict = build_validator(schema, format_assertion=True)
+    errors = validate_json_schema(
+        data, _schema_artifact(schema), _report(), validator=strict
+    )
+    assert errors == [{"location": "$", "message": "'not-a-date' is not a 'date'"}]
+
+
+def test_profile_validators_share_one_registry():
+    profile = get_compiled_profile("battery-pass")
+    registry = profile.schema_registry()
+
+    for schema in profile.schemas:
+        validator = profile.schema_validator(schema)
+        assert validator is profile.schema_validator(schema)
+        assert validator._registry is registry
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from pyld import jsonld
+from rdflib import Graph
+from rdflib.compare import isomorphic
+from rdflib.parser import PythonInputSource
+
+from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.normalize.contexts import ContextLoader
+from opendpp.normalize.jsonld import (
+    ACTIVE_CONTEXTS,
+    ActiveContextCache,
+    expand_jsonld,
+    to_rdf_graph,
+)
+
+CONTEXT = {
+    "@vocab": "https://example.org/",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+    "id": "@id",
+    "type": "@type",
+    "mass": {"@type": "xsd:decimal"},
+    "cells": {"@container": "@list"},
+    "Cell": {"@context": {"mass": {"@type": "xsd:float"}}},
+    "label": {"@language": "en"},
+}
+
+DOCUMENTS = [
+    {"@context": CONTEXT, "id": "urn:b:1", "mass": "12.5", "label": "Pack"},
+    {
+        "@context": CONTEXT,
+        "id": "urn:b:2",
+        "cells": [{"type": "Cell", "id": "urn:c:1", "mass": "1.5"}],
+    },
+    {
+        "@context": [CONTEXT, {"maker": {"@type": "@id"}}],
+        "@graph": [{"id": "urn:b:3", "maker": "urn:m:1"}],
+    },
+    {
+        "@context": CONTEXT,
+        "id": "urn:b:4",
+        "part": {"@context": {"@vocab": "https://other.example/"}, "name": "x"},
+    },
+]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    ACTIVE_CONTEXTS.clear()
+    yield
+    ACTIVE_CONTEXTS.clear()
+
+
+def _payload(data):
+    return Artifact.from_bytes(
+        uri="memory://payload",
+        content_type="application/ld+json",
+        artifact_type=ArtifactType.DPP_PAYLOAD,
+        raw_bytes=json.dumps(data).encode("utf-8"),
+    )
+
+
+@pytest.mark.parametrize("data", DOCUMENTS)
+def test_cached_contexts_match_uncached_processing(data):
+    expected = Graph().parse(source=PythonInputSource(data), format="json-ld")
+    for _ in range(2):
+        assert isomorphic(to_rdf_graph(_payload(data)), expected)
+        assert expand_jsonld(_payload(data)) == jsonld.expand(data)
+
+
+def test_active_contexts_are_reused_across_documents():
+    for data in DOCUMENTS[:2] * 3:
+        expand_jsonld(_payload(data))
+
+    stats = ACTIVE_CONTEXTS.stats()
+    assert (stats["misses"], stats["hits"]) == (1, 5)
+    assert stats["size"] == 1
+
+
+def test_rdf_conversions_reuse_inlined_contexts():
+    url = "https://contexts.example/battery.jsonld"
+    context = Artifact.from_bytes(
+        uri=url,
+        content_type="application/ld+json",
+        artifact_type=ArtifactType.JSONLD_CONTEXT,
+        raw_bytes=json.dumps({"@context": CONTEXT}).encode("utf-8"),
+    )
+    loader = ContextLoader(bundled={url: context}, offline=True)
+    graphs = [
+        to_rdf_graph(_payload({**data, "@context": url}), loader)
+        for data in DOCUMENTS[:2]
+    ]
+
+    stats = ACTIVE_CONTEXTS.stats()
+    assert (stats["misses"], stats["hits"]) == (1, 1)
+    for graph, data in zip(graphs, DOCUMENTS[:2]):
+        assert isomorphic(graph, to_rdf_graph(_payload(data)))
+
+
+def test_cache_is_bounded_lru():
+    cache = ActiveContextCache(maxsize=2)
+    cache.get_or_create("a", lambda: 1)
+    cache.get_or_create("b", lambda: 2)
+    cache.get_or_create("a", lambda: 0)
+    cache.get_or_create("c", lambda: 3)
+
+    assert cache.get_or_create("a", lambda: 0) == 1
+    assert cache.get_or_create("b", lambda: 4) == 4
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 4)
@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+
+import jsonschema
+from click.testing import CliRunner
+
+from opendpp.cli import cli
+from opendpp.core.engine import run_conformance_check
+from opendpp.core.result_cache import ResultCache
+
+POSITIVE = Path("profiles/battery-pass/testvectors/positive")
+PAYLOAD = POSITIVE / "GeneralProductInformation-payload.json"
+REPORT_SCHEMA = json.loads(Path("schemas/report.schema.json").read_text())
+
+
+def test_metrics_are_optional(tmp_path):
+    report = run_conformance_check(
+        str(PAYLOAD), "battery-pass", str(tmp_path / "artifacts")
+    )
+    assert report.metrics is None
+
+
+def test_stage_and_validator_timings(tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite3")
+    runs = [
+        run_conformance_check(
+            str(PAYLOAD),
+            "battery-pass",
+            str(tmp_path / "artifacts"),
+            result_cache=cache,
+            collect_metrics=True,
+            trace_memory=True,
+        )
+        for _ in range(2)
+    ]
+    first, second = (report.metrics for report in runs)
+    assert first is not None and second is not None
+
+    names = [stage.name for stage in first.stages]
+    assert names[:2] == ["profile", "ingest"]
+    assert names[-6:] == [
+        "aas_parse",
+        "json_schema",
+        "openapi",
+        "shacl",
+        "policy",
+        "trust",
+    ]
+    assert all(stage.peak_memory_bytes is not None for stage in first.stages)
+    assert first.total_ms >= sum(stage.duration_ms for stage in first.stages)
+    assert {"json_schema", "policy"} <= {v.stage for v in first.validators}
+
+    cached = {stage.name for stage in second.stages if stage.cached}
+    assert cached == {"aas_parse", "json_schema", "openapi", "shacl", "policy"}
+    assert not second.validators or {v.stage for v in second.validators} == {"trust"}
+
+    jsonschema.validate(runs[0].model_dump(mode="json"), REPORT_SCHEMA)
+
+
+def test_cli_timings_and_profile_dump(tmp_path):
+    profile_out = tmp_path / "check.prof"
+    result = CliRunner().invoke(
+        cli,
+        [
+            "check",
+            str(PAYLOAD),
+            "--profile",
+            "battery-pass",
+            "--output",
+            str(tmp_path / "report.json"),
+            "--html-output",
+            "",
+            "--artifacts-dir",
+            str(tmp_path / "artifacts"),
+            "--no-cache",
+            "--timings",
+            "--profile-out",
+            str(profile_out),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "json_schema" in result.output
+    assert "Slowest validators:" in result.output
+    assert profile_out.stat().st_size > 0
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["metrics"]["stages"]
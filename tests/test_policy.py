@@ -0,0 +1,129 @@
+import json
+
+import pytest
+import yaml
+from jsonpath_ng import parse as jsonpath_parse
+
+from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.core.report import ConformanceReport
+from opendpp.policy.espr_core import PolicyEngine, SelectorIndex, parse_assertion
+
+DOCUMENT = {
+    "id": "bat-1",
+    "@id": "urn:bat-1",
+    "mass": 12.5,
+    "flag": True,
+    "cells": [{"voltage": 3.7, "chem": "NMC"}, {"voltage": 3.6, "chem": "LFP"}],
+    "meta": {"tags": ["a", "b"], "empty": None},
+}
+
+
+def _payload(data, uri="dpp.json"):
+    return Artifact.from_bytes(
+        uri=uri,
+        content_type="application/json",
+        artifact_type=ArtifactType.DPP_PAYLOAD,
+        raw_bytes=json.dumps(data).encode(),
+    )
+
+
+def _engine(tmp_path, rules):
+    path = tmp_path / "rules.yaml"
+    path.write_text(yaml.safe_dump({"rules": rules}), encoding="utf-8")
+    return PolicyEngine(str(path))
+
+
+def _failed(engine, artifacts):
+    report = ConformanceReport(target="t", profile_id="p", profile_version="1")
+    engine.run_checks(artifacts, report)
+    return [f.rule_id for f in report.findings]
+
+
+@pytest.mark.parametrize(
+    "selector",
+    [
+        "$.id",
+        "$['@id']",
+        "$.cells[*].voltage",
+        "$.cells[0].chem",
+        "$.cells[-1].chem",
+        "$.cells[5]",
+        "$.meta.*",
+        "$.meta.tags[*]",
+        "$.meta.empty[*]",
+        "$.mass[*]",
+        "$.id[0]",
+        "$.meta[0]",
+        "$..voltage",
+        "$.missing.deeper",
+        "cells[*].chem",
+    ],
+)
+def test_selector_index_matches_jsonpath_ng(selector):
+    expected = [m.value for m in jsonpath_parse(selector).find(DOCUMENT)]
+    assert SelectorIndex([selector]).evaluate(DOCUMENT).get(selector, []) == expected
+
+
+@pytest.mark.parametrize(
+    ("assertion", "matches", "passed"),
+    [
+        ("exists", [1], True),
+        ("exists", [], False),
+        ("equals:NMC", ["LFP", "NMC"], True),
+        ("all:equals:NMC", ["LFP", "NMC"], False),
+        ("regex:^N", ["NMC"], True),
+        ("in:NMC, LFP", ["LFP"], True),
+        ("all:in:NMC,LFP", ["LFP", "NaS"], False),
+        (">= 3.6", [3.5, 3.6], True),
+        ("all:> 3.6", [3.7, 3.6], False),
+        ("all:> 3", [], False),
+        ("< 10", ["5", True], False),
+        ("count == 2", [1, 2], True),
+        ("count >= 1", [], False),
+    ],
+)
+def test_assertions(assertion, matches, passed):
+    assert parse_assertion(assertion).evaluate(matches) is passed
+
+
+@pytest.mark.parametrize("assertion", ["bogus", "regex:(", "count ~ 2", "> x"])
+def test_invalid_assertions_are_rejected(assertion):
+    with pytest.raises(ValueError):
+        parse_assertion(assertion)
+
+
+def test_rules_run_against_every_payload(tmp_path):
+    engine = _engine(
+        tmp_path,
+        [
+            {"id": "R1", "selector": "$.cells[*].voltage", "assertion": "all:>= 3.6"},
+            {"id": "R2", "selector": "$.cells[*].voltage", "assertion": "count == 2"},
+            {"id": "R3", "selector": ["$.id", "$['@id']"], "assertion": "count == 2"},
+        ],
+    )
+    other = dict(DOCUMENT, cells=[{"voltage": 3.1}])
+    del other["@id"]
+    assert _failed(engine, [_payload(DOCUMENT), _payload(other, "b.json")]) == [
+        "R1",
+        "R2",
+        "R3",
+    ]
+
+
+def test_unusable_rules_are_reported_once(tmp_path):
+    engine = _engine(
+        tmp_path,
+        [
+            {"id": "NOSEL", "severity": "warning"},
+            {"id": "BAD", "selector": "$.id", "assertion": "regex:("},
+            {"id": "OK", "selector": "$.id"},
+        ],
+    )
+    report = ConformanceReport(target="t", profile_id="p", profile_version="1")
+    engine.run_checks([_payload(DOCUMENT), _payload(DOCUMENT, "b.json")], report)
+
+    assert [(f.rule_id, f.severity.value) for f in report.findings] == [
+        ("NOSEL", "warning"),
+        ("BAD", "error"),
+    ]
+    assert report.findings[1].message.startswith("Policy rule invalid:")
@@ -0,0 +1,55 @@
+import os
+import shutil
+from pathlib import Path
+
+from opendpp.core.engine import run_conformance_check
+from opendpp.profiles.loader import (
+    clear_profile_cache,
+    compile_profile,
+    get_compiled_profile,
+)
+
+
+def test_compiled_profile_is_reused_across_calls():
+    clear_profile_cache()
+    first = get_compiled_profile("battery-pass")
+    second = get_compiled_profile("battery-pass")
+
+    assert first is second
+    assert len(first.schemas) == 7
+    schema = first.schemas[0]
+    assert first.schema_validator(schema) is second.schema_validator(schema)
+    assert first.policy_engines()[0] is second.policy_engines()[0]
+
+
+def test_compiled_profile_recompiles_when_a_file_changes(tmp_path):
+    profile_dir = tmp_path / "espr-core"
+    shutil.copytree(Path("profiles/espr-core"), profile_dir)
+    profile_path = str(profile_dir / "profile.yaml")
+
+    first = get_compiled_profile(profile_path)
+    assert get_compiled_profile(profile_path) is first
+
+    rules = profile_dir / "rules" / "core_policy.yaml"
+    rules.write_text(rules.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    stat = rules.stat()
+    os.utime(rules, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = get_compiled_profile(profile_path)
+    assert second is not first
+    assert second.fingerprint != first.fingerprint
+
+
+def test_run_conformance_check_accepts_compiled_profile(tmp_path):
+    target = tmp_path / "dpp.json"
+    target.write_text('{"id": "example-1"}', encoding="utf-8")
+    profile = compile_profile("espr-core").warm()
+
+    report = run_conformance_check(
+        target=str(target),
+        profile_ref=profile,
+        report_artifacts_dir=str(tmp_path / "artifacts"),
+    )
+
+    assert report.passed is True
+    assert report.profile_id == "espr-core"
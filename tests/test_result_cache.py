@@ -0,0 +1,138 @@
+import shutil
+from pathlib import Path
+
+from opendpp.core import engine, result_cache
+from opendpp.core.engine import run_conformance_check
+from opendpp.core.report import Severity
+from opendpp.core.result_cache import ResultCache
+from opendpp.profiles.loader import compile_profile
+
+POSITIVE = Path("profiles/battery-pass/testvectors/positive")
+
+
+def _dump(report):
+    return report.model_dump(mode="json", exclude={"created_at"})
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("validation stage ran on a cache hit")
+
+
+def test_identical_payload_is_replayed_without_validation(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "results.sqlite3")
+    target = str(POSITIVE / "GeneralProductInformation-payload.json")
+    out = str(tmp_path / "artifacts")
+
+    first = run_conformance_check(target, "battery-pass", out, result_cache=cache)
+    for stage in ("aas_parse", "json_schema", "openapi", "shacl", "policy"):
+        monkeypatch.setattr(engine, f"_stage_{stage}", _fail)
+    second = run_conformance_check(target, "battery-pass", out, result_cache=cache)
+
+    assert first.artifacts[0].metadata["result_cache"] == "miss"
+    assert second.artifacts[0].metadata["result_cache"] == "hit"
+    first.artifacts[0].metadata.pop("result_cache")
+    second.artifacts[0].metadata.pop("result_cache")
+    assert _dump(second) == _dump(first)
+    assert cache.stats()["entries"] == len(engine._CACHED_STAGES)
+
+
+def test_profile_changes_rerun_only_the_affected_stage(tmp_path, monkeypatch):
+    shutil.copytree("profiles/espr-core", tmp_path / "espr-core")
+    profile_path = tmp_path / "espr-core" / "profile.yaml"
+    cache = ResultCache(tmp_path / "results.sqlite3")
+    target = tmp_path / "dpp.json"
+    target.write_text('{"id": "example-1"}', encoding="utf-8")
+
+    def _check(result_cache=cache):
+        return run_conformance_check(
+            str(target),
+            compile_profile(str(profile_path)),
+            str(tmp_path / "artifacts"),
+            result_cache=result_cache,
+        )
+
+    def _state(report):
+        return report.artifacts[0].metadata.pop("result_cache")
+
+    assert _state(_check()) == "miss"
+    assert _state(_check()) == "hit"
+    rules = tmp_path / "espr-core" / "rules" / "core_policy.yaml"
+    rules.write_text(
+        rules.read_text(encoding="utf-8").replace(
+            "severity: error", "severity: warning"
+        ),
+        encoding="utf-8",
+    )
+    fresh = _check(result_cache=None)
+    ran = []
+    stage_policy = engine._stage_policy
+    monkeypatch.setattr(
+        engine, "_stage_policy", lambda *a: ran.append(1) or stage_policy(*a)
+    )
+    for stage in ("aas_parse", "json_schema", "openapi", "shacl"):
+        monkeypatch.setattr(engine, f"_stage_{stage}", _fail)
+
+    partial = _check()
+    assert _state(partial) == "partial"
+    assert ran == [1]
+    assert _dump(partial) == _dump(fresh)
+    assert _state(_check()) == "hit"
+
+
+def test_schema_backend_override_is_part_of_the_key(tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite3")
+    target = str(POSITIVE / "GeneralProductInformation-payload.json")
+
+    def _state(**kwargs):
+        report = run_conformance_check(
+            target,
+            "battery-pass",
+            str(tmp_path / "artifacts"),
+            result_cache=cache,
+            **kwargs,
+        )
+        return report.artifacts[0].metadata["result_cache"]
+
+    assert _state(schema_backend="jsonschema") == "miss"
+    assert _state(schema_backend="codegen") == "partial"
+    assert _state(schema_backend="codegen") == "hit"
+
+
+def test_upgrades_and_failed_stages_are_not_replayed(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "results.sqlite3")
+    target = str(POSITIVE / "GeneralProductInformation-payload.json")
+
+    def _state():
+        report = run_conformance_check(
+            target, "battery-pass", str(tmp_path / "artifacts"), result_cache=cache
+        )
+        return report.artifacts[0].metadata["result_cache"]
+
+    assert _state() == "miss"
+    versions = {**result_cache.code_versions(), "opendpp": "999"}
+    monkeypatch.setattr(result_cache, "code_versions", lambda: versions)
+    assert _state() == "miss"
+
+    def _unavailable(artifacts, profile, report, metrics):
+        report.add_finding(
+            rule_id="POLICY-ERR", severity=Severity.ERROR, message="unavailable"
+        )
+
+    monkeypatch.setattr(engine, "_stage_policy", _unavailable)
+    versions["opendpp"] = "1000"
+    assert _state() == "miss"
+    assert _state() == "partial"
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite3", max_bytes=250)
+    stages = {"policy": {"findings": [{"rule_id": "X" * 50}], "artifacts": []}}
+
+    cache.put("a", "p", "1", stages)
+    cache.put("b", "p", "1", stages)
+    assert cache.get("a") == stages
+    cache.put("c", "p", "1", stages)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == cache.get("c") == stages
+    assert cache.stats()["bytes"] <= 250
@@ -0,0 +1,103 @@
+import json
+import threading
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from opendpp.core.engine import run_conformance_check
+from opendpp.core.scheduler import run_stages_concurrently
+
+POSITIVE = Path("profiles/battery-pass/testvectors/positive")
+
+
+def _environment(index: int) -> str:
+    element = {
+        "modelType": "Property",
+        "idShort": "capacity",
+        "valueType": "xs:double",
+        "value": str(index),
+    }
+    submodel = {
+        "modelType": "Submodel",
+        "id": f"urn:example:submodel:{index}",
+        "idShort": f"Battery{index}",
+        "submodelElements": [element],
+    }
+    return json.dumps({"submodels": [submodel]})
+
+
+def _multi_environment_aasx(path: Path) -> Path:
+    with zipfile.ZipFile(path, "w") as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        for index in range(3):
+            package.writestr(f"aasx/env{index}.json", _environment(index))
+    return path
+
+
+def _dump(report):
+    return report.model_dump_json(exclude={"created_at", "metrics"})
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("target", ["multi.aasx", "MaterialComposition-payload.json"])
+def test_concurrent_stages_produce_the_serial_report(tmp_path, target, executor):
+    path = POSITIVE / target
+    if target == "multi.aasx":
+        path = _multi_environment_aasx(tmp_path / target)
+
+    def _check(**kwargs):
+        return run_conformance_check(
+            str(path),
+            "battery-pass",
+            str(tmp_path / "artifacts"),
+            collect_metrics=True,
+            **kwargs,
+        )
+
+    serial = _check()
+    concurrent = _check(stage_workers=4, stage_executor=executor)
+
+    assert _dump(concurrent) == _dump(serial)
+    assert len(serial.findings) > 3
+    assert concurrent.metrics is not None
+    names = [stage.name for stage in concurrent.metrics.stages]
+    assert names[-6:] == [
+        "aas_parse",
+        "json_schema",
+        "openapi",
+        "shacl",
+        "policy",
+        "trust",
+    ]
+
+
+def test_first_failing_task_in_serial_order_is_raised():
+    def _fail(message):
+        def _task(report, metrics):
+            raise RuntimeError(message)
+
+        return _task
+
+    with pytest.raises(RuntimeError, match="first"):
+        run_stages_concurrently(
+            [("a", [lambda r, m: None, _fail("first")]), ("b", [_fail("second")])],
+            workers=2,
+        )
+
+
+def test_unknown_executor_is_rejected():
+    with pytest.raises(ValueError):
+        run_stages_concurrently([], workers=2, executor="fibers")
+
+
+def test_process_executor_refuses_to_fork_with_running_threads():
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait, name="busy")
+    thread.start()
+    try:
+        with pytest.raises(ValueError, match="busy"):
+            run_stages_concurrently([], workers=2, executor="process")
+    finally:
+        stop.set()
+        thread.join()
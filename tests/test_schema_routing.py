@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.core.engine import _validate_routed
+from opendpp.core.report import ConformanceReport
+from opendpp.profiles.loader import get_compiled_profile
+from opendpp.validate.syntax.json_schema import validate_json_schema
+from opendpp.validate.syntax.schema_routing import SchemaRouter
+
+POSITIVE = Path("profiles/battery-pass/testvectors/positive")
+
+
+def _payloads():
+    for path in sorted(POSITIVE.glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8-sig"))
+        yield path.stem, data
+        first = next(iter(data))
+        yield (
+            f"{path.stem}-missing-{first}",
+            {k: v for k, v in data.items() if k != first},
+        )
+        yield f"{path.stem}-wrong-type", {k: 12345 for k in data}
+    yield "empty-object", {}
+    yield "not-an-object", [1, 2, 3]
+
+
+def _full_scan(artifact, profile, report):
+    best_errors, best_schema = None, None
+    for schema in profile.schemas:
+        errors = validate_json_schema(artifact, schema, report, record=False)
+        if not errors:
+            return [("JS-VAL-OK", schema.sha256)]
+        if best_errors is None or len(errors) < len(best_errors):
+            best_errors, best_schema = errors, schema
+    return [
+        ("JS-VAL-01", best_schema.sha256, e["message"], e["location"])
+        for e in best_errors
+    ]
+
+
+@pytest.mark.parametrize("name,data", list(_payloads()))
+def test_routed_validation_matches_full_scan(name, data):
+    profile = get_compiled_profile("battery-pass")
+    artifact = Artifact.from_bytes(
+        uri=name,
+        content_type="application/json",
+        artifact_type=ArtifactType.DPP_PAYLOAD,
+        raw_bytes=json.dumps(data).encode("utf-8"),
+    )
+    report = ConformanceReport(target=name, profile_id="p", profile_version="1")
+
+    _validate_routed(artifact, profile, report)
+
+    routed = [
+        (f.rule_id, f.evidence["schema_hash"])
+        if f.rule_id == "JS-VAL-OK"
+        else (
+            f.rule_id,
+            f.evidence["schema_hash"],
+            f.message.removeprefix("JSON Schema validation error: "),
+            f.evidence["location"],
+        )
+        for f in report.findings
+    ]
+    assert routed == _full_scan(artifact, profile, report)
+
+
+def test_router_excludes_schemas_with_missing_required_keys():
+    router = SchemaRouter(
+        [
+            {"type": "object", "required": ["a", "b"]},
+            {"type": "object", "required": ["c"]},
+            {"type": "object", "properties": {"a": {}}, "additionalProperties": False},
+            {"$ref": "#/definitions/x"},
+        ]
+    )
+
+    route = router.route({"a": 1, "b": 2})
+    assert route.candidates == [0, 3]
+    assert route.lower_bounds == {1: 1, 2: 1}
+    assert route.ambiguous
+
+    assert router.route("text").lower_bounds == {0: 1, 1: 1, 2: 1}
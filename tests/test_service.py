@@ -0,0 +1,130 @@
+import http.client
+import json
+import threading
+from collections.abc import Iterator
+
+import pytest
+from joserfc import jwk, jwt
+
+from opendpp import service as service_module
+from opendpp.service import ValidationServer, ValidationService
+
+
+@pytest.fixture
+def server(tmp_path) -> Iterator[ValidationServer]:
+    service = ValidationService(
+        ["espr-core"],
+        workers=1,
+        queue_size=0,
+        report_artifacts_dir=str(tmp_path / "artifacts"),
+    )
+    server = ValidationServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def _request(
+    server: ValidationServer,
+    method: str,
+    path: str,
+    body: bytes | None = None,
+    headers: dict[str, str] | None = None,
+) -> tuple[int, dict]:
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+    try:
+        connection.request(
+            method,
+            path,
+            body=body,
+            headers={"Content-Type": "application/json", **(headers or {})},
+        )
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_health_lists_warm_profiles(server: ValidationServer) -> None:
+    status, body = _request(server, "GET", "/health")
+    assert status == 200
+    assert body["status"] == "ok"
+    assert body["profiles"] == ["espr-core"]
+    assert body["capacity"] == 1
+
+
+def test_check_payload_returns_report(server: ValidationServer) -> None:
+    payload = json.dumps({"id": "example-1", "name": "Example"}).encode()
+    status, body = _request(server, "POST", "/check?profile=espr-core", payload)
+
+    assert status == 200
+    assert body["profile_id"] == "espr-core"
+    assert body["passed"] is True
+    assert body["artifacts"][0]["artifact_type"] == "dpp_payload"
+
+
+def test_check_rejects_bad_requests(server: ValidationServer) -> None:
+    assert _request(server, "POST", "/check")[0] == 400
+    assert _request(server, "POST", "/check?target=/etc/passwd")[0] == 400
+    assert _request(server, "POST", "/check?profile=unknown", b"{}")[0] == 404
+    assert _request(server, "GET", "/nope")[0] == 404
+    for length in ("abc", "-1"):
+        headers = {"Content-Length": length}
+        assert _request(server, "POST", "/check", b"{}", headers)[0] == 400
+
+
+def test_check_never_resolves_issuers_on_private_hosts(
+    server: ValidationServer,
+) -> None:
+    key = jwk.ECKey.generate_key("P-256")
+    claims = {"iss": "did:web:127.0.0.1", "vc": {"type": ["VerifiableCredential"]}}
+    token = jwt.encode({"alg": "ES256"}, claims, key)
+    payload = json.dumps({"id": "example-1", "proof": token}).encode()
+
+    status, body = _request(server, "POST", "/check", payload)
+
+    assert status == 200
+    trust = [f for f in body["findings"] if f["rule_id"] == "TRUST-VC-JWT-ERR"]
+    assert len(trust) == 1
+    assert "non-public address" in trust[0]["message"]
+
+
+def test_check_answers_429_when_saturated(
+    server: ValidationServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    started, release = threading.Event(), threading.Event()
+    original = service_module.run_conformance_check
+
+    def _blocking(*args, **kwargs):
+        started.set()
+        release.wait(10)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(service_module, "run_conformance_check", _blocking)
+    results: list[int] = []
+    first = threading.Thread(
+        target=lambda: results.append(_request(server, "POST", "/check", b"{}")[0])
+    )
+    first.start()
+    assert started.wait(10)
+
+    status, body = _request(server, "POST", "/check", b"{}")
+    assert status == 429
+    assert "pending" in body["error"]
+
+    # The rejection must not wait for (or buffer) the announced body.
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    try:
+        connection.putrequest("POST", "/check")
+        connection.putheader("Content-Length", str(32 * 1024 * 1024))
+        connection.endheaders()
+        assert connection.getresponse().status == 429
+    finally:
+        connection.close()
+
+    release.set()
+    first.join(10)
+    assert results == [200]
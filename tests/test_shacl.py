@@ -0,0 +1,105 @@
+from rdflib import Graph
+
+from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.core.report import ConformanceReport
+from opendpp.profiles.loader import compile_profile
+from opendpp.validate.semantic.shacl import (
+    compile_shapes,
+    needs_rdfs_inference,
+    validate_shacl,
+)
+
+PREFIXES = """
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+@prefix ex: <https://example.org/> .
+"""
+
+SHAPES = (
+    PREFIXES
+    + """
+[] a sh:NodeShape ;
+   sh:targetClass ex:Battery ;
+   rdfs:label "Battery" ;
+   sh:property [ sh:path ex:id ; sh:minCount 1 ] .
+"""
+)
+
+
+def _artifact(text, artifact_type, content_type="text/turtle"):
+    return Artifact.from_bytes(
+        uri="memory://graph",
+        content_type=content_type,
+        artifact_type=artifact_type,
+        raw_bytes=text.encode("utf-8"),
+    )
+
+
+def _shapes(text):
+    return _artifact(text, ArtifactType.SHACL_SHAPES)
+
+
+def _data(text):
+    artifact = _artifact(PREFIXES + text, ArtifactType.RDF_GRAPH)
+    artifact._rdf_graph = Graph().parse(data=artifact.raw_bytes, format="turtle")
+    return artifact
+
+
+def _report():
+    return ConformanceReport(target="t", profile_id="p", profile_version="1")
+
+
+def test_inference_detection():
+    assert not needs_rdfs_inference(Graph().parse(data=SHAPES, format="turtle"))
+    hierarchy = (
+        PREFIXES
+        + """
+    [] a sh:NodeShape ;
+       sh:targetNode ex:b ;
+       sh:property [ sh:path ( ex:type [ sh:zeroOrMorePath rdfs:subClassOf ] ) ;
+                     sh:hasValue ex:Product ] .
+    """
+    )
+    assert needs_rdfs_inference(Graph().parse(data=hierarchy, format="turtle"))
+
+    assert compile_shapes(_shapes(SHAPES)).inference is None
+    assert compile_shapes(_shapes(hierarchy)).inference == "rdfs"
+    assert compile_shapes(_shapes(hierarchy), "none").inference == "none"
+
+
+def test_auto_inference_uses_axioms_in_data():
+    # Only RDFS entailment of the domain axiom makes ex:pack a Battery, and
+    # therefore a focus node lacking ex:id.
+    data = _data(
+        """
+        ex:hasCell rdfs:domain ex:Battery .
+        ex:pack ex:hasCell ex:cell .
+        """
+    )
+    report = _report()
+    validate_shacl(data, _shapes(SHAPES), report)
+    assert [f.rule_id for f in report.findings] == ["SHACL-VAL-01"]
+
+    report = _report()
+    validate_shacl(
+        data, _shapes(SHAPES), report, compile_shapes(_shapes(SHAPES), "none")
+    )
+    assert report.findings == []
+
+
+def test_profile_configures_inference_per_shapes_file(tmp_path):
+    (tmp_path / "a.ttl").write_text(SHAPES, encoding="utf-8")
+    (tmp_path / "b.ttl").write_text(SHAPES, encoding="utf-8")
+    (tmp_path / "profile.yaml").write_text(
+        "id: p\nversion: '1'\n"
+        "artifacts:\n  shapes: [a.ttl, b.ttl]\n"
+        "shacl:\n  inference:\n    b.ttl: owlrl\n",
+        encoding="utf-8",
+    )
+    profile = compile_profile(str(tmp_path / "profile.yaml"))
+    first, second = profile.shapes
+
+    assert profile.compiled_shapes(first).inference is None
+    assert profile.compiled_shapes(second).inference == "owlrl"
+    assert profile.compiled_shapes(first) is profile.compiled_shapes(first)
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+from joserfc.jwk import ECKey
+
+from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.core.engine import run_conformance_check
+from opendpp.core.report import ConformanceReport
+from opendpp.core.store import ArtifactStore
+from opendpp.trust.issue import issue_vc_jwt
+
+
+def _artifact(raw: bytes) -> Artifact:
+    return Artifact.from_bytes(
+        uri="memory://a",
+        content_type="application/json",
+        artifact_type=ArtifactType.DPP_PAYLOAD,
+        raw_bytes=raw,
+    )
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_artifacts_are_sharded_deduplicated_and_indexed(tmp_path, compression):
+    first, duplicate = _artifact(b'{"a": 1}'), _artifact(b'{"a": 1}')
+    with ArtifactStore(tmp_path, compression, queue_size=1) as store:
+        path = store.put(first)
+        assert store.put(duplicate) == path
+        store.put(_artifact(b'{"b": 2}'))
+
+    digest = first.sha256
+    assert path.relative_to(tmp_path).parts[:2] == (digest[:2], digest[2:4])
+    assert duplicate.metadata["stored_path"] == str(path)
+    index = [json.loads(line) for line in (tmp_path / "index.ndjson").open()]
+    assert [entry["sha256"] for entry in index].count(digest) == 1
+    assert index[0]["size"] == 8 and index[0]["artifact_type"] == "dpp_payload"
+
+    reopened = ArtifactStore(tmp_path)
+    assert reopened.get(digest) == b'{"a": 1}'
+    assert reopened.get("0" * 64) is None
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="corrupt"):
+        reopened.get(digest)
+
+
+def test_unknown_compression_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ArtifactStore(tmp_path, "lz4")
+
+
+def test_attestation_resolves_report_hashes_in_the_store(tmp_path):
+    target = tmp_path / "dpp.json"
+    target.write_text(json.dumps({"id": "example-1"}), encoding="utf-8")
+    store = ArtifactStore(tmp_path / "artifacts")
+    report = run_conformance_check(str(target), "espr-core", artifact_store=store)
+    key = ECKey.generate_key("P-256").as_dict(private=True)
+
+    issue_vc_jwt(report, "did:web:issuer.example", key, artifact_store=store)
+
+    forged = ConformanceReport.model_validate(report.model_dump())
+    forged.artifacts[0].sha256 = "0" * 64
+    with pytest.raises(ValueError, match="not in the artifact store"):
+        issue_vc_jwt(forged, "did:web:issuer.example", key, artifact_store=store)
@@ -0,0 +1,203 @@
+import json
+import shutil
+from typing import Any
+
+import pytest
+from joserfc import jwk, jwt
+
+from opendpp.core.artifact import Artifact, ArtifactType
+from opendpp.core.engine import run_conformance_check
+from opendpp.core.report import ConformanceReport, Severity
+from opendpp.core.result_cache import ResultCache
+from opendpp.trust import jwt_vc
+from opendpp.trust.did import DidNotAvailable, DidResolver, cache_lifetime
+
+ISSUERS = [f"did:web:issuer{i}.example" for i in range(5)]
+KEYS = {did: jwk.ECKey.generate_key("P-256") for did in ISSUERS}
+
+
+class _StubResolver(DidResolver):
+    def __init__(self, lifetime: float = 300) -> None:
+        super().__init__()
+        self.lifetime = lifetime
+
+    def _fetch(self, did: str) -> tuple[dict[str, Any], float]:
+        public = KEYS[did].as_dict(private=False)
+        document = {
+            "id": did,
+            "verificationMethod": [{"id": f"{did}#key-1", "publicKeyJwk": public}],
+        }
+        return document, self.lifetime
+
+
+def _token(issuer: str, subject: str = "urn:dpp:1") -> str:
+    claims = {"iss": issuer, "sub": subject, "vc": {"type": ["VerifiableCredential"]}}
+    return jwt.encode({"alg": "ES256", "kid": "key-1"}, claims, KEYS[issuer])
+
+
+def _credential(token: str, index: int = 0) -> Artifact:
+    return Artifact.from_bytes(
+        uri=f"vc-{index}.jwt",
+        content_type="application/vc+jwt",
+        artifact_type=ArtifactType.VC_JWT,
+        raw_bytes=token.encode(),
+    )
+
+
+def _report() -> ConformanceReport:
+    return ConformanceReport(target="t", profile_id="p", profile_version="1")
+
+
+def test_cache_lifetime_follows_http_headers() -> None:
+    assert cache_lifetime({"Cache-Control": "public, max-age=60"}, 300) == 60
+    assert cache_lifetime({"Cache-Control": "no-store"}, 300) == 0
+    assert (
+        cache_lifetime(
+            {
+                "Date": "Wed, 21 Oct 2026 07:28:00 GMT",
+                "Expires": "Wed, 21 Oct 2026 07:38:00 GMT",
+            },
+            300,
+        )
+        == 600
+    )
+    assert cache_lifetime({}, 300) == 300
+
+
+def test_batch_resolves_each_issuer_once() -> None:
+    resolver = _StubResolver()
+    credentials = [
+        _credential(_token(ISSUERS[i % 5], f"urn:dpp:{i}"), i) for i in range(500)
+    ]
+    report = _report()
+
+    results = jwt_vc.verify_vc_jwts(credentials, report, resolver=resolver)
+
+    assert resolver.resolutions == 5
+    assert all(result is not None for result in results)
+    assert [f.evidence["artifact_hash"] for f in report.findings] == [
+        c.sha256 for c in credentials
+    ]
+    assert {f.rule_id for f in report.findings} == {"TRUST-VC-JWT-01"}
+
+
+def test_batch_reports_bad_signatures_and_disallowed_issuers() -> None:
+    header, claims, _ = _token(ISSUERS[0]).split(".")
+    forged = f"{header}.{claims}.{_token(ISSUERS[1]).split('.')[2]}"
+    credentials = [_credential(forged, 0), _credential(_token(ISSUERS[1]), 1)]
+    report = _report()
+
+    results = jwt_vc.verify_vc_jwts(
+        credentials, report, resolver=_StubResolver(), allowed_issuers=[ISSUERS[0]]
+    )
+
+    assert results[0] is None
+    assert [f.rule_id for f in report.findings] == [
+        "TRUST-VC-JWT-ERR",
+        "TRUST-VC-JWT-01",
+        "TRUST-ISSUER-01",
+    ]
+
+
+def test_uncacheable_documents_are_refetched() -> None:
+    resolver = _StubResolver(lifetime=0)
+    for _ in range(2):
+        jwt_vc.verify_vc_jwt(_credential(_token(ISSUERS[0])), _report(), resolver)
+    assert resolver.resolutions == 2
+
+
+def test_engine_verifies_embedded_credentials(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    resolver = _StubResolver()
+    monkeypatch.setattr(jwt_vc, "default_did_resolver", lambda: resolver)
+    payload = {
+        "id": "example-1",
+        "name": "Example",
+        "credentials": [_token(ISSUERS[2])],
+    }
+    target = tmp_path / "dpp.json"
+    target.write_text(json.dumps(payload), encoding="utf-8")
+    cache = ResultCache(tmp_path / "results.sqlite3")
+
+    for _ in range(2):
+        report = run_conformance_check(
+            str(target),
+            "espr-core",
+            report_artifacts_dir=str(tmp_path / "artifacts"),
+            result_cache=cache,
+        )
+        verified = [f for f in report.findings if f.rule_id == "TRUST-VC-JWT-01"]
+        assert len(verified) == 1
+        assert verified[0].evidence["issuer"] == ISSUERS[2]
+
+    credential = next(a for a in report.artifacts if a.artifact_type == "vc_jwt")
+    assert credential.uri.endswith("#/credentials/0")
+    assert resolver.resolutions == 1
+
+
+def _check_embedded(tmp_path, profile: str = "espr-core", **kwargs: Any):
+    payload = {"id": "example-1", "credentials": [_token(ISSUERS[3])]}
+    target = tmp_path / "dpp.json"
+    target.write_text(json.dumps(payload), encoding="utf-8")
+    return run_conformance_check(
+        str(target),
+        profile,
+        report_artifacts_dir=str(tmp_path / "artifacts"),
+        **kwargs,
+    )
+
+
+def test_offline_checks_do_not_resolve_issuers(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    resolver = _StubResolver()
+    monkeypatch.setattr(jwt_vc, "default_did_resolver", lambda: resolver)
+
+    report = _check_embedded(tmp_path, offline=True)
+
+    trust = [f for f in report.findings if f.rule_id.startswith("TRUST-")]
+    assert [(f.rule_id, f.severity) for f in trust] == [
+        ("TRUST-VC-JWT-02", Severity.WARNING)
+    ]
+    assert "not available offline" in trust[0].message
+    assert report.passed
+    assert resolver.resolutions == 0
+
+    with pytest.raises(DidNotAvailable):
+        resolver.resolve(ISSUERS[3], offline=True)
+    resolver.resolve(ISSUERS[3])
+    assert resolver.resolve(ISSUERS[3], offline=True)["id"] == ISSUERS[3]
+
+
+def test_profiles_without_vc_formats_skip_credentials(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    resolver = _StubResolver()
+    monkeypatch.setattr(jwt_vc, "default_did_resolver", lambda: resolver)
+    shutil.copytree("profiles/espr-core", tmp_path / "espr-core")
+    profile = tmp_path / "espr-core" / "profile.yaml"
+    profile.write_text(
+        profile.read_text(encoding="utf-8").replace(
+            "vc_formats:\n    - vc+jwt", "vc_formats: []"
+        ),
+        encoding="utf-8",
+    )
+
+    report = _check_embedded(tmp_path, str(profile))
+
+    assert not [f for f in report.findings if f.rule_id.startswith("TRUST-")]
+    assert not [a for a in report.artifacts if a.artifact_type == "vc_jwt"]
+    assert resolver.resolutions == 0
+
+
+class _NoSession:
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        raise AssertionError("private host was fetched")
+
+
+@pytest.mark.parametrize("did", ["did:web:127.0.0.1", "did:web:localhost"])
+def test_public_only_resolver_refuses_private_hosts(did: str) -> None:
+    resolver = DidResolver(session=_NoSession(), public_only=True)
+    with pytest.raises(ValueError, match="non-public address"):
+        resolver.resolve(did)